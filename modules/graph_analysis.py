@@ -0,0 +1,76 @@
+"""연결성 분석 (강/약 연결 컴포넌트, 기점 도달성, 일방향 막다른 노드)
+
+데스크톱 앱이 웹 백엔드 트리 구조에 의존하지 않도록 modules 안에 따로 둔다.
+웹 버전(web_version/backend/app/services/analysis_service.py)과 결과 형식이 같도록 함께 수정한다.
+"""
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components, breadth_first_order
+
+
+def build_link_matrix(nodes, links):
+    """링크 목록으로 노드 인덱스 기반 희소 인접 행렬 생성"""
+    node_ids = [node.ID for node in nodes]
+    index = {node_id: i for i, node_id in enumerate(node_ids)}
+    
+    # 존재하지 않는 노드를 참조하는 링크는 제외
+    pairs = [(index[link.FromNodeID], index[link.ToNodeID]) for link in links
+             if link.FromNodeID in index and link.ToNodeID in index]
+    n = len(node_ids)
+    if pairs:
+        rows, cols = np.array(pairs, dtype=np.int32).T
+    else:
+        rows = cols = np.empty(0, dtype=np.int32)
+    
+    matrix = csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(n, n))
+    return matrix, node_ids, index
+
+
+def _group_components(labels, node_ids):
+    """컴포넌트 라벨을 노드 ID 그룹 목록으로 변환 (큰 컴포넌트 순)"""
+    order = np.argsort(labels, kind="stable")
+    sorted_labels = labels[order]
+    splits = np.flatnonzero(np.diff(sorted_labels)) + 1
+    groups = [[node_ids[i] for i in chunk] for chunk in np.split(order, splits) if len(chunk)]
+    groups.sort(key=len, reverse=True)
+    return groups
+
+
+def analyze_connectivity(nodes, links, depot_id=None):
+    """연결성 분석: 강/약 연결 컴포넌트, 기점에서 도달 불가 노드, 일방향 막다른 노드"""
+    matrix, node_ids, index = build_link_matrix(nodes, links)
+    n = len(node_ids)
+    
+    if n == 0:
+        strong_groups, weak_groups = [], []
+        out_degree = in_degree = np.empty(0, dtype=np.int64)
+    else:
+        _, strong_labels = connected_components(matrix, directed=True, connection="strong")
+        _, weak_labels = connected_components(matrix, directed=True, connection="weak")
+        strong_groups = _group_components(strong_labels, node_ids)
+        weak_groups = _group_components(weak_labels, node_ids)
+        out_degree = np.diff(matrix.indptr)
+        in_degree = np.bincount(matrix.indices, minlength=n)
+    
+    # 들어오는 링크는 있지만 나가는 링크가 없는 노드
+    dead_ends = [node_ids[i] for i in np.flatnonzero((in_degree > 0) & (out_degree == 0))]
+    
+    unreachable = []
+    if depot_id is not None and depot_id in index:
+        reachable = breadth_first_order(matrix, index[depot_id], directed=True,
+                                        return_predecessors=False)
+        mask = np.ones(n, dtype=bool)
+        mask[reachable] = False
+        unreachable = [node_ids[i] for i in np.flatnonzero(mask)]
+    
+    return {
+        "node_count": n,
+        "link_count": int(matrix.sum()),
+        "strong_component_count": len(strong_groups),
+        "weak_component_count": len(weak_groups),
+        "strong_components": strong_groups,
+        "weak_components": weak_groups,
+        "depot": depot_id,
+        "unreachable_from_depot": unreachable,
+        "dead_ends": dead_ends
+    }
@@ -9,6 +9,7 @@ from modules.ui_setup import setup_ui
 from modules.model import Node, Link, GpsInfo, UtmInfo
 from modules.map_viewer import MapCanvas
 from modules.util import json_to_links, json_to_nodes, json_to_data_with_merge, validate_data_integrity
+from modules.graph_analysis import analyze_connectivity
 from dataclasses import asdict
 
 class MainWindow(QMainWindow):
@@ -590,6 +591,41 @@ class MainWindow(QMainWindow):
                 f"데이터 무결성 검사 중 오류가 발생했습니다:\n{str(e)}"
             )
 
+    def analyze_connectivity(self):
+        """연결성 분석 후 지도에 색상 오버레이 표시 (선택된 노드를 기점으로 사용)"""
+        if not self.nodes:
+            QMessageBox.warning(self, "경고", "분석할 Node 데이터가 없습니다.")
+            return
+        
+        try:
+            depot_id = self.selected_node.ID if self.selected_node else None
+            result = analyze_connectivity(self.nodes, self.links, depot_id)
+            
+            if hasattr(self, 'map_canvas'):
+                self.map_canvas.show_connectivity_overlay(result)
+            
+            message = f"강연결 컴포넌트: {result['strong_component_count']}개\n"
+            message += f"약연결 컴포넌트: {result['weak_component_count']}개\n"
+            message += f"일방향 막다른 노드 ({len(result['dead_ends'])}개): {', '.join(result['dead_ends'][:20])}\n"
+            if depot_id:
+                unreachable = result["unreachable_from_depot"]
+                message += f"\n기점 {depot_id}에서 도달 불가 노드 ({len(unreachable)}개): {', '.join(unreachable[:20])}"
+            else:
+                message += "\n기점 도달성 검사를 하려면 먼저 Node를 선택하세요."
+            message += "\n\n색상: 초록=주 컴포넌트, 회색=도달 불가, 자홍=막다른 노드 (Clear Overlay로 해제)"
+            
+            QMessageBox.information(self, "연결성 분석", message)
+        except Exception as e:
+            QMessageBox.critical(
+                self, "분석 오류", 
+                f"연결성 분석 중 오류가 발생했습니다:\n{str(e)}"
+            )
+
+    def clear_connectivity_overlay(self):
+        """연결성 분석 색상 오버레이 해제"""
+        if hasattr(self, 'map_canvas'):
+            self.map_canvas.clear_connectivity_overlay()
+
     def populate_node_table(self):
         self.node_table.setRowCount(len(self.nodes))
         for row, node in enumerate(self.nodes):
@@ -4,6 +4,7 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 import cartopy.crs as ccrs
 import contextily as ctx
 import math
+import os
 
 class MapCanvas(FigureCanvas):
     def __init__(self, nodes, links, parent=None):
@@ -50,7 +51,12 @@ class MapCanvas(FigureCanvas):
         
         # 위성지도 타일 로드
         # url = "http://mt1.google.com/vt/lyrs=s&x={x}&y={y}&z={z}"
-        url = "https://api.vworld.kr/req/wmts/1.0.0/3FE232D2-4F55-336B-9BC9-011DE07A0459/Base/{z}/{y}/{x}.png"
+        # SCV_TILE_URL로 웹 백엔드의 타일 프록시를 지정하면 서버 캐시를 함께 사용
+        # (예: http://localhost:8000/api/tiles/vworld/{z}/{x}/{y})
+        url = os.environ.get(
+            "SCV_TILE_URL",
+            "https://api.vworld.kr/req/wmts/1.0.0/3FE232D2-4F55-336B-9BC9-011DE07A0459/Base/{z}/{y}/{x}.png"
+        )
         try:
             #ctx.add_basemap(self.ax, crs="EPSG:4326", source=url, zoom=15, resampling=True)
             ctx.add_basemap(self.ax, crs="EPSG:4326", source=url, resampling=True)
@@ -362,6 +368,41 @@ class MapCanvas(FigureCanvas):
         # 화면 새로고침 (줌 레벨 유지)
         self.draw_idle()
     
+    def show_connectivity_overlay(self, result):
+        """연결성 분석 결과를 노드 색상으로 표시
+        
+        가장 큰 약연결 컴포넌트는 초록색(기본 노드 색인 빨간색과 구분), 분리된 컴포넌트는 컴포넌트별 색상,
+        기점에서 도달할 수 없는 노드는 회색, 일방향 막다른 노드는 자홍색으로 표시한다.
+        """
+        # 주 컴포넌트/기본/도달 불가 색과 겹치는 초록·빨강·회색 계열은 분리된 컴포넌트 색에서 제외
+        cmap = plt.get_cmap("tab20")
+        palette = [cmap(i) for i in range(cmap.N) if i not in (4, 5, 6, 7, 14, 15)]
+        colors = {}
+        for i, component in enumerate(result["weak_components"]):
+            color = "limegreen" if i == 0 else palette[(i - 1) % len(palette)]
+            for node_id in component:
+                colors[node_id] = color
+        for node_id in result["unreachable_from_depot"]:
+            colors[node_id] = "gray"
+        for node_id in result["dead_ends"]:
+            colors[node_id] = "magenta"
+        
+        for node_id, artist_info in self.node_artists.items():
+            artist_info['scatter'].set_color(colors.get(node_id, "red"))
+        
+        # QuickLink 하이라이트는 오버레이 위에 유지
+        if self.highlighted_artist:
+            self.highlighted_artist.set_color('yellow')
+        self.draw_idle()
+    
+    def clear_connectivity_overlay(self):
+        """연결성 오버레이 제거 (기본 색상 복원)"""
+        for artist_info in self.node_artists.values():
+            artist_info['scatter'].set_color('red')
+        if self.highlighted_artist:
+            self.highlighted_artist.set_color('yellow')
+        self.draw_idle()
+    
     def add_link_to_map(self, link):
         """새로운 링크를 지도에 추가"""
         if not self.nodes_list:
@@ -36,6 +36,12 @@ def setup_ui(mw):
     mw.validate_button = QPushButton("Validate Data")
     mw.validate_button.clicked.connect(mw.validate_current_data)
     validate_layout.addWidget(mw.validate_button)
+    mw.connectivity_button = QPushButton("Connectivity")
+    mw.connectivity_button.clicked.connect(mw.analyze_connectivity)
+    validate_layout.addWidget(mw.connectivity_button)
+    mw.clear_overlay_button = QPushButton("Clear Overlay")
+    mw.clear_overlay_button.clicked.connect(mw.clear_connectivity_overlay)
+    validate_layout.addWidget(mw.clear_overlay_button)
     mw.left_layout.addLayout(validate_layout)
     
     # Link Add Mode 버튼
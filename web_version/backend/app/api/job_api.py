@@ -0,0 +1,83 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import StreamingResponse
+
+from .path_api import job_manager, get_session_token, SESSION_HEADER, SESSION_COOKIE
+from ..services.job_service import Job, SUCCEEDED, FAILED
+from ..utils.serialization import dumps
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+# 진행 이벤트 최소 간격 (초, 그 사이의 변경은 다음 이벤트 하나로 합침)
+EVENT_INTERVAL = 0.1
+# 변경이 없을 때 연결 유지를 위해 보내는 주석 간격 (초)
+KEEPALIVE_INTERVAL = 15.0
+
+# 끝난 작업의 마지막 이벤트 이름 (EventSource 자체의 연결 오류 이벤트 error와 겹치지 않도록 실패는 failed)
+FINAL_EVENTS = {SUCCEEDED: "complete", FAILED: "failed"}
+
+
+@router.get("")
+async def list_jobs(token: str = Depends(get_session_token)):
+    """현재 세션이 등록한 작업 목록 (결과 제외)"""
+    return [job.info(include_result=False) for job in job_manager.list(owner=token)]
+
+
+def _owned_job(job_id: str, token: Optional[str]) -> Job:
+    """현재 세션이 등록한 작업 반환 (없거나 다른 세션의 작업이면 404)"""
+    job = job_manager.get(job_id)
+    if job is None or job.owner != token:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str, token: str = Depends(get_session_token)):
+    """작업 상태/진행률 조회 (끝난 작업은 결과 포함, 보관 기간이 지나면 404)"""
+    return _owned_job(job_id, token).info()
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: str, request: Request, token: Optional[str] = None):
+    """작업 진행 상황을 Server-Sent Events로 전달
+
+    상태가 바뀔 때마다 progress 이벤트(결과 제외한 작업 정보)를 보내고, 작업이 끝나면
+    complete/failed/cancelled 이벤트(결과 포함)를 보낸 뒤 스트림을 닫는다.
+    EventSource는 헤더를 지정할 수 없으므로 세션 토큰을 token 쿼리 파라미터로도 받는다.
+    """
+    job = _owned_job(job_id, token or request.headers.get(SESSION_HEADER) or request.cookies.get(SESSION_COOKIE))
+
+    async def events():
+        # EventSource가 끊겼다가 다시 연결할 때의 대기 시간 (밀리초)
+        yield b"retry: 1000\n\n"
+        revision = None
+        while True:
+            if job.revision != revision:
+                revision = job.revision
+                if job.finished:
+                    yield _sse_event(FINAL_EVENTS.get(job.status, "cancelled"), job.info(), revision)
+                    return
+                yield _sse_event("progress", job.info(include_result=False), revision)
+                await asyncio.sleep(EVENT_INTERVAL)
+                continue
+            await job.wait_changed(revision, KEEPALIVE_INTERVAL)
+            if job.revision == revision:
+                yield b": keepalive\n\n"
+
+    # 프록시(nginx 등)가 이벤트를 버퍼링하지 않도록 함
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(events(), media_type="text/event-stream", headers=headers)
+
+
+def _sse_event(event: str, data: dict, event_id: int) -> bytes:
+    """SSE 이벤트 하나 (data는 한 줄 JSON)"""
+    return b"event: %s\nid: %d\ndata: %s\n\n" % (event.encode("ascii"), event_id, dumps(data))
+
+
+@router.delete("/{job_id}")
+async def cancel_job(job_id: str, token: str = Depends(get_session_token)):
+    """작업 취소 요청 (대기 중이면 바로 취소, 실행 중이면 변경을 적용하기 전 단계에서 중단)"""
+    job = job_manager.cancel(_owned_job(job_id, token).id)
+    return job.info(include_result=False)
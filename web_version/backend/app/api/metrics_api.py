@@ -0,0 +1,90 @@
+import hashlib
+from collections import Counter
+
+from fastapi import APIRouter, Response
+
+from .path_api import workspace_manager, job_manager, file_cache
+from .tile_api import tile_proxy
+from ..services.storage_service import preloaded_files
+from ..utils.http_cache import compression_cache_stats
+from ..utils.metrics import CONTENT_TYPE, registry
+
+router = APIRouter(tags=["metrics"])
+
+
+def _workspace_label(token: str) -> str:
+    """세션 토큰 대신 노출하는 워크스페이스 식별자 (토큰 해시 앞부분)"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:12]
+
+
+def _workspace_metrics():
+    """워크스페이스별 그래프 크기/메모리 추정치"""
+    workspaces = workspace_manager.list_workspaces()
+    nodes, links, memory, versions = [], [], [], []
+    for token, workspace in workspaces.items():
+        service = workspace.service
+        labels = {"workspace": _workspace_label(token)}
+        nodes.append((labels, len(service.current_nodes)))
+        links.append((labels, len(service.current_links)))
+        memory.append((labels, service.estimated_memory()))
+        versions.append((labels, service.graph_version))
+    yield "path_workspaces", "Workspaces held in memory by this worker", [({}, len(workspaces))]
+    yield ("path_workspace_evictions_total", "Workspaces evicted since start",
+           [({}, workspace_manager.evictions)], "counter")
+    yield "path_workspace_nodes", "Nodes per workspace", nodes
+    yield "path_workspace_links", "Links per workspace", links
+    yield "path_workspace_estimated_memory_bytes", "Estimated graph memory per workspace", memory
+    yield "path_workspace_graph_version", "Graph version per workspace", versions
+    yield ("path_preloaded_files_estimated_memory_bytes", "Estimated memory of files preloaded by this worker",
+           [({}, preloaded_files.estimated_memory())])
+
+
+def _cache_metrics():
+    """캐시별 적중/실패 횟수와 적중률 (워크스페이스 캐시는 메모리에 있는 워크스페이스 합계)"""
+    totals = {"tile": [0, 0], "route": [0, 0], "serialization": [0, 0]}
+    for workspace in workspace_manager.list_workspaces().values():
+        for cache, (hits, misses) in workspace.service.cache_stats().items():
+            totals[cache][0] += hits
+            totals[cache][1] += misses
+    totals["file"] = list(file_cache.stats())
+    totals["compression"] = list(compression_cache_stats())
+    totals["basemap"] = list(tile_proxy.stats())
+
+    yield ("path_cache_hits_total", "Cache hits by cache",
+           [({"cache": cache}, hits) for cache, (hits, _) in totals.items()], "counter")
+    yield ("path_cache_misses_total", "Cache misses by cache",
+           [({"cache": cache}, misses) for cache, (_, misses) in totals.items()], "counter")
+    yield ("path_cache_hit_ratio", "Cache hit ratio by cache",
+           [({"cache": cache}, hits / (hits + misses) if hits + misses else 0.0)
+            for cache, (hits, misses) in totals.items()])
+
+
+def _tile_proxy_metrics():
+    """배경 지도 타일 프록시 원본 요청/디스크 캐시 상태"""
+    info = tile_proxy.info()
+    yield ("path_tile_proxy_coalesced_total", "Tile misses that waited on an in-flight upstream request",
+           [({}, info["coalesced"])], "counter")
+    yield "path_tile_proxy_upstream_errors_total", "Failed upstream tile requests", [({}, info["upstream_errors"])], "counter"
+    yield ("path_tile_proxy_evictions_total", "Tiles evicted from the disk cache by this worker",
+           [({}, info["evictions"])], "counter")
+    yield "path_tile_proxy_in_flight", "Upstream tile requests in progress", [({}, info["in_flight"])]
+    if info["estimated_bytes"] is not None:
+        yield "path_tile_proxy_cache_bytes", "Estimated size of the tile disk cache", [({}, info["estimated_bytes"])]
+
+
+def _job_metrics():
+    """상태별 백그라운드 작업 수"""
+    statuses = Counter(job.status for job in job_manager.list())
+    yield "path_jobs", "Background jobs by status", [({"status": status}, count) for status, count in statuses.items()]
+
+
+registry.add_collector(_workspace_metrics)
+registry.add_collector(_cache_metrics)
+registry.add_collector(_tile_proxy_metrics)
+registry.add_collector(_job_metrics)
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """Prometheus 텍스트 형식 메트릭 (워커 프로세스별 값)"""
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
@@ -1,224 +1,488 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
-from fastapi.responses import FileResponse
-from typing import List
-import json
+from fastapi import (
+    APIRouter, HTTPException, UploadFile, File, Query, Depends, Request, Response, WebSocket, WebSocketDisconnect
+)
+from fastapi.responses import FileResponse, StreamingResponse
+from typing import AsyncIterator, List, Optional, Union
+import asyncio
+import codecs
+import secrets
 import tempfile
 import os
+from urllib.parse import quote
 
 from ..models.path_models import (
     Node, Link, PathData, NodeCreate, LinkCreate, 
-    NodeUpdate, LinkUpdate
+    NodeUpdate, LinkUpdate, RouteResult, BatchRouteRequest, ResampleRequest, BatchRequest, BatchResult, MergeRequest,
+    FileCatalogEntry
+)
+from ..services.path_service import PathService, VersionConflictError
+from ..services.workspace_service import Workspace, WorkspaceManager
+from ..services.spatial_index import parse_bbox
+from ..services.delta_service import coalesce
+from ..services.storage_service import SUPPORTED_EXTENSIONS, convert
+from ..services.catalog_service import FileCatalog
+from ..services.job_service import JobManager
+from ..services.warmup_service import WarmStart
+from ..utils.executor import run_blocking
+from ..utils.json_stream import PathDocumentValidator
+from ..utils.serialization import JSON_MEDIA_TYPE, encode_document, dumps
+from ..utils.http_cache import (
+    COMPRESS_MIN_SIZE, PrecompressedFileCache, choose_encoding, conditional_response, etag_matches, not_modified
 )
-from ..services.path_service import PathService
+from ..services.resample_service import WAYPOINT_FIELDS, iter_waypoints_csv, iter_waypoints_binary
 
 router = APIRouter(prefix="/api/path", tags=["path"])
 
-# 전역 서비스 인스턴스
-path_service = PathService()
+# 세션별 워크스페이스 관리자
+workspace_manager = WorkspaceManager.from_env()
+
+# 오래 걸리는 작업용 백그라운드 작업 큐 (상태 조회/취소는 /api/jobs)
+job_manager = JobManager.from_env()
+
+SESSION_HEADER = "X-Session-Token"
+SESSION_COOKIE = "scv_session"
+
+# data 디렉토리 파일의 해시 ETag/압축본 캐시
+file_cache = PrecompressedFileCache()
+
+# data 디렉토리 경로 파일의 메타데이터 카탈로그 (/files?detail=true)
+file_catalog = FileCatalog(workspace_manager.data_dir)
+
+# 시작 시 미리 로드 (PATH_PRELOAD_FILES, PATH_PRELOAD_WORKSPACES) 및 준비 상태 (/ready)
+warm_start = WarmStart.from_env(workspace_manager, file_catalog, file_cache)
+
+
+def get_session_token(request: Request, response: Response) -> str:
+    """요청의 세션 토큰 반환 (헤더 우선, 없으면 쿠키, 둘 다 없으면 새로 발급)"""
+    token = request.headers.get(SESSION_HEADER) or request.cookies.get(SESSION_COOKIE)
+    if not token:
+        token = secrets.token_urlsafe(16)
+        response.set_cookie(SESSION_COOKIE, token, httponly=True, samesite="lax")
+    return token
+
+
+async def get_workspace(token: str = Depends(get_session_token)) -> AsyncIterator[Workspace]:
+    """세션 토큰에 해당하는 워크스페이스 반환 (공유 모드에서는 최신 버전으로 따라잡은 뒤)
+
+    요청이 끝날 때까지 워크스페이스를 사용 중으로 표시하여 다른 세션의 요청이 제거하지 않도록 한다.
+    """
+    workspace = workspace_manager.hold(token)
+    try:
+        await workspace.service.refresh()
+        yield workspace
+    finally:
+        workspace_manager.unhold(workspace)
+
+
+async def get_path_service(workspace: Workspace = Depends(get_workspace)) -> PathService:
+    """세션 토큰에 해당하는 워크스페이스의 PathService 반환"""
+    return workspace.service
+
+
+def _if_match(request: Request, service: PathService) -> Optional[int]:
+    """If-Match 헤더의 기대 버전 (다른 워크스페이스의 ETag면 412)"""
+    try:
+        return service.expected_version(request.headers.get("if-match"))
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=e.report)
+
+
+def _set_record_headers(response: Response, service: PathService, kind: str, record_id: str):
+    """레코드 ETag와 현재 그래프 버전 헤더 설정"""
+    response.headers["ETag"] = service.record_etag(kind, record_id)
+    response.headers["X-Graph-Version"] = str(service.graph_version)
 
 
-@router.get("/files", response_model=List[str])
-async def list_files():
-    """사용 가능한 JSON 파일 목록 반환"""
+@router.get("/files", response_model=Union[List[str], List[FileCatalogEntry]])
+async def list_files(request: Request, detail: bool = False, sort: str = "name", order: str = "asc",
+                     q: Optional[str] = None, type: Optional[str] = None, bbox: Optional[str] = None):
+    """사용 가능한 파일 목록 반환 (detail=true면 카탈로그 메타데이터와 정렬/필터 적용)"""
     try:
-        files = path_service.list_available_files()
-        return files
+        if not detail:
+            files = PathService(workspace_manager.data_dir).list_available_files()
+            return conditional_response(request, dumps(files), JSON_MEDIA_TYPE)
+        
+        if order not in ("asc", "desc"):
+            raise ValueError("order must be asc or desc")
+        if type is not None and type not in ("json", "sqlite"):
+            raise ValueError("type must be json or sqlite")
+        area = parse_bbox(bbox) if bbox else None
+        # 바뀐 파일만 다시 읽으므로 대부분 stat만 수행하지만, 새 파일이 있으면 읽는 동안 루프를 막지 않도록 스레드 풀 사용
+        entries = await run_blocking(file_catalog.query, sort, order == "desc", q, type, area)
+        return conditional_response(request, dumps(entries), JSON_MEDIA_TYPE)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/load/{filename}")
-async def load_path_data(filename: str, merge_duplicates: bool = True):
+async def load_path_data(filename: str, request: Request, merge_duplicates: bool = True,
+                         service: PathService = Depends(get_path_service)):
     """JSON 파일에서 경로 데이터 로드"""
     try:
-        result = path_service.load_path_data(filename, merge_duplicates)
+        # 마지막 로드 이후 파일과 그래프가 그대로이고 클라이언트가 그 결과를 갖고 있으면 다시 로드하지 않음
+        if_none_match = request.headers.get("if-none-match")
+        if (if_none_match and service.is_load_unchanged(filename, merge_duplicates)
+                and etag_matches(if_none_match, service.etag)):
+            return not_modified(service.etag, _version_headers(service))
         
-        if merge_duplicates and isinstance(result, tuple):
-            # 병합 모드에서는 튜플 반환 (path_data, duplicate_info)
-            path_data, duplicate_info = result
-            
-            response_data = {
-                "Node": [node.dict() for node in path_data.Node],
-                "Link": [link.dict() for link in path_data.Link],
-                "duplicate_info": duplicate_info
-            }
-            
-            # 중복 항목이 있을 경우 경고 메시지 추가
-            if duplicate_info["duplicate_nodes"] or duplicate_info["duplicate_links"]:
-                duplicate_count = len(duplicate_info["duplicate_nodes"]) + len(duplicate_info["duplicate_links"])
-                response_data["message"] = f"파일 로드 완료. {duplicate_count}개의 중복 항목이 무시되었습니다."
-        else:
-            # 교체 모드에서는 PathData 반환
-            path_data = result if not isinstance(result, tuple) else result[0]
-            response_data = {
-                "Node": [node.dict() for node in path_data.Node],
-                "Link": [link.dict() for link in path_data.Link]
-            }
-        
-        return response_data
+        # 파일 읽기/파싱과 응답 직렬화는 스레드 풀에서 수행
+        result = await service.load_path_data_async(filename, merge_duplicates)
+        etag, headers = service.etag, _version_headers(service)
+        content = await run_blocking(_build_load_response, service, result, merge_duplicates)
+        return conditional_response(request, content, JSON_MEDIA_TYPE, etag=etag, cache_key="load", headers=headers)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"File {filename} not found")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/load/result/{version}")
+async def get_load_result(version: int, request: Request, service: PathService = Depends(get_path_service)):
+    """로드/병합 작업이 끝난 그래프 버전의 결과 (/load와 같은 형식, 이후 그래프가 바뀌었으면 410)"""
+    result = service.load_result(version)
+    if result is None:
+        raise HTTPException(status_code=410, detail=f"Graph has changed since version {version}")
+    try:
+        etag, headers = service.etag, _version_headers(service)
+        content = await run_blocking(_build_load_response, service, result, isinstance(result, tuple))
+        return conditional_response(request, content, JSON_MEDIA_TYPE, etag=etag, cache_key="load", headers=headers)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _version_headers(service: PathService) -> dict:
+    return {"X-Graph-Version": str(service.graph_version)}
+
+
+def _build_load_response(service: PathService, result, merge_duplicates: bool) -> bytes:
+    """load 결과를 JSON 바이트로 변환 (레코드별 인코딩 캐시 사용)"""
+    if merge_duplicates and isinstance(result, tuple):
+        # 병합 모드에서는 튜플 반환 (path_data, duplicate_info)
+        path_data, duplicate_info = result
+        extra = {"duplicate_info": duplicate_info}
+        
+        # 중복 항목이 있을 경우 경고 메시지 추가
+        if duplicate_info["duplicate_nodes"] or duplicate_info["duplicate_links"]:
+            duplicate_count = len(duplicate_info["duplicate_nodes"]) + len(duplicate_info["duplicate_links"])
+            extra["message"] = f"파일 로드 완료. {duplicate_count}개의 중복 항목이 무시되었습니다."
+    else:
+        # 교체 모드에서는 PathData 반환
+        path_data = result if not isinstance(result, tuple) else result[0]
+        extra = None
+    
+    return encode_document({
+        "Node": service.encode_nodes(path_data.Node),
+        "Link": service.encode_links(path_data.Link)
+    }, extra)
+
+
 @router.post("/save/{filename}")
-async def save_path_data(filename: str, path_data: PathData):
-    """경로 데이터를 JSON 파일로 저장"""
+async def save_path_data(filename: str, request: Request, response: Response,
+                         path_data: Optional[PathData] = None, service: PathService = Depends(get_path_service)):
+    """경로 데이터를 JSON 파일로 저장 (본문이 없으면 현재 데이터 저장, If-Match로 그래프 버전 확인)"""
+    expected = _if_match(request, service)
     try:
-        result = path_service.save_path_data(filename, path_data)
+        result = await service.save_path_data_async(filename, path_data, expected)
+        response.headers["ETag"] = service.etag
+        response.headers["X-Graph-Version"] = str(service.graph_version)
         return {"message": result}
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=e.report)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/current", response_model=PathData)
-async def get_current_data():
-    """현재 로드된 경로 데이터 반환"""
+async def get_current_data(request: Request, service: PathService = Depends(get_path_service)):
+    """현재 로드된 경로 데이터 반환 (그래프 버전 ETag, If-None-Match 시 304)"""
     try:
-        return path_service.get_current_data()
+        etag, headers = service.etag, _version_headers(service)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return not_modified(etag, headers)
+        
+        # 신뢰된 내부 데이터이므로 response_model 재검증 없이 캐시된 바이트를 그대로 반환
+        content = await run_blocking(service.encode_current)
+        return conditional_response(request, content, JSON_MEDIA_TYPE, etag=etag, cache_key="current", headers=headers)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# 업로드를 디스크로 옮기며 검사할 때 한 번에 읽는 크기 (바이트)
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
 @router.post("/upload")
 async def upload_file(file: UploadFile = File(...)):
-    """JSON 파일 업로드"""
+    """JSON 파일 업로드 (청크 단위로 저장하며 구조/레코드 검사, 레코드 수·해시·bbox 반환)"""
     if not file.filename.endswith('.json'):
         raise HTTPException(status_code=400, detail="Only JSON files are allowed")
     
     try:
-        # 임시 파일로 저장
-        with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.json') as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_file_path = tmp_file.name
-        
-        # JSON 유효성 검사
-        with open(tmp_file_path, 'r', encoding='utf-8') as f:
-            json_data = json.load(f)
-        
-        # 데이터 구조 검사
-        if "Node" not in json_data or "Link" not in json_data:
-            raise HTTPException(status_code=400, detail="Invalid JSON structure. Must contain 'Node' and 'Link' arrays")
-        
-        # 최종 저장 위치로 이동
-        final_path = os.path.join(path_service.data_dir, file.filename)
-        os.makedirs(os.path.dirname(final_path), exist_ok=True)
-        os.rename(tmp_file_path, final_path)
-        
-        return {"message": f"File {file.filename} uploaded successfully"}
-    
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=400, detail="Invalid JSON format")
+        # 청크 읽기/검사/임시 파일 쓰기/이동은 스레드 풀에서 수행
+        summary = await run_blocking(_store_uploaded_file, file.file, file.filename)
+        return {"message": f"File {file.filename} uploaded successfully", **summary}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _store_uploaded_file(source, filename: str) -> dict:
+    """업로드 내용을 청크 단위로 임시 파일에 쓰면서 검사한 뒤 data 디렉토리로 이동
+
+    검사는 쓰는 동안 한 번만 수행하며, 잘못된 내용은 해당 청크에서 바로 거부하여 나머지를 읽지 않는다.
+    """
+    final_path = os.path.join(workspace_manager.data_dir, filename)
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    validator = PathDocumentValidator()
+    
+    # 같은 디렉토리의 임시 파일에 써서 이동이 원자적으로 이루어지도록 함 (.json이 아니므로 목록에 보이지 않음)
+    with tempfile.NamedTemporaryFile(mode='wb', delete=False, dir=os.path.dirname(final_path),
+                                     prefix='.upload-', suffix='.tmp') as tmp_file:
+        tmp_file_path = tmp_file.name
+    try:
+        with open(tmp_file_path, 'wb') as tmp_file:
+            while True:
+                chunk = source.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                validator.feed(chunk)
+                tmp_file.write(chunk)
+        summary = validator.finish()
+        os.replace(tmp_file_path, final_path)
+        # 검사하면서 얻은 메타데이터를 카탈로그에 바로 등록 (다시 읽지 않음)
+        file_catalog.record(filename, summary)
+        return summary
+    finally:
         # 임시 파일 정리
-        if 'tmp_file_path' in locals() and os.path.exists(tmp_file_path):
+        if os.path.exists(tmp_file_path):
             os.unlink(tmp_file_path)
+
+
+@router.post("/import/trace")
+async def import_trace(file: UploadFile = File(...), min_distance: float = 1.0, heading_threshold: float = 10.0,
+                       service: PathService = Depends(get_path_service)):
+    """GPS 트레이스(CSV/NMEA) 파일로 노드와 링크 일괄 생성"""
+    if min_distance <= 0:
+        raise HTTPException(status_code=400, detail="min_distance must be positive")
+    
+    try:
+        # 업로드 파일을 한 줄씩 읽어 메모리 사용량을 제한
+        lines = codecs.iterdecode(file.file, "utf-8", errors="replace")
+        return await service.run_locked(service.import_trace, lines, min_distance, heading_threshold)
+    except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/download/{filename}")
-async def download_file(filename: str):
-    """JSON 파일 다운로드"""
-    file_path = os.path.join(path_service.data_dir, filename)
+async def download_file(filename: str, request: Request):
+    """JSON 파일 다운로드 (내용 해시 ETag, 압축본은 캐시하여 재사용)"""
+    file_path = os.path.join(workspace_manager.data_dir, filename)
     
     if not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail=f"File {filename} not found")
+    if not filename.endswith('.json'):
+        # SQLite 파일은 WAL에 남은 변경이 빠질 수 있으므로 /convert로 JSON을 만든 뒤 다운로드
+        raise HTTPException(status_code=400, detail="Only JSON files can be downloaded; export with /convert first")
+    
+    encoding = None
+    if os.path.getsize(file_path) >= COMPRESS_MIN_SIZE:
+        encoding = choose_encoding(request.headers.get("accept-encoding"))
+    try:
+        etag, body = await run_blocking(file_cache.lookup, file_path, encoding)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"File {filename} not found")
+    
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    
+    headers = {"ETag": etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+    if body is not None:
+        headers["Content-Encoding"] = encoding
+        headers["Content-Disposition"] = _content_disposition(filename)
+        return Response(content=body, media_type='application/json', headers=headers)
     
     return FileResponse(
         path=file_path,
         filename=filename,
-        media_type='application/json'
+        media_type='application/json',
+        headers=headers
     )
 
 
+def _content_disposition(filename: str) -> str:
+    """FileResponse와 같은 규칙의 attachment 헤더"""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+@router.post("/convert/{filename}")
+async def convert_file(filename: str, target: str):
+    """JSON ↔ SQLite 파일 변환 (워크스페이스 데이터는 바꾸지 않음)"""
+    if os.path.basename(target) != target or not target.endswith(SUPPORTED_EXTENSIONS):
+        raise HTTPException(status_code=400, detail=f"Target must be a file name ending with {', '.join(SUPPORTED_EXTENSIONS)}")
+    if target == filename:
+        raise HTTPException(status_code=400, detail="Target must differ from the source file")
+    
+    source_path = os.path.join(workspace_manager.data_dir, filename)
+    if not os.path.exists(source_path):
+        raise HTTPException(status_code=404, detail=f"File {filename} not found")
+    
+    try:
+        node_count, link_count = await run_blocking(
+            convert, source_path, os.path.join(workspace_manager.data_dir, target)
+        )
+        return {"message": f"{filename} converted to {target}", "nodes": node_count, "links": link_count}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # Node API
+MAX_PAGE_SIZE = 10000
+
+
+def _page_response(content: bytes, next_cursor: Optional[str], total: int) -> Response:
+    """페이지 조회 응답 (다음 커서와 전체 개수는 헤더로 전달)"""
+    headers = {"X-Total-Count": str(total)}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return Response(content=content, media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
 @router.get("/nodes", response_model=List[Node])
-async def get_all_nodes():
-    """모든 노드 목록 반환"""
+async def get_all_nodes(node_type: Optional[int] = None, cursor: Optional[str] = None,
+                        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE), fields: Optional[str] = None,
+                        bbox: Optional[str] = None, service: PathService = Depends(get_path_service)):
+    """노드 목록 반환 (NodeType/bbox 필터, 커서 페이지, fields= 필드 선택 지원)"""
     try:
-        return path_service.current_nodes
+        if node_type is None and cursor is None and limit is None and fields is None and bbox is None:
+            content = await run_blocking(service.encode_nodes)
+            return Response(content=content, media_type=JSON_MEDIA_TYPE)
+        
+        content, next_cursor, total = await run_blocking(
+            service.query_nodes, node_type, cursor, limit, fields, parse_bbox(bbox) if bbox else None
+        )
+        return _page_response(content, next_cursor, total)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/nodes/{node_id}", response_model=Node)
-async def get_node(node_id: str):
-    """특정 노드 정보 반환"""
-    node = path_service.get_node_by_id(node_id)
+async def get_node(node_id: str, response: Response, service: PathService = Depends(get_path_service)):
+    """특정 노드 정보 반환 (레코드 ETag 포함)"""
+    node = service.get_node_by_id(node_id)
     if not node:
         raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
+    _set_record_headers(response, service, "node", node_id)
     return node
 
 
 @router.post("/nodes", response_model=Node)
-async def create_node(node_data: NodeCreate):
+async def create_node(node_data: NodeCreate, service: PathService = Depends(get_path_service)):
     """새 노드 생성"""
     try:
-        new_node = path_service.add_node(node_data)
+        # 쓰기 즉시 기록하는 저장소(SQLite)/공유 저널 I/O가 이벤트 루프를 막지 않도록 스레드 풀에서 변경
+        async with service.write_lock:
+            new_node = await run_blocking(service.add_node, node_data)
         return new_node
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.put("/nodes/{node_id}/position")
-async def update_node_position(node_id: str, lat: float, lon: float):
-    """노드 위치 업데이트"""
+async def update_node_position(node_id: str, lat: float, lon: float, request: Request, response: Response,
+                               service: PathService = Depends(get_path_service)):
+    """노드 위치 업데이트 (If-Match로 노드 버전 확인)"""
+    expected = _if_match(request, service)
     try:
-        updated_node = path_service.update_node(node_id, lat, lon)
+        async with service.write_lock:
+            service.check_record("node", node_id, expected)
+            updated_node = await run_blocking(service.update_node, node_id, lat, lon)
         if not updated_node:
             raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
+        _set_record_headers(response, service, "node", node_id)
         return {"message": f"Node {node_id} position updated", "node": updated_node}
+    except HTTPException:
+        raise
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=e.report)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.delete("/nodes/{node_id}")
-async def delete_node(node_id: str):
-    """노드 삭제"""
+async def delete_node(node_id: str, request: Request, response: Response,
+                      service: PathService = Depends(get_path_service)):
+    """노드 삭제 (If-Match로 노드 버전 확인)"""
+    expected = _if_match(request, service)
     try:
-        success = path_service.delete_node(node_id)
+        async with service.write_lock:
+            service.check_record("node", node_id, expected)
+            success = await run_blocking(service.delete_node, node_id)
         if not success:
             raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
+        response.headers["X-Graph-Version"] = str(service.graph_version)
         return {"message": f"Node {node_id} deleted successfully"}
+    except HTTPException:
+        raise
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=e.report)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # Link API
 @router.get("/links", response_model=List[Link])
-async def get_all_links():
-    """모든 링크 목록 반환"""
+async def get_all_links(link_type: Optional[int] = None, section_id: Optional[str] = None,
+                        cursor: Optional[str] = None, limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+                        fields: Optional[str] = None, bbox: Optional[str] = None,
+                        service: PathService = Depends(get_path_service)):
+    """링크 목록 반환 (LinkType/SectionID/bbox 필터, 커서 페이지, fields= 필드 선택 지원)"""
     try:
-        return path_service.current_links
+        if (link_type is None and section_id is None and cursor is None and limit is None
+                and fields is None and bbox is None):
+            content = await run_blocking(service.encode_links)
+            return Response(content=content, media_type=JSON_MEDIA_TYPE)
+        
+        content, next_cursor, total = await run_blocking(
+            service.query_links, link_type, section_id, cursor, limit, fields, parse_bbox(bbox) if bbox else None
+        )
+        return _page_response(content, next_cursor, total)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/links/{link_id}", response_model=Link)
-async def get_link(link_id: str):
-    """특정 링크 정보 반환"""
-    link = path_service.get_link_by_id(link_id)
+async def get_link(link_id: str, response: Response, service: PathService = Depends(get_path_service)):
+    """특정 링크 정보 반환 (레코드 ETag 포함)"""
+    link = service.get_link_by_id(link_id)
     if not link:
         raise HTTPException(status_code=404, detail=f"Link {link_id} not found")
+    _set_record_headers(response, service, "link", link_id)
     return link
 
 
 @router.post("/links", response_model=Link)
-async def create_link(link_data: LinkCreate):
+async def create_link(link_data: LinkCreate, service: PathService = Depends(get_path_service)):
     """새 링크 생성"""
     try:
-        # FromNodeID와 ToNodeID가 존재하는지 확인
-        from_node = path_service.get_node_by_id(link_data.FromNodeID)
-        to_node = path_service.get_node_by_id(link_data.ToNodeID)
-        
-        if not from_node:
-            raise HTTPException(status_code=404, detail=f"FromNode {link_data.FromNodeID} not found")
-        if not to_node:
-            raise HTTPException(status_code=404, detail=f"ToNode {link_data.ToNodeID} not found")
-        
-        new_link = path_service.add_link(link_data)
+        async with service.write_lock:
+            # 확인과 추가 사이에 노드가 삭제되지 않도록 잠금 안에서 FromNodeID와 ToNodeID가 존재하는지 확인
+            if not service.get_node_by_id(link_data.FromNodeID):
+                raise HTTPException(status_code=404, detail=f"FromNode {link_data.FromNodeID} not found")
+            if not service.get_node_by_id(link_data.ToNodeID):
+                raise HTTPException(status_code=404, detail=f"ToNode {link_data.ToNodeID} not found")
+            new_link = await run_blocking(service.add_link, link_data)
         return new_link
     except HTTPException:
         raise
@@ -227,35 +491,391 @@ async def create_link(link_data: LinkCreate):
 
 
 @router.delete("/links/{link_id}")
-async def delete_link(link_id: str):
-    """링크 삭제"""
+async def delete_link(link_id: str, request: Request, response: Response,
+                      service: PathService = Depends(get_path_service)):
+    """링크 삭제 (If-Match로 링크 버전 확인)"""
+    expected = _if_match(request, service)
     try:
-        success = path_service.delete_link(link_id)
+        async with service.write_lock:
+            service.check_record("link", link_id, expected)
+            success = await run_blocking(service.delete_link, link_id)
         if not success:
             raise HTTPException(status_code=404, detail=f"Link {link_id} not found")
+        response.headers["X-Graph-Version"] = str(service.graph_version)
         return {"message": f"Link {link_id} deleted successfully"}
+    except HTTPException:
+        raise
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=e.report)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# Batch API
+@router.post("/batch", response_model=BatchResult)
+async def apply_batch(batch: BatchRequest, request: Request, response: Response,
+                      service: PathService = Depends(get_path_service)):
+    """노드/링크 추가·이동·삭제 작업을 한 번에 원자적으로 적용 (실패 시 400, 버전 충돌 시 412와 작업별 결과 반환)"""
+    expected = _if_match(request, service)
+    try:
+        result = await service.run_locked(service.apply_batch, batch.Operations, expected)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    
+    if not result.Applied:
+        raise HTTPException(status_code=412 if result.Conflict else 400, detail=result.dict())
+    response.headers["ETag"] = service.etag
+    response.headers["X-Graph-Version"] = str(result.GraphVersion)
+    return result
 
 
 @router.get("/validate")
-async def validate_data_integrity():
+async def validate_data_integrity(service: PathService = Depends(get_path_service)):
     """현재 데이터의 무결성 검사"""
     try:
-        issues = path_service.validate_data_integrity()
-        
-        has_issues = any(issues[key] for key in issues)
-        
-        return {
-            "valid": not has_issues,
-            "issues": issues,
-            "summary": {
-                "total_nodes": len(path_service.current_nodes),
-                "total_links": len(path_service.current_links),
-                "duplicate_nodes": len(issues["duplicate_node_ids"]),
-                "duplicate_links": len(issues["duplicate_link_ids"]),
-                "orphaned_links": len(issues["orphaned_links"])
-            }
+        issues = await run_blocking(service.validate_data_integrity)
+        return _validation_report(service, issues)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _validation_report(service: PathService, issues: dict) -> dict:
+    """무결성 검사 결과 응답"""
+    has_issues = any(issues[key] for key in issues)
+    
+    return {
+        "valid": not has_issues,
+        "issues": issues,
+        "summary": {
+            "total_nodes": len(service.current_nodes),
+            "total_links": len(service.current_links),
+            "duplicate_nodes": len(issues["duplicate_node_ids"]),
+            "duplicate_links": len(issues["duplicate_link_ids"]),
+            "orphaned_links": len(issues["orphaned_links"])
         }
+    }
+
+
+# Background job API
+def _job_accepted(kind: str, token: str, func) -> Response:
+    """작업을 등록하고 202와 상태 조회 위치 반환"""
+    try:
+        job = job_manager.submit(kind, func, owner=token)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    # 작업이 끝나기 전에 워크스페이스가 제거되면 결과가 아무도 볼 수 없는 인스턴스에 적용되므로 사용 중으로 표시
+    workspace = workspace_manager.hold(token)
+    job.task.add_done_callback(lambda _: workspace_manager.unhold(workspace))
+    return Response(content=dumps(job.info()), status_code=202, media_type=JSON_MEDIA_TYPE,
+                    headers={"Location": f"/api/jobs/{job.id}"})
+
+
+@router.post("/jobs/validate", status_code=202)
+async def submit_validate_job(token: str = Depends(get_session_token),
+                              service: PathService = Depends(get_path_service)):
+    """무결성 검사를 백그라운드 작업으로 실행"""
+    async def run(job):
+        job.update(message="Validating")
+        issues = await service.run_locked(service.validate_data_integrity)
+        return _validation_report(service, issues)
+    return _job_accepted("validate", token, run)
+
+
+def _load_job_result(service: PathService, duplicate_info: Optional[dict]) -> dict:
+    """로드/병합 작업 결과 요약 (전체 데이터는 result 경로에서 버전으로 조회)"""
+    summary = {
+        "graph_version": service.graph_version,
+        "total_nodes": len(service.current_nodes),
+        "total_links": len(service.current_links),
+        "result": f"/api/path/load/result/{service.graph_version}"
+    }
+    if duplicate_info is not None:
+        summary.update({
+            "nodes_added": duplicate_info["nodes_added"],
+            "links_added": duplicate_info["links_added"],
+            "duplicate_nodes": len(duplicate_info["duplicate_nodes"]),
+            "duplicate_links": len(duplicate_info["duplicate_links"])
+        })
+    return summary
+
+
+@router.post("/jobs/load/{filename}", status_code=202)
+async def submit_load_job(filename: str, merge_duplicates: bool = True, token: str = Depends(get_session_token),
+                          service: PathService = Depends(get_path_service)):
+    """파일 로드를 백그라운드 작업으로 실행 (진행 상황은 /api/jobs/{id}/events, 병합 결과를 적용하기 전까지는 취소 가능)"""
+    if not os.path.exists(os.path.join(workspace_manager.data_dir, filename)):
+        raise HTTPException(status_code=404, detail=f"File {filename} not found")
+    
+    async def run(job):
+        result = await service.run_locked(service.load_path_data, filename, merge_duplicates, job.update)
+        return {"file": filename, **_load_job_result(service, result[1] if isinstance(result, tuple) else None)}
+    return _job_accepted("load", token, run)
+
+
+@router.post("/jobs/merge", status_code=202)
+async def submit_merge_job(request: MergeRequest, token: str = Depends(get_session_token),
+                           service: PathService = Depends(get_path_service)):
+    """여러 파일을 순서대로 현재 데이터에 병합 (모든 파일을 읽기 전까지는 취소 가능)"""
+    if not request.Files:
+        raise HTTPException(status_code=400, detail="Files must not be empty")
+    for filename in request.Files:
+        if not os.path.exists(os.path.join(workspace_manager.data_dir, filename)):
+            raise HTTPException(status_code=404, detail=f"File {filename} not found")
+    
+    async def run(job):
+        result = await service.run_locked(service.merge_files, request.Files, job.update)
+        return {**result, "result": f"/api/path/load/result/{result['graph_version']}"}
+    return _job_accepted("merge", token, run)
+
+
+@router.post("/jobs/export/{filename}", status_code=202)
+async def submit_export_job(filename: str, token: str = Depends(get_session_token),
+                            service: PathService = Depends(get_path_service)):
+    """현재 데이터를 파일로 저장 (JSON/SQLite, 파일을 쓰기 전까지는 취소 가능)"""
+    if not filename.endswith(SUPPORTED_EXTENSIONS):
+        raise HTTPException(status_code=400, detail=f"Unsupported file type: {filename}")
+    
+    async def run(job):
+        job.update(message=f"Exporting {filename}")
+        message = await service.run_locked(service.save_path_data, filename, progress=job.update)
+        return {"message": message, "graph_version": service.graph_version}
+    return _job_accepted("export", token, run)
+
+
+@router.post("/jobs/simplify", status_code=202)
+async def submit_simplify_job(tolerance: float = 0.5, dry_run: bool = False,
+                              token: str = Depends(get_session_token),
+                              service: PathService = Depends(get_path_service)):
+    """노드 체인 단순화를 백그라운드 작업으로 실행 (삭제 대상을 적용하기 전까지는 취소 가능)"""
+    if tolerance < 0:
+        raise HTTPException(status_code=400, detail="Tolerance must not be negative")
+    
+    async def run(job):
+        job.update(message="Simplifying")
+        return await service.run_locked(service.simplify, tolerance, dry_run, job.update)
+    return _job_accepted("simplify", token, run)
+
+
+@router.post("/jobs/recompute-lengths", status_code=202)
+async def submit_recompute_lengths_job(token: str = Depends(get_session_token),
+                                       service: PathService = Depends(get_path_service)):
+    """모든 링크 길이 재계산 (계산이 끝나 적용하기 전까지는 취소 가능)"""
+    async def run(job):
+        return await service.run_locked(service.recalculate_all_lengths, job.update)
+    return _job_accepted("recompute_lengths", token, run)
+
+
+# Tile API
+@router.get("/tiles/{z}/{x}/{y}")
+async def get_tile(z: int, x: int, y: int, service: PathService = Depends(get_path_service)):
+    """slippy map 타일 단위 노드/링크 벡터 타일 (저배율에서는 정점 솎아냄)"""
+    try:
+        content = await run_blocking(service.get_tile, z, x, y)
+        return Response(content=content, media_type=JSON_MEDIA_TYPE)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# Route API
+@router.get("/route", response_model=RouteResult)
+async def get_route(from_node: str = Query(..., alias="from"), to_node: str = Query(..., alias="to"),
+                    service: PathService = Depends(get_path_service)):
+    """두 노드 간 최단 경로 조회"""
+    for node_id in (from_node, to_node):
+        if not service.get_node_by_id(node_id):
+            raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
+    
+    try:
+        return await run_blocking(service.find_route, from_node, to_node)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/route/batch", response_model=List[RouteResult])
+async def get_routes_batch(request: BatchRouteRequest, service: PathService = Depends(get_path_service)):
+    """여러 출발지/목적지 쌍의 최단 경로 일괄 조회"""
+    try:
+        pairs = [(pair.FromNodeID, pair.ToNodeID) for pair in request.Pairs]
+        return await run_blocking(service.find_routes, pairs)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/resample")
+async def resample_path(request: ResampleRequest, service: PathService = Depends(get_path_service)):
+    """노드 순서 또는 경로를 일정 간격 웨이포인트로 변환하여 스트리밍 (global_path 내보내기)"""
+    if request.Format not in ("csv", "binary", "json"):
+        raise HTTPException(status_code=400, detail="Format must be one of csv, binary, json")
+    if request.Spacing <= 0:
+        raise HTTPException(status_code=400, detail="Spacing must be positive")
+    
+    node_ids = request.NodeIDs
+    if not node_ids:
+        if not (request.FromNodeID and request.ToNodeID):
+            raise HTTPException(status_code=400, detail="Either NodeIDs or FromNodeID/ToNodeID is required")
+        route = await run_blocking(service.find_route, request.FromNodeID, request.ToNodeID)
+        if not route.Found:
+            raise HTTPException(status_code=404, detail=f"No route from {request.FromNodeID} to {request.ToNodeID}")
+        node_ids = route.NodeIDs
+    
+    try:
+        waypoints = await run_blocking(service.resample_path, node_ids, request.Spacing)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    headers = {
+        "X-Waypoint-Count": str(len(waypoints)),
+        "X-Waypoint-Fields": ",".join(WAYPOINT_FIELDS)
+    }
+    if request.Format == "json":
+        return {"fields": list(WAYPOINT_FIELDS), "waypoints": waypoints.tolist()}
+    if request.Format == "binary":
+        return StreamingResponse(iter_waypoints_binary(waypoints),
+                                 media_type="application/octet-stream", headers=headers)
+    return StreamingResponse(iter_waypoints_csv(waypoints), media_type="text/csv", headers=headers)
+
+
+@router.post("/simplify")
+async def simplify_path(tolerance: float = 0.5, dry_run: bool = False,
+                        service: PathService = Depends(get_path_service)):
+    """직선에 가까운 노드 체인 단순화 (Douglas–Peucker, 허용 오차 m 단위)"""
+    if tolerance < 0:
+        raise HTTPException(status_code=400, detail="Tolerance must not be negative")
+    
+    try:
+        return await service.run_locked(service.simplify, tolerance, dry_run)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# Analysis API
+@router.get("/analysis/connectivity")
+async def get_connectivity_analysis(depot: Optional[str] = None,
+                                    service: PathService = Depends(get_path_service)):
+    """연결성 분석 (강/약 연결 컴포넌트, 기점 도달 불가 노드, 막다른 노드)"""
+    if depot is not None and not service.get_node_by_id(depot):
+        raise HTTPException(status_code=404, detail=f"Node {depot} not found")
+    
+    try:
+        return await run_blocking(service.analyze_connectivity, depot)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# Delta stream API
+# 드래그처럼 잦은 변경을 모아 보내는 간격 (초)
+DELTA_COALESCE_SECONDS = float(os.environ.get("WS_COALESCE_MS", "50")) / 1000.0
+# 전송 대기 델타가 이보다 많으면 느린 클라이언트로 보고 스냅샷으로 다시 동기화
+DELTA_MAX_PENDING = 5000
+
+
+async def _send_sync(websocket: WebSocket, service: PathService, since: Optional[int]) -> int:
+    """since 이후 델타(버퍼에 남아 있으면) 또는 전체 스냅샷 전송 후 클라이언트 버전 반환"""
+    async with service.write_lock:
+        version = service.graph_version
+        deltas = service.deltas.since(since, version) if since is not None else None
+        snapshot = await run_blocking(service.encode_current) if deltas is None else None
+    
+    if snapshot is not None:
+        await websocket.send_text(
+            '{"t":"snapshot","v":%d,"data":%s}' % (version, snapshot.decode("utf-8"))
+        )
+    elif deltas:
+        await websocket.send_text(dumps({"t": "deltas", "from": since + 1, "v": version,
+                                         "changes": coalesce(deltas)}).decode("utf-8"))
+    else:
+        await websocket.send_text(dumps({"t": "sync", "v": version}).decode("utf-8"))
+    return version
+
+
+async def _receive_commands(websocket: WebSocket, queue: asyncio.Queue):
+    """클라이언트 메시지 수신 ({"t": "resync", "since": 버전} 요청, 연결 종료 감지)"""
+    try:
+        while True:
+            message = await websocket.receive_json()
+            if isinstance(message, dict) and message.get("t") == "resync":
+                queue.put_nowait({"t": "_resync", "since": message.get("since")})
+    except (WebSocketDisconnect, ValueError, RuntimeError):
+        pass
+    finally:
+        queue.put_nowait({"t": "_closed"})
+
+
+@router.websocket("/ws")
+async def delta_stream(websocket: WebSocket, since: Optional[int] = None):
+    """워크스페이스 변경 델타 스트림 (접속 시 since 이후 델타 또는 스냅샷, 이후 버전별 델타)"""
+    # 브라우저 WebSocket은 헤더를 지정할 수 없으므로 token 쿼리 파라미터도 허용
+    token = (websocket.query_params.get("token") or websocket.headers.get(SESSION_HEADER)
+             or websocket.cookies.get(SESSION_COOKIE))
+    if not token:
+        await websocket.close(code=1008)
+        return
+    workspace = workspace_manager.hold(token)
+    try:
+        await _stream_deltas(websocket, workspace.service, since)
+    finally:
+        workspace_manager.unhold(workspace)
+
+
+async def _stream_deltas(websocket: WebSocket, service: PathService, since: Optional[int]):
+    """델타 스트림 본체 (연결이 끝날 때까지 반환하지 않음)"""
+    await service.refresh()
+    await websocket.accept()
+    
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    
+    def listener(delta: dict):
+        # 변경 작업은 스레드 풀에서도 실행되므로 이벤트 루프로 넘겨서 큐에 넣음
+        loop.call_soon_threadsafe(queue.put_nowait, delta)
+    
+    # 구독을 먼저 등록한 뒤 동기화해야 그 사이의 변경이 누락되지 않음
+    service.deltas.subscribe(listener)
+    receiver = asyncio.create_task(_receive_commands(websocket, queue))
+    try:
+        version = await _send_sync(websocket, service, since)
+        while True:
+            pending = [await queue.get()]
+            await asyncio.sleep(DELTA_COALESCE_SECONDS)
+            while not queue.empty():
+                pending.append(queue.get_nowait())
+            
+            if any(item["t"] == "_closed" for item in pending):
+                break
+            resync = [item for item in pending if item["t"] == "_resync"]
+            if resync or len(pending) > DELTA_MAX_PENDING:
+                version = await _send_sync(websocket, service, resync[-1]["since"] if resync else version)
+                continue
+            
+            deltas = [item for item in pending if item["v"] > version]
+            if not deltas:
+                continue
+            if deltas[0]["v"] != version + 1 or any(item["t"] == "reset" for item in deltas):
+                version = await _send_sync(websocket, service, version)
+                continue
+            await websocket.send_text(dumps({"t": "deltas", "from": version + 1, "v": deltas[-1]["v"],
+                                             "changes": coalesce(deltas)}).decode("utf-8"))
+            version = deltas[-1]["v"]
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        service.deltas.unsubscribe(listener)
+        receiver.cancel()
+
+
+# Workspace API
+@router.get("/workspace")
+async def get_workspace_info(workspace: Workspace = Depends(get_workspace)):
+    """현재 세션 워크스페이스 정보 반환"""
+    return workspace.info()
+
+
+@router.delete("/workspace")
+async def release_workspace(token: str = Depends(get_session_token)):
+    """현재 세션 워크스페이스 해제"""
+    released = await run_blocking(workspace_manager.release, token)
+    return {"message": "Workspace released" if released else "Workspace not found"}
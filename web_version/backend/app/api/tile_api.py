@@ -0,0 +1,73 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Depends, Response
+
+from .path_api import get_session_token, workspace_manager, _job_accepted
+from ..services.spatial_index import parse_bbox
+from ..services.tile_proxy_service import TileProxyCache, TileUpstreamError, tile_media_type
+from ..utils.executor import run_blocking
+from ..utils.serialization import JSON_MEDIA_TYPE, dumps
+
+router = APIRouter(prefix="/api/tiles", tags=["tiles"])
+
+# 배경 지도 타일 프록시 캐시 (디스크 캐시는 워커/파드 간 공유 가능)
+tile_proxy = TileProxyCache.from_env()
+
+# 브라우저가 다시 요청하지 않고 사용할 시간 (초)
+TILE_MAX_AGE = 86400
+
+
+@router.get("")
+async def get_tile_proxy_info():
+    """사용 가능한 타일 제공자와 캐시 상태"""
+    return tile_proxy.info()
+
+
+@router.get("/{provider}/{z}/{x}/{y}")
+async def get_basemap_tile(provider: str, z: int, x: int, y: int):
+    """배경 지도 타일 (디스크 캐시에 없으면 원본 서버에서 받아 저장, X-Tile-Cache로 hit/miss/stale 표시)"""
+    try:
+        content, status = await tile_proxy.get(provider, z, x, y)
+        return Response(content=content, media_type=tile_media_type(content), headers={
+            "Cache-Control": f"public, max-age={TILE_MAX_AGE}",
+            "X-Tile-Cache": status
+        })
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except TileUpstreamError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/{provider}/prefetch", status_code=202)
+async def submit_prefetch_job(provider: str, min_zoom: int = 14, max_zoom: int = 18, bbox: Optional[str] = None,
+                              token: str = Depends(get_session_token)):
+    """현재 워크스페이스 지도 범위(또는 bbox)의 타일을 백그라운드 작업으로 미리 받음 (모두 캐시에 있으면 200과 요약)"""
+    try:
+        area = parse_bbox(bbox) if bbox else None
+        if area is None:
+            service = workspace_manager.get(token)
+            await service.refresh()
+            area = service.bounds()
+            if area is None:
+                raise ValueError("No map is loaded; load a file or pass bbox")
+        tiles = tile_proxy.prefetch_plan(provider, area, min_zoom, max_zoom)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # 이미 받아 둔 범위면 작업을 만들지 않음
+    planned = len(tiles)
+    tiles = await run_blocking(tile_proxy.uncached, provider, tiles)
+    if not tiles:
+        return Response(content=dumps({"provider": provider, "bbox": list(area), "tiles": planned,
+                                       "cached": planned}), media_type=JSON_MEDIA_TYPE)
+
+    async def run(job):
+        job.update(message=f"Prefetching {len(tiles)} {provider} tiles")
+        result = await tile_proxy.prefetch(provider, tiles, job.update)
+        return {"provider": provider, "bbox": list(area), **result,
+                "tiles": planned, "cached": result["cached"] + planned - len(tiles)}
+    return _job_accepted("prefetch_tiles", token, run)
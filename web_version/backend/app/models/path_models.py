@@ -126,4 +126,83 @@ class LinkUpdate(BaseModel):
     Version: Optional[str] = None
     Remark: Optional[str] = None
     HistType: Optional[str] = None
-    HistRemark: Optional[str] = None
\ No newline at end of file
+    HistRemark: Optional[str] = None
+
+class RouteQuery(BaseModel):
+    FromNodeID: str
+    ToNodeID: str
+
+
+class RouteResult(BaseModel):
+    FromNodeID: str
+    ToNodeID: str
+    Found: bool
+    Length: float = 0.0
+    NodeIDs: List[str] = []
+    LinkIDs: List[str] = []
+
+
+class BatchRouteRequest(BaseModel):
+    Pairs: List[RouteQuery]
+
+
+class ResampleRequest(BaseModel):
+    NodeIDs: List[str] = []
+    FromNodeID: Optional[str] = None
+    ToNodeID: Optional[str] = None
+    Spacing: float = 1.0
+    Format: str = "csv"
+
+
+class BatchOperation(BaseModel):
+    # add_node | move_node | delete_node | add_link | delete_link
+    Op: str
+    # add_node에서 지정하면 같은 배치의 이후 작업이 NodeID/FromNodeID/ToNodeID로 참조 가능
+    Ref: Optional[str] = None
+    NodeID: Optional[str] = None
+    LinkID: Optional[str] = None
+    Lat: Optional[float] = None
+    Lon: Optional[float] = None
+    # 기존 레코드를 대상으로 하는 작업의 기대 버전 (이 버전 이후 바뀌었으면 충돌)
+    Version: Optional[int] = None
+    Node: Optional[NodeCreate] = None
+    Link: Optional[LinkCreate] = None
+
+
+class BatchRequest(BaseModel):
+    Operations: List[BatchOperation]
+
+
+class BatchOperationResult(BaseModel):
+    Index: int
+    Op: str
+    # applied | failed | not_applied
+    Status: str
+    ID: Optional[str] = None
+    Error: Optional[str] = None
+
+
+class BatchResult(BaseModel):
+    Applied: bool
+    GraphVersion: int
+    Results: List[BatchOperationResult]
+    Conflict: Optional[dict] = None
+
+
+class MergeRequest(BaseModel):
+    # 순서대로 현재 데이터에 병합할 data 디렉토리 파일 이름
+    Files: List[str]
+
+
+class FileCatalogEntry(BaseModel):
+    # GET /files?detail=true 항목 (읽을 수 없는 파일은 nodes/links/bbox/etag 없이 error만 채움)
+    name: str
+    type: str  # json | sqlite
+    modified: float
+    size: int
+    nodes: Optional[int] = None
+    links: Optional[int] = None
+    # [minLon, minLat, maxLon, maxLat]
+    bbox: Optional[List[float]] = None
+    etag: Optional[str] = None
+    error: Optional[str] = None
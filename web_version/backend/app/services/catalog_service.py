@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import sqlite3
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from ..utils.json_stream import PathDocumentValidator
+from .spatial_index import BBox, bbox_intersects
+from .storage_service import SQLITE_EXTENSIONS, SUPPORTED_EXTENSIONS, file_signature
+
+# data 디렉토리에 남기는 카탈로그 인덱스 파일 (확장자가 없으므로 경로 파일 목록에는 나타나지 않음)
+CATALOG_INDEX_NAME = ".path_catalog"
+CATALOG_VERSION = 1
+READ_CHUNK_SIZE = 1024 * 1024
+
+SORT_KEYS = ("name", "modified", "size", "nodes", "links")
+
+
+def _json_summary(path: str) -> dict:
+    """JSON 경로 파일을 스트리밍으로 한 번 읽어 레코드 수/해시/bbox 계산"""
+    validator = PathDocumentValidator()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            validator.feed(chunk)
+    return validator.finish()
+
+
+def _sqlite_summary(path: str) -> dict:
+    """SQLite 파일의 레코드 수/bbox (읽기 전용 연결)와 파일 내용 해시"""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (path, path + "-wal"):
+        if os.path.exists(part):
+            with open(part, "rb") as f:
+                for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        nodes = conn.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+        links = conn.execute("SELECT COUNT(*) FROM links").fetchone()[0]
+        bbox = conn.execute("SELECT MIN(lon), MIN(lat), MAX(lon), MAX(lat) FROM nodes").fetchone()
+    finally:
+        conn.close()
+    return {
+        "nodes": nodes,
+        "links": links,
+        "size": os.path.getsize(path),
+        "etag": '"' + digest.hexdigest() + '"',
+        "bbox": list(bbox) if bbox[0] is not None else None
+    }
+
+
+class FileCatalog:
+    """data 디렉토리 경로 파일의 메타데이터 카탈로그
+
+    파일별로 노드/링크 수, 노드 GPS bbox, 내용 해시, 크기, 수정 시각을 보관하며, 목록 조회 시에는
+    파일 (mtime, 크기)만 확인하여 바뀌었거나 새로 생긴 파일만 다시 읽는다. 인덱스는 data 디렉토리에
+    저장하여 서버를 다시 시작해도 재사용한다.
+    """
+
+    def __init__(self, data_dir: str):
+        self.data_dir = data_dir
+        self._entries: Dict[str, dict] = {}
+        self._lock = Lock()
+        self._loaded = False
+        self.rebuilt = 0  # 다시 읽은 파일 수 (누적)
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.data_dir, CATALOG_INDEX_NAME)
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") == CATALOG_VERSION:
+                for entry in index.get("files", []):
+                    entry["signature"] = tuple(entry["signature"])
+                    self._entries[entry["name"]] = entry
+        except (OSError, ValueError, KeyError, TypeError):
+            self._entries = {}
+        self._loaded = True
+
+    def _save_index(self):
+        data = {"version": CATALOG_VERSION, "files": list(self._entries.values())}
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"카탈로그 인덱스 저장 실패: {e}")
+
+    def _build_entry(self, name: str, signature: Tuple) -> dict:
+        path = os.path.join(self.data_dir, name)
+        entry = {
+            "name": name,
+            "type": "sqlite" if name.endswith(SQLITE_EXTENSIONS) else "json",
+            "signature": signature,
+            "modified": signature[0] / 1e9,
+            "size": signature[1],
+            "nodes": None,
+            "links": None,
+            "bbox": None,
+            "etag": None,
+            "error": None
+        }
+        try:
+            summary = _sqlite_summary(path) if entry["type"] == "sqlite" else _json_summary(path)
+            entry.update({key: summary[key] for key in ("nodes", "links", "bbox", "etag")})
+        except (OSError, ValueError, sqlite3.Error) as e:
+            # 읽을 수 없는 파일도 목록에는 남기고 오류를 함께 표시
+            entry["error"] = str(e)
+        self.rebuilt += 1
+        return entry
+
+    def refresh(self) -> List[dict]:
+        """디렉토리를 확인하여 바뀐 파일만 다시 읽은 뒤 전체 항목 반환 (이름 순)"""
+        with self._lock:
+            if not self._loaded:
+                self._load_index()
+            if not os.path.isdir(self.data_dir):
+                return []
+
+            changed = False
+            present = set()
+            for item in os.scandir(self.data_dir):
+                name = item.name
+                if name.startswith(".") or not name.endswith(SUPPORTED_EXTENSIONS) or not item.is_file():
+                    continue
+                try:
+                    signature = file_signature(item.path)
+                except FileNotFoundError:
+                    continue
+                present.add(name)
+                entry = self._entries.get(name)
+                if entry is None or entry["signature"] != signature:
+                    self._entries[name] = self._build_entry(name, signature)
+                    changed = True
+
+            for name in list(self._entries):
+                if name not in present:
+                    del self._entries[name]
+                    changed = True
+            if changed:
+                self._save_index()
+            return [self._entries[name] for name in sorted(self._entries)]
+
+    def record(self, name: str, summary: dict):
+        """방금 쓴 파일의 요약(업로드 검사 결과 등)을 다시 읽지 않고 등록"""
+        path = os.path.join(self.data_dir, name)
+        with self._lock:
+            if not self._loaded:
+                self._load_index()
+            signature = file_signature(path)
+            self._entries[name] = {
+                "name": name,
+                "type": "sqlite" if name.endswith(SQLITE_EXTENSIONS) else "json",
+                "signature": signature,
+                "modified": signature[0] / 1e9,
+                "size": signature[1],
+                "nodes": summary["nodes"],
+                "links": summary["links"],
+                "bbox": summary["bbox"],
+                "etag": summary["etag"],
+                "error": None
+            }
+            self._save_index()
+
+    def query(self, sort: str = "name", descending: bool = False, name_filter: Optional[str] = None,
+              file_type: Optional[str] = None, bbox: Optional[BBox] = None) -> List[dict]:
+        """정렬/필터를 적용한 카탈로그 항목 (변경 감지용 signature는 제외)"""
+        if sort not in SORT_KEYS:
+            raise ValueError(f"sort must be one of {', '.join(SORT_KEYS)}")
+        entries = self.refresh()
+        if name_filter:
+            needle = name_filter.lower()
+            entries = [entry for entry in entries if needle in entry["name"].lower()]
+        if file_type:
+            entries = [entry for entry in entries if entry["type"] == file_type]
+        if bbox is not None:
+            entries = [entry for entry in entries
+                       if entry["bbox"] is not None and bbox_intersects(tuple(entry["bbox"]), bbox)]
+
+        # 값이 없는 항목(읽지 못한 파일)은 정렬 방향과 관계없이 뒤쪽
+        present = [entry for entry in entries if entry[sort] is not None]
+        missing = [entry for entry in entries if entry[sort] is None]
+        present.sort(key=lambda entry: (entry[sort], entry["name"]), reverse=descending)
+        return [{key: value for key, value in entry.items() if key != "signature"} for entry in present + missing]
@@ -0,0 +1,87 @@
+from collections import deque
+from threading import Lock
+from typing import Callable, Dict, List, Optional
+
+# 델타 종류
+#   node_moved:   id, lat, lon, lengths(연결 링크 ID -> 새 길이)
+#   node_added:   node
+#   node_deleted: id, links(함께 삭제된 링크 ID)
+#   link_added:   link
+#   link_deleted: id
+#   batch:        changes(위 델타 목록, 적용 순서대로)
+#   reset:        파일 로드/단순화 등 대량 변경 (클라이언트는 스냅샷으로 다시 동기화)
+RESET = {"t": "reset"}
+
+
+class DeltaLog:
+    """그래프 버전별 변경 델타 링 버퍼와 구독자 목록
+
+    모든 그래프 변경은 버전을 하나씩 올리며 정확히 하나의 델타를 남기므로,
+    클라이언트는 버전이 연속인지로 누락 여부를 알 수 있다.
+    """
+
+    def __init__(self, max_size: int = 1000):
+        self._buffer: "deque[dict]" = deque(maxlen=max_size)
+        self._listeners: List[Callable[[dict], None]] = []
+        self._lock = Lock()
+
+    def record(self, version: int, delta: Optional[dict]):
+        """델타를 버퍼에 추가하고 구독자에게 전달"""
+        entry = {"v": version, **(delta or RESET)}
+        with self._lock:
+            self._buffer.append(entry)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(entry)
+            except Exception as e:
+                print(f"델타 구독자 오류: {e}")
+
+    def since(self, version: int, current_version: int) -> Optional[List[dict]]:
+        """version 이후의 델타 목록 (버퍼에서 밀려났거나 reset이 끼어 있으면 None → 스냅샷 필요)"""
+        if version == current_version:
+            return []
+        if version > current_version:
+            return None
+        with self._lock:
+            if not self._buffer or self._buffer[0]["v"] > version + 1:
+                return None
+            deltas = [entry for entry in self._buffer if entry["v"] > version]
+        if any(entry["t"] == "reset" for entry in deltas):
+            return None
+        return deltas
+
+    def subscribe(self, listener: Callable[[dict], None]):
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[dict], None]):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._listeners)
+
+
+def coalesce(deltas: List[dict]) -> List[dict]:
+    """같은 노드의 연속 이동 델타를 마지막 위치 하나로 병합
+
+    이동끼리는 순서를 바꿔도 결과가 같으므로 다른 노드의 이동은 건너뛰어 병합하고,
+    이동이 아닌 델타를 만나면 병합을 끊는다. 병합된 델타는 가장 나중 위치로 옮겨
+    공유 링크의 길이가 마지막 이동 기준으로 남도록 한다.
+    """
+    result: List[Optional[dict]] = []
+    last_move: Dict[str, int] = {}
+    for delta in deltas:
+        if delta["t"] == "node_moved":
+            previous = last_move.pop(delta["id"], None)
+            if previous is not None:
+                delta = {**delta, "lengths": {**result[previous]["lengths"], **delta["lengths"]}}
+                result[previous] = None
+            last_move[delta["id"]] = len(result)
+        else:
+            last_move.clear()
+        result.append(delta)
+    return [delta for delta in result if delta is not None]
@@ -0,0 +1,210 @@
+import asyncio
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """작업 취소 요청으로 중단됨"""
+
+
+class Job:
+    """백그라운드 작업 하나의 상태/진행률/결과
+
+    작업 함수는 스레드 풀에서 update()로 진행 상황을 알리며, 취소가 요청되면 update()/check_cancelled()가
+    JobCancelled를 내어 작업을 중단시킨다 (변경을 적용하기 전 단계에서만 호출해야 함).
+    상태가 바뀔 때마다 이벤트 루프에서 revision이 증가하며, wait_changed()로 다음 변경을 기다릴 수 있다 (SSE 스트림).
+    """
+
+    def __init__(self, kind: str, owner: Optional[str] = None):
+        self.id = secrets.token_urlsafe(12)
+        self.kind = kind
+        self.owner = owner
+        self.status = QUEUED
+        self.progress = 0.0
+        self.message = ""
+        self.details: Dict = {}
+        self.result = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self.revision = 0
+        self._cancel = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiters: List[asyncio.Future] = []
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise JobCancelled(f"Job {self.id} cancelled")
+
+    def update(self, progress: Optional[float] = None, message: Optional[str] = None, **details):
+        """진행률(0~1)/메시지/세부 값 갱신 (취소가 요청되었으면 JobCancelled)"""
+        self.check_cancelled()
+        if progress is not None:
+            self.progress = max(0.0, min(1.0, progress))
+        if message is not None:
+            self.message = message
+        if details:
+            self.details.update(details)
+        self._changed()
+    
+    def _changed(self):
+        """변경 알림 (작업 스레드에서 호출되면 이벤트 루프로 넘겨서 처리)"""
+        if self._loop is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._wake)
+        except RuntimeError:
+            # 서버 종료로 이벤트 루프가 닫힌 경우
+            pass
+    
+    def _wake(self):
+        self.revision += 1
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+    
+    async def wait_changed(self, revision: int, timeout: float):
+        """revision 이후 상태가 바뀔 때까지 대기 (최대 timeout초)"""
+        if self.revision != revision:
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def info(self, include_result: bool = True) -> dict:
+        info = {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": round(self.progress, 4),
+            "message": self.message,
+            "details": self.details,
+            "cancel_requested": self.cancel_requested,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error
+        }
+        if include_result:
+            info["result"] = self.result
+        return info
+
+
+class JobManager:
+    """프로세스 내 백그라운드 작업 큐
+
+    동시에 실행되는 작업 수를 max_workers로 제한하고(나머지는 대기), 끝난 작업의 상태와 결과는
+    result_ttl초 동안 보관한다. 작업 함수는 Job을 받아 결과를 반환하는 코루틴이며, 실제 무거운 처리는
+    PathService.run_locked/run_blocking으로 스레드 풀에서 수행한다.
+    """
+
+    def __init__(self, max_workers: int = 2, result_ttl: float = 600.0, max_jobs: int = 1000):
+        self.max_workers = max_workers
+        self.result_ttl = result_ttl
+        self.max_jobs = max_jobs
+        self._slots = asyncio.Semaphore(max_workers)
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+
+    @classmethod
+    def from_env(cls) -> "JobManager":
+        """환경 변수로 설정값을 지정하여 생성"""
+        return cls(
+            max_workers=int(os.environ.get("JOB_WORKERS", "2")),
+            result_ttl=float(os.environ.get("JOB_RESULT_TTL", "600")),
+            max_jobs=int(os.environ.get("JOB_MAX", "1000"))
+        )
+
+    def submit(self, kind: str, func: Callable[[Job], Awaitable], owner: Optional[str] = None) -> Job:
+        """작업 등록 후 바로 반환 (이벤트 루프 안에서 호출)"""
+        self._purge()
+        if len(self._jobs) >= self.max_jobs:
+            raise RuntimeError("Too many jobs")
+        job = Job(kind, owner)
+        job._loop = asyncio.get_running_loop()
+        self._jobs[job.id] = job
+        job.task = asyncio.get_running_loop().create_task(self._run(job, func))
+        return job
+
+    async def _run(self, job: Job, func: Callable[[Job], Awaitable]):
+        try:
+            async with self._slots:
+                job.check_cancelled()
+                job.status = RUNNING
+                job.started_at = time.time()
+                job._wake()
+                job.result = await func(job)
+                job.progress = 1.0
+                job.status = SUCCEEDED
+        except (JobCancelled, asyncio.CancelledError):
+            job.status = CANCELLED
+        except Exception as e:
+            job.status = FAILED
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            job._wake()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._purge()
+        return self._jobs.get(job_id)
+
+    def list(self, owner: Optional[str] = None) -> List[Job]:
+        self._purge()
+        return [job for job in self._jobs.values() if owner is None or job.owner == owner]
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """작업 취소 요청
+
+        대기 중인 작업은 바로 취소하고, 실행 중인 작업은 다음 진행 보고 시점에 중단된다.
+        (스레드에서 변경을 적용하는 중에는 태스크를 취소하지 않아 쓰기 잠금이 중간에 풀리지 않도록 함)
+        """
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return job
+        job._cancel.set()
+        if job.status == QUEUED and job.task is not None:
+            job.task.cancel()
+        job._wake()
+        return job
+
+    def _purge(self):
+        """보관 기간이 지난 작업 제거"""
+        now = time.time()
+        for job_id in list(self._jobs):
+            job = self._jobs[job_id]
+            if job.finished and job.finished_at is not None and now - job.finished_at > self.result_ttl:
+                del self._jobs[job_id]
+
+    def shutdown(self):
+        """서버 종료 시 끝나지 않은 작업 취소"""
+        for job in self._jobs.values():
+            if not job.finished:
+                job._cancel.set()
+                if job.task is not None:
+                    job.task.cancel()
@@ -1,92 +1,818 @@
-import json
+import asyncio
 import os
 import math
+import secrets
+import time
 import utm
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional
 from datetime import datetime
-from ..models.path_models import Node, Link, PathData, NodeCreate, LinkCreate, GpsInfo, UtmInfo
+from ..models.path_models import (
+    Node, Link, PathData, NodeCreate, LinkCreate, GpsInfo, UtmInfo, RouteResult,
+    BatchOperation, BatchOperationResult, BatchResult
+)
+from ..utils.lru_cache import LRUCache
+from ..utils.executor import run_blocking
+from ..utils.serialization import RecordEncodingCache, encode_document, dumps
+from ..utils.metrics import registry
+from .route_service import build_adjacency, shortest_paths, reconstruct_path
+from .analysis_service import analyze_connectivity
+from .resample_service import nodes_to_utm_array, resample_polyline
+from .simplify_service import simplify_chains
+from .trace_import_service import iter_trace_points, iter_chunks, TraceDecimator
+from .query_service import parse_fields, project, paginate
+from .spatial_index import GridIndex, BBox, segment_intersects_bbox
+from .delta_service import DeltaLog
+from .storage_service import (
+    PathStorage, open_storage, preloaded_files, SUPPORTED_EXTENSIONS, SQLITE_EXTENSIONS,
+    NODE_MEMORY_ESTIMATE, LINK_MEMORY_ESTIMATE
+)
+from .shared_state import SharedWorkspaceStore, JOURNAL_COMPACT_BYTES
+from .tile_service import validate_tile, tile_bbox, tile_range, build_tile
+
+
+# 백엔드에서 상대 경로로 찾은 기본 data 디렉토리
+DEFAULT_DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "path"
+)
+
+# 워크스페이스당 캐시할 벡터 타일 수
+TILE_CACHE_SIZE = 2048
+
+# 병합 진행 상황을 보고하는 레코드 간격
+MERGE_PROGRESS_INTERVAL = 20000
+
+# 파일 로드/병합/저장 소요 시간 (성공한 경우만, /metrics)
+FILE_OPERATION_SECONDS = registry.histogram(
+    "path_file_operation_seconds", "Duration of successful path file loads, merges and saves", ("operation", "format"))
+
+# 늦게 접속한 클라이언트의 재동기화용으로 보관할 변경 델타 수
+DELTA_BUFFER_SIZE = int(os.environ.get("PATH_DELTA_BUFFER", "1000"))
+
+
+def _file_format(filename: str) -> str:
+    return "sqlite" if filename.endswith(SQLITE_EXTENSIONS) else "json"
+
+
+def _progress_range(progress: Optional[Callable], start: float, end: float, **extra) -> Optional[Callable]:
+    """하위 단계의 진행률(0~1)을 [start, end] 구간으로 바꿔 전달하는 progress 콜백 (extra는 세부 값에 추가)"""
+    if progress is None:
+        return None
+    
+    def report(fraction: float, message: Optional[str] = None, **details):
+        progress(start + (end - start) * fraction, message, **extra, **details)
+    return report
+
+
+class VersionConflictError(Exception):
+    """If-Match 전제 조건 실패 (report에 충돌 내용 포함)"""
+    
+    def __init__(self, report: dict):
+        super().__init__(report.get("message", "Version conflict"))
+        self.report = report
+
+
+class WorkspaceLock:
+    """워크스페이스 쓰기 잠금
+
+    프로세스 안에서는 asyncio 잠금으로 변경을 직렬화하고, 공유 모드에서는 여기에 더해
+    프로세스 간 배타 파일 잠금을 잡은 뒤 다른 워커의 변경을 따라잡고 나서 변경을 허용한다.
+    """
+    
+    def __init__(self, service: "PathService"):
+        self._service = service
+        self.local = asyncio.Lock()
+    
+    async def __aenter__(self):
+        await self.local.acquire()
+        if self._service.shared is not None:
+            try:
+                await run_blocking(self._service.sync_shared, True)
+            except BaseException:
+                self.local.release()
+                raise
+    
+    async def __aexit__(self, *exc_info):
+        try:
+            if self._service.shared is not None:
+                self._service.shared.release()
+        finally:
+            self.local.release()
+    
+    def locked(self) -> bool:
+        return self.local.locked()
 
 
 class PathService:
-    def __init__(self, data_dir: str = None):
-        if data_dir is None:
-            # 백엔드에서 상대 경로로 data 디렉토리 찾기
-            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            self.data_dir = os.path.join(base_dir, "data", "path")
-        else:
-            self.data_dir = data_dir
+    def __init__(self, data_dir: str = None, route_cache_size: int = 10000):
+        self.data_dir = data_dir if data_dir is not None else DEFAULT_DATA_DIR
         self.current_nodes: List[Node] = []
         self.current_links: List[Link] = []
+        
+        # ID 인덱스 (중복 ID가 있으면 목록에서 먼저 나온 항목 우선)
+        self._nodes_by_id: Dict[str, Node] = {}
+        self._links_by_id: Dict[str, Link] = {}
+        
+        # 공간 인덱스 (GPS 좌표 기준 격자, ID 인덱스에 등록된 레코드만 포함)
+        self._node_grid = GridIndex()
+        self._link_grid = GridIndex()
+        
+        # 벡터 타일 캐시 ((z, x, y) -> JSON 바이트), 레코드가 걸친 타일만 선택적으로 무효화
+        self._tile_cache = LRUCache(max_size=TILE_CACHE_SIZE)
+        self._tile_zooms = set()
+        
+        # 그래프 버전: 노드/링크가 변경될 때마다 증가
+        # (인스턴스 ID와 함께 ETag로 사용하여 워크스페이스가 다시 만들어져도 이전 ETag와 섞이지 않게 함)
+        self.graph_version = 0
+        self.instance_id = secrets.token_hex(4)
+        self._last_load = None  # (filename, merge_duplicates, 파일 (mtime, 크기), 로드 후 graph_version)
+        self._last_load_info = None  # (로드/병합 후 graph_version, 중복 정보)
+        
+        # 버전별 변경 델타 (WebSocket 구독자에게 전달)
+        self.deltas = DeltaLog(DELTA_BUFFER_SIZE)
+        
+        # 레코드 버전: 레코드를 마지막으로 바꾼 graph_version (목록에 없으면 마지막 대량 변경 버전)
+        self._record_versions: Dict[tuple, int] = {}
+        self._base_version = 0
+        
+        # 변경을 바로 기록하는 저장소 (SQLite 파일을 로드/저장하면 연결됨)
+        self._storage: Optional[PathStorage] = None
+        
+        # 여러 워커/파드가 공유하는 상태 저장소 (공유 모드에서만 연결, 다른 워커의 변경 재생 중에는 _replaying)
+        self.shared: Optional[SharedWorkspaceStore] = None
+        self._replaying = False
+        self._adjacency = None  # (graph_version, 인접 리스트)
+        self._route_cache = LRUCache(max_size=route_cache_size)
+        self._connectivity_cache = LRUCache(max_size=8)
+        
+        # 응답 직렬화 캐시 (레코드별 JSON 인코딩 + 버전별 전체 문서)
+        self._encodings = RecordEncodingCache()
+        self._encoded_current = None  # (graph_version, bytes)
+        self._position_cache = {}     # 페이지 커서용 ID -> 목록 위치 (버전별)
+        
+        # 변경 작업 직렬화용 잠금 (스레드 풀 작업 중에도 이벤트 루프는 블로킹되지 않음)
+        self.write_lock = WorkspaceLock(self)
     
-    def load_path_data(self, filename: str, merge_duplicates: bool = True) -> PathData:
-        """JSON 파일에서 경로 데이터 로드"""
-        file_path = os.path.join(self.data_dir, filename)
+    async def run_locked(self, func, *args, **kwargs):
+        """변경 작업을 쓰기 잠금 하에 스레드 풀에서 실행"""
+        async with self.write_lock:
+            return await run_blocking(func, *args, **kwargs)
+    
+    @property
+    def etag(self) -> str:
+        """현재 그래프 버전의 ETag"""
+        return f'"{self.instance_id}-{self.graph_version}"'
+    
+    def _touch(self, delta: Optional[dict] = None):
+        """그래프 변경 표시 (버전 증가, 파생 캐시 무효화, 델타 기록; delta가 없으면 reset)"""
+        self.graph_version += 1
+        self._adjacency = None
+        self._route_cache.clear()
+        self._connectivity_cache.clear()
+        self._encoded_current = None
+        self._position_cache = {}
+        self._mark_records(delta)
+        try:
+            if not self._replaying:
+                # 다른 워커의 변경을 재생할 때는 그 워커가 이미 저장소/저널에 기록함
+                if self._storage is not None:
+                    self._storage.apply_delta(delta, self)
+                if self.shared is not None:
+                    self._publish(delta)
+        finally:
+            # 메모리 그래프는 이미 바뀌었으므로 저장소 기록이 실패해도 델타 스트림은 그래프와 일치시킴
+            self.deltas.record(self.graph_version, delta)
+    
+    def _attach_storage(self, storage: Optional[PathStorage]):
+        """쓰기 즉시 기록할 저장소 연결 (write_through가 아니면 연결 해제)"""
+        if self._storage is not None and self._storage is not storage:
+            self._storage.close()
+        self._storage = storage if storage is not None and storage.write_through else None
+        if self.shared is not None and not self._replaying:
+            self.shared.write_storage(self.storage_path)
+    
+    @property
+    def storage_path(self) -> Optional[str]:
+        """연결된 저장소 파일 경로"""
+        return self._storage.path if self._storage is not None else None
+    
+    def _publish(self, delta: Optional[dict]):
+        """공유 모드에서 변경을 저널(대량 변경이거나 저널이 크면 스냅샷)에 쓰고 버전 파일 갱신"""
+        if delta is None or self.shared.journal_bytes() > JOURNAL_COMPACT_BYTES:
+            self.shared.write_snapshot(self.graph_version, self.encode_current())
+        else:
+            self.shared.append(self.graph_version, delta)
+        self.shared.write_version(self.instance_id, self.graph_version)
+    
+    async def refresh(self):
+        """공유 모드에서 다른 워커가 더 새로운 버전을 기록했으면 읽기 전에 따라잡음"""
+        if self.shared is None:
+            return
+        instance_id, version = self.shared.read_version()
+        if instance_id is None or (instance_id, version) == (self.instance_id, self.graph_version):
+            return
+        async with self.write_lock.local:
+            await run_blocking(self.sync_shared, False)
+    
+    def sync_shared(self, exclusive: bool):
+        """공유 잠금(쓰기 전이면 배타 잠금)을 잡고 다른 워커의 변경을 따라잡음
         
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File not found: {filename}")
+        exclusive이면 잠금을 유지한 채 반환하며 호출한 쪽(WorkspaceLock)이 해제한다.
+        """
+        self.shared.acquire(exclusive)
+        try:
+            self._catch_up()
+        except BaseException:
+            self.shared.release()
+            raise
+        if not exclusive:
+            self.shared.release()
+    
+    def _catch_up(self):
+        """저널 델타를 순서대로 재생 (워크스페이스가 다시 만들어졌거나 저널이 압축됐으면 스냅샷부터)"""
+        shared = self.shared
+        instance_id, version = shared.read_version()
+        if instance_id is not None and (instance_id, version) != (self.instance_id, self.graph_version):
+            entries = None
+            if instance_id == self.instance_id and version > self.graph_version:
+                entries = shared.entries_since(self.graph_version, version)
+            if entries is None:
+                snapshot_version, data = shared.read_snapshot()
+                self.instance_id = instance_id
+                self._restore_snapshot(snapshot_version, data)
+                entries = shared.entries_since(self.graph_version, version) or []
+            for entry in entries:
+                self._replay(entry)
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        storage_path = shared.read_storage()
+        if storage_path != self.storage_path:
+            self._replaying = True
+            try:
+                self._attach_storage(open_storage(storage_path) if storage_path else None)
+            finally:
+                self._replaying = False
+    
+    def _restore_snapshot(self, version: int, data: dict):
+        """공유 스냅샷으로 전체 교체 (버전도 스냅샷 버전으로 맞춤)"""
+        self.current_nodes = [Node(**node_data) for node_data in data.get("Node", [])]
+        self.current_links = [Link(**link_data) for link_data in data.get("Link", [])]
+        self._last_load = None
+        self._reindex()
+        self.graph_version = version - 1
+        self._replaying = True
+        try:
+            self._touch()
+        finally:
+            self._replaying = False
+    
+    def _replay(self, entry: dict):
+        """다른 워커가 저널에 기록한 델타 하나를 적용 (버전과 남는 델타가 그 워커와 같아짐)"""
+        delta = {key: value for key, value in entry.items() if key != "v"}
+        moved = set()
+        for change in (delta["changes"] if delta["t"] == "batch" else [delta]):
+            kind = change["t"]
+            if kind == "node_moved":
+                node = self._nodes_by_id.get(change["id"])
+                if node is not None:
+                    self._set_node_position(node, change["lat"], change["lon"])
+                    self._encodings.invalidate(node)
+                    self._grid_insert(self._node_grid, node.ID, self._node_bbox(node))
+                    moved.add(node.ID)
+            elif kind == "node_deleted":
+                self._remove_node(change["id"])
+            elif kind == "link_deleted":
+                self._remove_link(change["id"])
+            elif kind == "node_added":
+                self._append_node(Node(**change["node"]))
+            elif kind == "link_added":
+                self._append_link(Link(**change["link"]))
         
-        # 새로운 노드 및 링크 파싱
-        new_nodes = [Node(**node_data) for node_data in data.get("Node", [])]
-        new_links = [Link(**link_data) for link_data in data.get("Link", [])]
+        if moved:
+            for link in self.current_links:
+                if link.FromNodeID in moved or link.ToNodeID in moved:
+                    link.Length = self._calculate_link_length(link.FromNodeID, link.ToNodeID)
+                    self._encodings.invalidate(link)
+                    if self._links_by_id.get(link.ID) is link:
+                        self._index_link(link)
         
-        if merge_duplicates:
-            # 기존 개수 저장 (업데이트 전에)
-            original_node_count = len(self.current_nodes)
-            original_link_count = len(self.current_links)
-            
-            # 중복 ID 처리하여 기존 데이터와 병합
-            merged_nodes, duplicate_nodes = self._merge_nodes_with_duplicates(new_nodes)
-            merged_links, duplicate_links = self._merge_links_with_duplicates(new_links, merged_nodes)
-            
-            # 추가된 개수 계산
-            nodes_added = len(merged_nodes) - original_node_count
-            links_added = len(merged_links) - original_link_count
-            
-            self.current_nodes = merged_nodes
-            self.current_links = merged_links
-            
-            # PathData 객체와 중복 정보를 별도로 반환
-            path_data = PathData(Node=merged_nodes, Link=merged_links)
-            
-            duplicate_info = {
-                "duplicate_nodes": [node.ID for node in duplicate_nodes],
-                "duplicate_links": [link.ID for link in duplicate_links],
-                "total_nodes_processed": len(new_nodes),
-                "total_links_processed": len(new_links),
-                "nodes_added": nodes_added,
-                "links_added": links_added
-            }
+        self.graph_version = entry["v"] - 1
+        self._replaying = True
+        try:
+            self._touch(delta)
+        finally:
+            self._replaying = False
+    
+    def _mark_records(self, delta: Optional[dict]):
+        """델타에 포함된 레코드의 버전을 현재 graph_version으로 갱신 (reset이면 전체)"""
+        if delta is None:
+            self._record_versions.clear()
+            self._base_version = self.graph_version
+            return
+        version = self.graph_version
+        kind = delta["t"]
+        if kind == "batch":
+            for change in delta["changes"]:
+                self._mark_records(change)
+        elif kind == "node_moved":
+            self._record_versions[("node", delta["id"])] = version
+            for link_id in delta["lengths"]:
+                self._record_versions[("link", link_id)] = version
+        elif kind == "node_deleted":
+            self._record_versions[("node", delta["id"])] = version
+            for link_id in delta["links"]:
+                self._record_versions[("link", link_id)] = version
+        elif kind == "node_added":
+            self._record_versions[("node", delta["node"]["ID"])] = version
+        elif kind == "link_added":
+            self._record_versions[("link", delta["link"]["ID"])] = version
+        elif kind == "link_deleted":
+            self._record_versions[("link", delta["id"])] = version
+    
+    def record_version(self, kind: str, record_id: str) -> int:
+        """레코드("node"/"link")를 마지막으로 바꾼 graph_version"""
+        return self._record_versions.get((kind, record_id), self._base_version)
+    
+    def record_etag(self, kind: str, record_id: str) -> str:
+        return f'"{self.instance_id}-{self.record_version(kind, record_id)}"'
+    
+    def expected_version(self, if_match: Optional[str]) -> Optional[int]:
+        """If-Match 헤더를 기대 버전으로 변환 (헤더가 없거나 '*'이면 None)
+
+        그래프 ETag와 레코드 ETag는 같은 형식이며, 값 v는 "버전 v 이후로 바뀌지 않았음"을 뜻한다.
+        다른 인스턴스(다시 만들어진 워크스페이스)의 ETag는 항상 충돌로 처리한다.
+        """
+        if not if_match or if_match.strip() == "*":
+            return None
+        value = if_match.strip()
+        if value.startswith("W/"):
+            value = value[2:]
+        instance_id, _, version = value.strip('"').rpartition("-")
+        if instance_id != self.instance_id or not version.isdigit():
+            raise VersionConflictError({
+                "message": "ETag does not belong to this workspace",
+                "graph_version": self.graph_version,
+                "changes": {"reset": True, "nodes": [], "links": []}
+            })
+        return int(version)
+    
+    def check_record(self, kind: str, record_id: str, expected: Optional[int]):
+        """레코드가 expected 버전 이후 바뀌었으면 VersionConflictError"""
+        if expected is None:
+            return
+        current = self.record_version(kind, record_id)
+        if current > expected:
+            record = self.get_node_by_id(record_id) if kind == "node" else self.get_link_by_id(record_id)
+            raise VersionConflictError({
+                "message": f"{kind.capitalize()} {record_id} was modified at version {current}",
+                "kind": kind,
+                "id": record_id,
+                "expected_version": expected,
+                "current_version": current,
+                "graph_version": self.graph_version,
+                "deleted": record is None,
+                "record": record.dict() if record is not None else None
+            })
+    
+    def check_graph(self, expected: Optional[int]):
+        """그래프가 expected 버전 이후 바뀌었으면 바뀐 레코드 목록과 함께 VersionConflictError"""
+        if expected is None or expected == self.graph_version:
+            return
+        raise VersionConflictError({
+            "message": f"Graph was modified since version {expected}",
+            "expected_version": expected,
+            "graph_version": self.graph_version,
+            "changes": self.changed_since(expected)
+        })
+    
+    def changed_since(self, version: int) -> dict:
+        """version 이후 바뀐 노드/링크 ID (그 사이 대량 변경이 있었으면 reset)"""
+        if version < self._base_version:
+            return {"reset": True, "nodes": [], "links": []}
+        nodes, links = [], []
+        for (kind, record_id), record_version in self._record_versions.items():
+            if record_version > version:
+                (nodes if kind == "node" else links).append(record_id)
+        return {"reset": False, "nodes": sorted(nodes), "links": sorted(links)}
+    
+    def _reindex(self):
+        """노드/링크 목록 전체 교체 후 ID 인덱스 재구성"""
+        self._nodes_by_id = {}
+        for node in self.current_nodes:
+            self._nodes_by_id.setdefault(node.ID, node)
+        self._clear_tiles()
+        self._node_grid.rebuild((node.ID, self._node_bbox(node)) for node in self._nodes_by_id.values())
+        self._reindex_links()
+    
+    def _reindex_links(self):
+        """링크 ID 인덱스 재구성"""
+        self._links_by_id = {}
+        for link in self.current_links:
+            self._links_by_id.setdefault(link.ID, link)
+        self._clear_tiles()
+        self._link_grid.clear()
+        for link in self._links_by_id.values():
+            self._index_link(link)
+        self._encodings.prune(self.current_nodes + self.current_links)
+    
+    def _clear_tiles(self):
+        self._tile_cache.clear()
+        self._tile_zooms.clear()
+    
+    def _invalidate_tiles(self, bbox: Optional[BBox]):
+        """bbox가 걸친 캐시 타일 제거 (캐시된 줌 레벨만 확인)
+
+        긴 링크나 높은 줌에서는 걸친 타일 수가 캐시 크기보다 훨씬 많으므로, 그 경우에는 타일 좌표를 모두
+        만들어 보는 대신 캐시된 키를 훑어 범위 안의 타일만 제거한다.
+        """
+        if bbox is None:
+            return
+        cached_keys = None
+        for z in list(self._tile_zooms):
+            x0, y0, x1, y1 = tile_range(bbox, z)
+            if x1 < x0 or y1 < y0:
+                continue
+            if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self._tile_cache):
+                if cached_keys is None:
+                    cached_keys = self._tile_cache.keys()
+                for key in cached_keys:
+                    if key[0] == z and x0 <= key[1] <= x1 and y0 <= key[2] <= y1:
+                        self._tile_cache.pop(key)
+            else:
+                for tx in range(x0, x1 + 1):
+                    for ty in range(y0, y1 + 1):
+                        self._tile_cache.pop((z, tx, ty))
+    
+    def _grid_insert(self, grid: GridIndex, key: str, bbox: BBox):
+        """공간 인덱스 등록/갱신 (이전/새 위치의 타일 무효화)"""
+        self._invalidate_tiles(grid.get(key))
+        grid.insert(key, bbox)
+        self._invalidate_tiles(bbox)
+    
+    def _grid_remove(self, grid: GridIndex, key: str):
+        self._invalidate_tiles(grid.get(key))
+        grid.remove(key)
+    
+    @staticmethod
+    def _node_bbox(node: Node) -> BBox:
+        return (node.GpsInfo.Long, node.GpsInfo.Lat, node.GpsInfo.Long, node.GpsInfo.Lat)
+    
+    def _index_link(self, link: Link):
+        """링크를 양 끝 노드 좌표의 bbox로 공간 인덱스에 등록 (끝 노드가 없으면 제외)"""
+        a = self._nodes_by_id.get(link.FromNodeID)
+        b = self._nodes_by_id.get(link.ToNodeID)
+        if a is None or b is None:
+            self._grid_remove(self._link_grid, link.ID)
+            return
+        self._grid_insert(self._link_grid, link.ID, (
+            min(a.GpsInfo.Long, b.GpsInfo.Long), min(a.GpsInfo.Lat, b.GpsInfo.Lat),
+            max(a.GpsInfo.Long, b.GpsInfo.Long), max(a.GpsInfo.Lat, b.GpsInfo.Lat)
+        ))
+    
+    def _unindex_link(self, link: Link):
+        """삭제된 링크를 ID/공간 인덱스와 인코딩 캐시에서 제거"""
+        if self._links_by_id.get(link.ID) is link:
+            del self._links_by_id[link.ID]
+            self._grid_remove(self._link_grid, link.ID)
+        self._encodings.invalidate(link)
+    
+    def nodes_in_bbox(self, bbox: BBox) -> List[Node]:
+        """bbox 안의 노드 목록 (ID 순)
+
+        타일 생성은 잠금 없이 스레드 풀에서 실행되므로, 조회 도중 이벤트 루프에서 삭제된 레코드는 건너뛴다.
+        """
+        nodes = (self._nodes_by_id.get(node_id) for node_id in sorted(self._node_grid.query(bbox)))
+        return [node for node in nodes if node is not None]
+    
+    def links_in_bbox(self, bbox: BBox) -> List[Link]:
+        """bbox와 교차하는 링크 목록 (ID 순, 조회 도중 삭제된 링크/노드는 건너뜀)"""
+        result = []
+        for link_id in sorted(self._link_grid.query(bbox)):
+            link = self._links_by_id.get(link_id)
+            if link is None:
+                continue
+            a = self._nodes_by_id.get(link.FromNodeID)
+            b = self._nodes_by_id.get(link.ToNodeID)
+            if a is None or b is None:
+                continue
+            if segment_intersects_bbox(a.GpsInfo.Long, a.GpsInfo.Lat, b.GpsInfo.Long, b.GpsInfo.Lat, bbox):
+                result.append(link)
+        return result
+    
+    def get_tile(self, z: int, x: int, y: int) -> bytes:
+        """slippy map 타일 범위의 노드/링크 벡터 타일 (지연 생성 후 캐시)"""
+        validate_tile(z, x, y)
+        key = (z, x, y)
+        cached = self._tile_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        version = self.graph_version
+        bbox = tile_bbox(z, x, y)
+        content = dumps(build_tile(z, x, y, self.nodes_in_bbox(bbox), self.links_in_bbox(bbox), self._nodes_by_id))
+        # 생성 도중 그래프가 바뀌었으면 캐시하지 않음 (무효화 이후 오래된 타일이 남지 않도록)
+        if version == self.graph_version:
+            self._tile_zooms.add(z)
+            self._tile_cache.put(key, content)
+        return content
+    
+    def encode_current(self) -> bytes:
+        """현재 데이터 전체를 JSON 바이트로 직렬화 (레코드별/버전별 캐시 사용)"""
+        cached = self._encoded_current
+        if cached is not None and cached[0] == self.graph_version:
+            return cached[1]
+        version = self.graph_version
+        body = encode_document({
+            "Node": self._encodings.encode_list(self.current_nodes),
+            "Link": self._encodings.encode_list(self.current_links)
+        })
+        self._encoded_current = (version, body)
+        return body
+    
+    def encode_nodes(self, nodes: Optional[List[Node]] = None) -> bytes:
+        """노드 목록을 JSON 배열 바이트로 직렬화"""
+        return self._encodings.encode_list(self.current_nodes if nodes is None else nodes)
+    
+    def encode_links(self, links: Optional[List[Link]] = None) -> bytes:
+        """링크 목록을 JSON 배열 바이트로 직렬화"""
+        return self._encodings.encode_list(self.current_links if links is None else links)
+    
+    def query_nodes(self, node_type: Optional[int] = None, cursor: Optional[str] = None,
+                    limit: Optional[int] = None, fields: Optional[str] = None, bbox: Optional[BBox] = None):
+        """노드 필터/페이지/필드 선택 조회 → (JSON 바이트, 다음 커서, 필터 결과 총 개수)"""
+        records = self.current_nodes if bbox is None else self.nodes_in_bbox(bbox)
+        filtered = node_type is not None or bbox is not None
+        if node_type is not None:
+            records = [node for node in records if node.NodeType == node_type]
+        return self._query(Node, records, filtered, cursor, limit, fields)
+    
+    def query_links(self, link_type: Optional[int] = None, section_id: Optional[str] = None,
+                    cursor: Optional[str] = None, limit: Optional[int] = None, fields: Optional[str] = None,
+                    bbox: Optional[BBox] = None):
+        """링크 필터/페이지/필드 선택 조회 → (JSON 바이트, 다음 커서, 필터 결과 총 개수)"""
+        records = self.current_links if bbox is None else self.links_in_bbox(bbox)
+        filtered = link_type is not None or section_id is not None or bbox is not None
+        if link_type is not None or section_id is not None:
+            records = [link for link in records
+                       if (link_type is None or link.LinkType == link_type)
+                       and (section_id is None or link.SectionID == section_id)]
+        return self._query(Link, records, filtered, cursor, limit, fields)
+    
+    def _query(self, model_class, records, filtered: bool, cursor, limit, fields):
+        """필드 선택 및 커서 페이지 처리 공통 로직"""
+        projection = parse_fields(model_class, fields)
+        
+        positions = {}
+        if cursor:
+            if filtered:
+                positions = {record.ID: i for i, record in enumerate(records)}
+            else:
+                positions = self._position_cache.get(model_class)
+                if positions is None:
+                    positions = {record.ID: i for i, record in enumerate(records)}
+                    self._position_cache[model_class] = positions
+        
+        page, next_cursor = paginate(records, cursor, limit, positions)
+        body = dumps(project(page, projection)) if projection else self._encodings.encode_list(page)
+        return body, next_cursor, len(records)
+    
+    def warm_caches(self):
+        """현재 그래프의 직렬화/경로 탐색 캐시를 미리 만듦 (시작 시 미리 로드한 워크스페이스)"""
+        self.encode_current()
+        self._route_adjacency(self.graph_version)
+    
+    def cache_stats(self) -> Dict[str, tuple]:
+        """캐시별 (적중, 실패) 횟수 (/metrics)"""
+        return {
+            "tile": (self._tile_cache.hits, self._tile_cache.misses),
+            "route": (self._route_cache.hits, self._route_cache.misses),
+            "serialization": (self._encodings.hits, self._encodings.misses)
+        }
+    
+    def estimated_memory(self) -> int:
+        """현재 그래프가 차지하는 메모리 추정치 (바이트)"""
+        return len(self.current_nodes) * NODE_MEMORY_ESTIMATE + len(self.current_links) * LINK_MEMORY_ESTIMATE
+
+    def bounds(self) -> Optional[BBox]:
+        """현재 노드의 GPS bbox (minLon, minLat, maxLon, maxLat, 노드가 없으면 None)"""
+        if not self.current_nodes:
+            return None
+        lons = [node.GpsInfo.Long for node in self.current_nodes]
+        lats = [node.GpsInfo.Lat for node in self.current_nodes]
+        return min(lons), min(lats), max(lons), max(lats)
+    
+    def load_path_data(self, filename: str, merge_duplicates: bool = True,
+                       progress: Optional[Callable] = None) -> PathData:
+        """JSON 파일에서 경로 데이터 로드
+
+        progress를 주면 파싱(읽은 바이트/레코드 수)과 병합(처리한 레코드/중복 수) 진행 상황을 보고한다.
+        병합 결과를 모두 계산한 뒤 적용하므로 progress가 예외(작업 취소 등)를 내면 아무것도 바뀌지 않는다.
+        """
+        start = time.perf_counter()
+        signature = self._file_signature(filename)
+        storage = self._open_existing(filename)
+        parse_end = 0.8 if merge_duplicates else 1.0
+        try:
+            new_nodes, new_links = preloaded_files.read(
+                storage, _progress_range(progress, 0.0, parse_end), self._encodings)
+            nodes, links, duplicate_info = self._prepare_loaded_data(
+                new_nodes, new_links, merge_duplicates, _progress_range(progress, parse_end, 1.0))
+            was_empty = not self.current_nodes and not self.current_links
             
-            # 결과를 튜플로 반환
+            # 현재 데이터가 파일 내용과 같아지는 경우(교체 또는 빈 워크스페이스)에만 저장소 연결
+            self._attach_storage(None)
+            result = self._commit_loaded_data(nodes, links, duplicate_info)
+            if not merge_duplicates or was_empty:
+                self._attach_storage(storage)
+        finally:
+            if storage is not self._storage:
+                storage.close()
+        self._last_load = (filename, merge_duplicates, signature, self.graph_version)
+        FILE_OPERATION_SECONDS.observe(time.perf_counter() - start, "load", _file_format(filename))
+        return result
+    
+    def load_result(self, version: int):
+        """그 버전의 로드/병합 결과 (이후 그래프가 바뀌었으면 None)
+
+        load_path_data와 같은 형식(병합 모드는 (PathData, duplicate_info))으로 반환하여, 진행 상황 스트림이
+        끝난 뒤 버전으로 최종 결과를 가져갈 수 있게 한다. 중복 정보가 없으면(다른 워커의 로드 등) PathData만 반환.
+        """
+        if version != self.graph_version:
+            return None
+        path_data = PathData(Node=self.current_nodes, Link=self.current_links)
+        loaded_version, duplicate_info = self._last_load_info or (None, None)
+        if loaded_version == version and duplicate_info is not None:
             return path_data, duplicate_info
-        else:
-            # 기존 데이터 완전 교체
-            self.current_nodes = new_nodes
-            self.current_links = new_links
-            return PathData(Node=new_nodes, Link=new_links)
+        return path_data
+    
+    def _file_signature(self, filename: str):
+        try:
+            stat = os.stat(os.path.join(self.data_dir, filename))
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def is_load_unchanged(self, filename: str, merge_duplicates: bool) -> bool:
+        """마지막 로드 이후 파일과 그래프가 모두 그대로인지 확인 (다시 로드해도 결과가 같음)"""
+        if self._last_load is None:
+            return False
+        last_filename, last_merge, signature, version = self._last_load
+        return (last_filename == filename and last_merge == merge_duplicates
+                and version == self.graph_version and signature is not None
+                and signature == self._file_signature(filename))
     
-    def save_path_data(self, filename: str, path_data: PathData) -> str:
-        """경로 데이터를 JSON 파일로 저장"""
+    async def load_path_data_async(self, filename: str, merge_duplicates: bool = True):
+        """파일 읽기/파싱/병합을 스레드 풀에서 수행하는 load_path_data"""
+        return await self.run_locked(self.load_path_data, filename, merge_duplicates)
+    
+    def read_path_file(self, filename: str, progress: Optional[Callable] = None) -> tuple[List[Node], List[Link]]:
+        """JSON/SQLite 파일을 읽어 노드/링크 모델로 파싱 (현재 데이터는 변경하지 않음)"""
+        storage = self._open_existing(filename)
+        try:
+            return preloaded_files.read(storage, progress, self._encodings)
+        finally:
+            storage.close()
+    
+    def _open_existing(self, filename: str) -> PathStorage:
         file_path = os.path.join(self.data_dir, filename)
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
         
-        # Pydantic 모델을 dict로 변환
-        data = {
-            "Node": [node.dict() for node in path_data.Node],
-            "Link": [link.dict() for link in path_data.Link]
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {filename}")
+        return open_storage(file_path)
+    
+    def apply_loaded_data(self, new_nodes: List[Node], new_links: List[Link], merge_duplicates: bool = True):
+        """파싱된 노드/링크를 현재 데이터에 병합하거나 교체"""
+        nodes, links, duplicate_info = self._prepare_loaded_data(new_nodes, new_links, merge_duplicates)
+        return self._commit_loaded_data(nodes, links, duplicate_info)
+    
+    def _prepare_loaded_data(self, new_nodes: List[Node], new_links: List[Link], merge_duplicates: bool,
+                             progress: Optional[Callable] = None, base: Optional[tuple] = None) -> tuple:
+        """병합/교체 후의 (노드, 링크, 중복 정보) 계산 (현재 데이터는 바꾸지 않음)
+
+        base로 (노드, 링크)를 주면 현재 데이터 대신 그 위에 병합한다 (여러 파일을 이어서 병합할 때).
+        """
+        if not merge_duplicates:
+            # 기존 데이터 완전 교체
+            return new_nodes, new_links, None
+        
+        base_nodes, base_links = base if base is not None else (self.current_nodes, self.current_links)
+        
+        # 중복 ID 처리하여 기존 데이터와 병합 (노드/링크 단계가 진행률을 절반씩 차지)
+        merged_nodes, duplicate_nodes = self._merge_nodes_with_duplicates(
+            new_nodes, base_nodes, _progress_range(progress, 0.0, 0.5))
+        merged_links, duplicate_links = self._merge_links_with_duplicates(
+            new_links, merged_nodes, base_links, _progress_range(progress, 0.5, 1.0))
+        
+        duplicate_info = {
+            "duplicate_nodes": [node.ID for node in duplicate_nodes],
+            "duplicate_links": [link.ID for link in duplicate_links],
+            "total_nodes_processed": len(new_nodes),
+            "total_links_processed": len(new_links),
+            "nodes_added": len(merged_nodes) - len(base_nodes),
+            "links_added": len(merged_links) - len(base_links)
+        }
+        return merged_nodes, merged_links, duplicate_info
+    
+    def _commit_loaded_data(self, nodes: List[Node], links: List[Link], duplicate_info: Optional[dict]):
+        """계산된 병합/교체 결과 적용 (병합 모드는 (PathData, 중복 정보) 튜플 반환)"""
+        self.current_nodes = nodes
+        self.current_links = links
+        self._reindex()
+        self._touch()
+        self._last_load_info = (self.graph_version, duplicate_info)
+        
+        path_data = PathData(Node=nodes, Link=links)
+        return (path_data, duplicate_info) if duplicate_info is not None else path_data
+    
+    def merge_files(self, filenames: List[str], progress: Optional[Callable] = None) -> dict:
+        """여러 파일을 순서대로 현재 데이터에 병합
+
+        모든 파일을 읽고 병합 결과를 계산한 뒤 한 번에 적용하므로, 그 전에 progress가 예외(작업 취소 등)를
+        내면 아무것도 바뀌지 않는다.
+        """
+        start = time.perf_counter()
+        nodes, links = self.current_nodes, self.current_links
+        files = []
+        combined = {"duplicate_nodes": [], "duplicate_links": [], "total_nodes_processed": 0, "total_links_processed": 0}
+        for i, filename in enumerate(filenames):
+            # 파일마다 같은 몫의 진행률 (파싱 80%, 병합 20%)
+            lo, hi = i / len(filenames), (i + 1) / len(filenames)
+            file_progress = _progress_range(progress, lo, hi, files_done=i, files_total=len(filenames))
+            new_nodes, new_links = self.read_path_file(filename, _progress_range(file_progress, 0.0, 0.8))
+            nodes, links, duplicate_info = self._prepare_loaded_data(
+                new_nodes, new_links, True, _progress_range(file_progress, 0.8, 1.0), base=(nodes, links))
+            for key in combined:
+                combined[key] += duplicate_info[key]
+            files.append({
+                "file": filename,
+                "nodes_added": duplicate_info["nodes_added"],
+                "links_added": duplicate_info["links_added"],
+                "duplicate_nodes": len(duplicate_info["duplicate_nodes"]),
+                "duplicate_links": len(duplicate_info["duplicate_links"])
+            })
+        
+        original_node_count, original_link_count = len(self.current_nodes), len(self.current_links)
+        self._commit_loaded_data(nodes, links, {
+            **combined,
+            "nodes_added": len(nodes) - original_node_count,
+            "links_added": len(links) - original_link_count
+        })
+        formats = {_file_format(filename) for filename in filenames}
+        FILE_OPERATION_SECONDS.observe(time.perf_counter() - start, "merge",
+                                       formats.pop() if len(formats) == 1 else "mixed")
+        return {
+            "files": files,
+            "total_nodes": len(self.current_nodes),
+            "total_links": len(self.current_links),
+            "graph_version": self.graph_version
         }
+    
+    def save_path_data(self, filename: str, path_data: Optional[PathData] = None,
+                       expected_version: Optional[int] = None, progress: Optional[Callable] = None) -> str:
+        """경로 데이터를 JSON 파일로 저장
+
+        path_data가 없으면 현재 데이터를 그대로 저장하고, 있으면 저장 후 현재 데이터를 교체한다.
+        expected_version이 주어지면 그 이후 그래프가 바뀐 경우 저장하지 않는다.
+        progress는 파일을 쓰기 직전에 호출되며, 여기서 예외가 나면 아무것도 쓰지 않는다.
+        """
+        self.check_graph(expected_version)
+        start = time.perf_counter()
+        replace = path_data is not None
+        if not replace:
+            path_data = self.get_current_data()
+        if progress:
+            progress(0.1, f"Writing {filename}", nodes=len(path_data.Node), links=len(path_data.Link))
+        file_path = os.path.join(self.data_dir, filename)
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        if self._storage is not None and self._storage.path == file_path:
+            if not replace:
+                # 연결된 저장소에는 변경이 이미 레코드 단위로 기록되어 있음
+                FILE_OPERATION_SECONDS.observe(time.perf_counter() - start, "save", _file_format(filename))
+                return f"Data saved to {filename}"
+            storage = self._storage
+        else:
+            storage = open_storage(file_path)
+        storage.write_all(path_data.Node, path_data.Link)
         
-        self.current_nodes = path_data.Node
-        self.current_links = path_data.Link
+        if replace:
+            # 교체된 내용은 방금 쓴 저장소에만 반영되도록 기존 연결을 먼저 끊음
+            self._attach_storage(None)
+            self.current_nodes = path_data.Node
+            self.current_links = path_data.Link
+            self._reindex()
+            self._touch()
+        if storage.write_through:
+            # 다른 이름으로 저장하면 이후 변경은 새 저장소에 기록
+            self._attach_storage(storage)
+        elif storage is not self._storage:
+            storage.close()
         
+        FILE_OPERATION_SECONDS.observe(time.perf_counter() - start, "save", _file_format(filename))
         return f"Data saved to {filename}"
     
+    async def save_path_data_async(self, filename: str, path_data: Optional[PathData] = None,
+                                   expected_version: Optional[int] = None) -> str:
+        """직렬화/파일 쓰기를 스레드 풀에서 수행하는 save_path_data"""
+        return await self.run_locked(self.save_path_data, filename, path_data, expected_version)
+    
     def get_current_data(self) -> PathData:
         """현재 로드된 경로 데이터 반환"""
         return PathData(Node=self.current_nodes, Link=self.current_links)
@@ -101,15 +827,38 @@ class PathService:
             **node_data.dict()
         )
         
-        self.current_nodes.append(new_node)
+        self._append_node(new_node)
+        self._touch({"t": "node_added", "node": new_node.dict()})
         return new_node
     
+    def _append_node(self, node: Node):
+        """노드를 목록 끝에 추가하고 인덱스에 등록"""
+        self.current_nodes.append(node)
+        if self._nodes_by_id.setdefault(node.ID, node) is node:
+            self._grid_insert(self._node_grid, node.ID, self._node_bbox(node))
+    
     def update_node(self, node_id: str, lat: float, lon: float) -> Optional[Node]:
         """노드 위치 업데이트"""
         node = self.get_node_by_id(node_id)
         if not node:
             return None
         
+        self._set_node_position(node, lat, lon)
+        self._encodings.invalidate(node)
+        self._grid_insert(self._node_grid, node_id, self._node_bbox(node))
+        
+        # 연결된 링크들의 길이 재계산
+        changed_links = self._recalculate_link_lengths(node_id)
+        self._touch({
+            "t": "node_moved", "id": node_id, "lat": lat, "lon": lon,
+            "lengths": {link.ID: link.Length for link in changed_links}
+        })
+        
+        return node
+    
+    @staticmethod
+    def _set_node_position(node: Node, lat: float, lon: float):
+        """노드의 GPS 좌표와 UTM 좌표 갱신"""
         # GPS 좌표 업데이트
         node.GpsInfo.Lat = lat
         node.GpsInfo.Long = lon
@@ -122,26 +871,37 @@ class PathService:
             node.UtmInfo.Zone = f"{zone_num}{zone_letter}"
         except:
             pass
-        
-        # 연결된 링크들의 길이 재계산
-        self._recalculate_link_lengths(node_id)
-        
-        return node
     
     def delete_node(self, node_id: str) -> bool:
         """노드 삭제"""
+        removed_links = self._remove_node(node_id)
+        if removed_links is None:
+            return False
+        
+        self._touch({"t": "node_deleted", "id": node_id, "links": [link.ID for link in removed_links]})
+        return True
+    
+    def _remove_node(self, node_id: str) -> Optional[List[Link]]:
+        """노드와 연결된 링크를 목록/인덱스에서 제거하고 제거된 링크 반환 (노드가 없으면 None)"""
         node = self.get_node_by_id(node_id)
         if not node:
-            return False
+            return None
         
         # 연결된 링크들도 삭제
-        self.current_links = [link for link in self.current_links 
-                             if link.FromNodeID != node_id and link.ToNodeID != node_id]
+        removed_links = [link for link in self.current_links
+                         if link.FromNodeID == node_id or link.ToNodeID == node_id]
+        if removed_links:
+            self.current_links = [link for link in self.current_links 
+                                 if link.FromNodeID != node_id and link.ToNodeID != node_id]
+            for link in removed_links:
+                self._unindex_link(link)
         
         # 노드 삭제
         self.current_nodes = [n for n in self.current_nodes if n.ID != node_id]
-        
-        return True
+        self._nodes_by_id.pop(node_id, None)
+        self._grid_remove(self._node_grid, node_id)
+        self._encodings.invalidate(node)
+        return removed_links
     
     def add_link(self, link_data: LinkCreate) -> Link:
         """새 링크 추가"""
@@ -177,22 +937,437 @@ class PathService:
             HistRemark=link_data.HistRemark
         )
         
-        self.current_links.append(new_link)
+        self._append_link(new_link)
+        self._touch({"t": "link_added", "link": new_link.dict()})
         return new_link
     
+    def _append_link(self, link: Link):
+        """링크를 목록 끝에 추가하고 인덱스에 등록"""
+        self.current_links.append(link)
+        if self._links_by_id.setdefault(link.ID, link) is link:
+            self._index_link(link)
+    
     def delete_link(self, link_id: str) -> bool:
         """링크 삭제"""
+        deleted = self._remove_link(link_id)
+        if deleted:
+            self._touch({"t": "link_deleted", "id": link_id})
+        return deleted
+    
+    def _remove_link(self, link_id: str) -> bool:
+        """ID가 같은 링크를 모두 목록/인덱스에서 제거"""
         initial_count = len(self.current_links)
         self.current_links = [link for link in self.current_links if link.ID != link_id]
-        return len(self.current_links) < initial_count
+        deleted = len(self.current_links) < initial_count
+        if deleted:
+            removed = self._links_by_id.get(link_id)
+            if removed is not None:
+                self._unindex_link(removed)
+        return deleted
+    
+    def apply_batch(self, operations: List[BatchOperation], expected_version: Optional[int] = None) -> BatchResult:
+        """노드/링크 추가·이동·삭제 작업 목록을 검증한 뒤 한 번에 적용 (하나라도 실패하면 아무것도 적용하지 않음)
+
+        기존 레코드를 대상으로 하는 작업은 작업별 Version(없으면 expected_version) 이후 바뀌었으면 충돌로 실패한다.
+        """
+        refs: Dict[str, str] = {}
+        added_nodes: Dict[str, Node] = {}
+        added_links: List[Link] = []
+        moves: Dict[str, tuple] = {}
+        deleted_nodes = set()
+        deleted_links = set()
+        result_ids: List[Optional[str]] = []
+        existing_ids = None  # add_node가 있을 때만 만드는 (번호, ID) 정렬 목록
+        added_ids: List[str] = []
+        
+        def next_node_id():
+            # 순차 add_node와 같은 규칙: 남아 있는 노드 번호 중 최댓값 + 1
+            nonlocal existing_ids
+            if existing_ids is None:
+                existing_ids = sorted((int(n.ID[1:]), n.ID) for n in self.current_nodes
+                                      if n.ID.startswith('N') and n.ID[1:].isdigit())
+            while existing_ids and existing_ids[-1][1] in deleted_nodes:
+                existing_ids.pop()
+            while added_ids and added_ids[-1] not in added_nodes:
+                added_ids.pop()
+            last = max(existing_ids[-1][0] if existing_ids else -1, int(added_ids[-1][1:]) if added_ids else -1)
+            return f"N{last + 1:04d}"
+        
+        def node_exists(node_id):
+            return node_id in added_nodes or (node_id in self._nodes_by_id and node_id not in deleted_nodes)
+        
+        def drop_added_links(predicate):
+            added_links[:] = [link for link in added_links if not predicate(link)]
+        
+        # 1단계: 현재 상태를 바꾸지 않고 작업 순서대로 검증하며 변경 내용 누적
+        for index, op in enumerate(operations):
+            try:
+                if op.Op == "add_node":
+                    if op.Node is None:
+                        raise ValueError("add_node requires Node")
+                    if op.Ref is not None and op.Ref in refs:
+                        raise ValueError(f"Duplicate Ref {op.Ref}")
+                    node_id = next_node_id()
+                    added_nodes[node_id] = Node(ID=node_id, **op.Node.dict())
+                    added_ids.append(node_id)
+                    if op.Ref is not None:
+                        refs[op.Ref] = node_id
+                    result_ids.append(node_id)
+                
+                elif op.Op == "move_node":
+                    if op.NodeID is None or op.Lat is None or op.Lon is None:
+                        raise ValueError("move_node requires NodeID, Lat and Lon")
+                    node_id = refs.get(op.NodeID, op.NodeID)
+                    if not node_exists(node_id):
+                        raise KeyError(f"Node {op.NodeID} not found")
+                    if node_id in added_nodes:
+                        self._set_node_position(added_nodes[node_id], op.Lat, op.Lon)
+                    else:
+                        self.check_record("node", node_id, op.Version if op.Version is not None else expected_version)
+                        moves[node_id] = (op.Lat, op.Lon)
+                    result_ids.append(node_id)
+                
+                elif op.Op == "delete_node":
+                    if op.NodeID is None:
+                        raise ValueError("delete_node requires NodeID")
+                    node_id = refs.get(op.NodeID, op.NodeID)
+                    if not node_exists(node_id):
+                        raise KeyError(f"Node {op.NodeID} not found")
+                    if node_id in added_nodes:
+                        del added_nodes[node_id]
+                    else:
+                        self.check_record("node", node_id, op.Version if op.Version is not None else expected_version)
+                        deleted_nodes.add(node_id)
+                        moves.pop(node_id, None)
+                    # 연결된 링크도 삭제 (기존 링크는 적용 단계에서 끝 노드 기준으로 제거)
+                    drop_added_links(lambda link: node_id in (link.FromNodeID, link.ToNodeID))
+                    result_ids.append(node_id)
+                
+                elif op.Op == "add_link":
+                    if op.Link is None:
+                        raise ValueError("add_link requires Link")
+                    link_data = op.Link.dict()
+                    for key in ("FromNodeID", "ToNodeID"):
+                        link_data[key] = refs.get(link_data[key], link_data[key])
+                        if not node_exists(link_data[key]):
+                            raise KeyError(f"{key[:-2]} {op.Link.dict()[key]} not found")
+                    link_id = self._generate_link_id(link_data["FromNodeID"], link_data["ToNodeID"])
+                    added_links.append(Link(ID=link_id, **link_data))
+                    result_ids.append(link_id)
+                
+                elif op.Op == "delete_link":
+                    if op.LinkID is None:
+                        raise ValueError("delete_link requires LinkID")
+                    link_id = op.LinkID
+                    found = any(link.ID == link_id for link in added_links)
+                    drop_added_links(lambda link: link.ID == link_id)
+                    existing = self._links_by_id.get(link_id)
+                    if (existing is not None and link_id not in deleted_links
+                            and existing.FromNodeID not in deleted_nodes and existing.ToNodeID not in deleted_nodes):
+                        self.check_record("link", link_id, op.Version if op.Version is not None else expected_version)
+                        deleted_links.add(link_id)
+                        found = True
+                    if not found:
+                        raise KeyError(f"Link {link_id} not found")
+                    result_ids.append(link_id)
+                
+                else:
+                    raise ValueError(f"Unknown operation {op.Op}")
+            except (KeyError, ValueError, VersionConflictError) as e:
+                results = [
+                    BatchOperationResult(Index=i, Op=o.Op, Status="not_applied") for i, o in enumerate(operations)
+                ]
+                results[index] = BatchOperationResult(
+                    Index=index, Op=op.Op, Status="failed", Error=str(e.args[0]) if e.args else str(e)
+                )
+                conflict = e.report if isinstance(e, VersionConflictError) else None
+                return BatchResult(Applied=False, GraphVersion=self.graph_version, Results=results, Conflict=conflict)
+        
+        # 2단계: 누적된 변경을 노드/링크 목록 한 번씩만 훑으며 적용
+        moved_deltas = {
+            node_id: {"t": "node_moved", "id": node_id, "lat": lat, "lon": lon, "lengths": {}}
+            for node_id, (lat, lon) in moves.items()
+        }
+        for node_id, (lat, lon) in moves.items():
+            node = self._nodes_by_id[node_id]
+            self._set_node_position(node, lat, lon)
+            self._encodings.invalidate(node)
+            self._grid_insert(self._node_grid, node_id, self._node_bbox(node))
+        
+        if deleted_nodes:
+            self.current_nodes = [n for n in self.current_nodes if n.ID not in deleted_nodes]
+            for node_id in deleted_nodes:
+                self._encodings.invalidate(self._nodes_by_id.pop(node_id))
+                self._grid_remove(self._node_grid, node_id)
+        
+        for node in added_nodes.values():
+            self.current_nodes.append(node)
+            if self._nodes_by_id.setdefault(node.ID, node) is node:
+                self._grid_insert(self._node_grid, node.ID, self._node_bbox(node))
+        
+        kept_links: List[Link] = []
+        removed_links: List[Link] = []
+        for link in self.current_links:
+            if link.ID in deleted_links or link.FromNodeID in deleted_nodes or link.ToNodeID in deleted_nodes:
+                removed_links.append(link)
+                continue
+            if link.FromNodeID in moves or link.ToNodeID in moves:
+                # 이동한 노드에 연결된 링크만 길이 재계산
+                link.Length = self._calculate_link_length(link.FromNodeID, link.ToNodeID)
+                self._encodings.invalidate(link)
+                if self._links_by_id.get(link.ID) is link:
+                    self._index_link(link)
+                for node_id in (link.FromNodeID, link.ToNodeID):
+                    if node_id in moved_deltas:
+                        moved_deltas[node_id]["lengths"][link.ID] = link.Length
+            kept_links.append(link)
+        for link in removed_links:
+            self._unindex_link(link)
+        
+        for link in added_links:
+            if link.Length == 0 or link.FromNodeID in moves or link.ToNodeID in moves:
+                link.Length = self._calculate_link_length(link.FromNodeID, link.ToNodeID)
+            kept_links.append(link)
+            if self._links_by_id.setdefault(link.ID, link) is link:
+                self._index_link(link)
+        self.current_links = kept_links
+        
+        if operations:
+            # 클라이언트 적용 순서: 이동 → 노드 삭제(연결 링크 포함) → 링크 삭제 → 노드 추가 → 링크 추가
+            cascaded: Dict[str, List[str]] = {node_id: [] for node_id in deleted_nodes}
+            deleted_link_changes = []
+            for link in removed_links:
+                owner = link.FromNodeID if link.FromNodeID in cascaded else (
+                    link.ToNodeID if link.ToNodeID in cascaded else None)
+                if owner is not None and link.ID not in deleted_links:
+                    cascaded[owner].append(link.ID)
+            for link_id in deleted_links:
+                deleted_link_changes.append({"t": "link_deleted", "id": link_id})
+            changes = list(moved_deltas.values())
+            changes += [{"t": "node_deleted", "id": node_id, "links": links} for node_id, links in cascaded.items()]
+            changes += deleted_link_changes
+            changes += [{"t": "node_added", "node": node.dict()} for node in added_nodes.values()]
+            changes += [{"t": "link_added", "link": link.dict()} for link in added_links]
+            self._touch({"t": "batch", "changes": changes})
+        
+        results = [
+            BatchOperationResult(Index=i, Op=op.Op, Status="applied", ID=result_ids[i])
+            for i, op in enumerate(operations)
+        ]
+        return BatchResult(Applied=True, GraphVersion=self.graph_version, Results=results)
     
     def get_node_by_id(self, node_id: str) -> Optional[Node]:
         """ID로 노드 찾기"""
-        return next((node for node in self.current_nodes if node.ID == node_id), None)
+        return self._nodes_by_id.get(node_id)
     
     def get_link_by_id(self, link_id: str) -> Optional[Link]:
         """ID로 링크 찾기"""
-        return next((link for link in self.current_links if link.ID == link_id), None)
+        return self._links_by_id.get(link_id)
+    
+    def find_route(self, from_node_id: str, to_node_id: str) -> RouteResult:
+        """두 노드 간 최단 경로 반환 (그래프 버전별 LRU 캐시 사용)"""
+        return self.find_routes([(from_node_id, to_node_id)])[0]
+    
+    def find_routes(self, pairs: List[tuple]) -> List[RouteResult]:
+        """여러 출발지/목적지 쌍의 최단 경로 반환
+        
+        캐시에 없는 쌍은 출발지별로 묶어 한 번의 Dijkstra 탐색으로 처리한다.
+        잠금 없이 스레드 풀에서 실행되므로 시작 시점의 그래프 버전을 기준으로 하며, 탐색 도중 그래프가
+        바뀌었으면 결과를 반환만 하고 캐시하지 않는다 (get_tile과 같은 방식).
+        """
+        version = self.graph_version
+        results = [None] * len(pairs)
+        pending = {}
+        
+        for i, (from_id, to_id) in enumerate(pairs):
+            cached = self._route_cache.get((version, from_id, to_id))
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.setdefault(from_id, {}).setdefault(to_id, []).append(i)
+        
+        if pending:
+            adjacency = self._route_adjacency(version)
+            
+            for from_id, targets in pending.items():
+                tree = shortest_paths(adjacency, from_id, set(targets))
+                for to_id, indices in targets.items():
+                    if to_id in tree:
+                        node_ids, link_ids = reconstruct_path(tree, to_id)
+                        route = RouteResult(
+                            FromNodeID=from_id, ToNodeID=to_id, Found=True,
+                            Length=round(tree[to_id][0], 5),
+                            NodeIDs=node_ids, LinkIDs=link_ids
+                        )
+                    else:
+                        route = RouteResult(FromNodeID=from_id, ToNodeID=to_id, Found=False)
+                    for i in indices:
+                        results[i] = route
+            
+            if version == self.graph_version:
+                for from_id, targets in pending.items():
+                    for to_id, indices in targets.items():
+                        self._route_cache.put((version, from_id, to_id), results[indices[0]])
+        
+        return results
+    
+    def _route_adjacency(self, version: int):
+        """version 시점의 인접 리스트 (버전과 함께 보관하므로 변경 후 늦게 저장된 이전 버전은 쓰이지 않음)"""
+        cached = self._adjacency
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        adjacency = build_adjacency(self.current_links)
+        if version == self.graph_version:
+            self._adjacency = (version, adjacency)
+        return adjacency
+    
+    def analyze_connectivity(self, depot_id: Optional[str] = None) -> dict:
+        """연결성 분석 결과 반환 (그래프 버전별 캐시 사용)"""
+        key = (self.graph_version, depot_id)
+        result = self._connectivity_cache.get(key)
+        if result is None:
+            result = analyze_connectivity(self.current_nodes, self.current_links, depot_id)
+            self._connectivity_cache.put(key, result)
+        return result
+    
+    def resample_path(self, node_ids: List[str], spacing: float):
+        """노드 순서를 일정 간격(m) 웨이포인트 (x, y, yaw, s) 배열로 변환"""
+        missing = [node_id for node_id in node_ids if node_id not in self._nodes_by_id]
+        if missing:
+            raise KeyError(f"Nodes not found: {', '.join(missing)}")
+        
+        points = nodes_to_utm_array([self._nodes_by_id[node_id] for node_id in node_ids])
+        return resample_polyline(points, spacing)
+    
+    def simplify(self, tolerance: float, dry_run: bool = False, progress: Optional[Callable] = None) -> dict:
+        """degree-2 노드 체인을 Douglas–Peucker로 단순화하고 감소율 보고
+
+        progress는 삭제 대상을 계산한 뒤 적용하기 직전에 호출되며, 여기서 예외가 나면 아무것도 바뀌지 않는다.
+        """
+        nodes_before = len(self.current_nodes)
+        links_before = len(self.current_links)
+        
+        removed_nodes, rewired, removed_links = simplify_chains(
+            self.current_nodes, self.current_links, tolerance
+        )
+        if progress:
+            progress(0.9, "Applying", removed_nodes=len(removed_nodes), removed_links=len(removed_links))
+        
+        if not dry_run and removed_nodes:
+            self.current_nodes = [n for n in self.current_nodes if n.ID not in removed_nodes]
+            self.current_links = [l for l in self.current_links if l.ID not in removed_links]
+            
+            existing_link_ids = {link.ID for link in self.current_links}
+            for link, new_to_id in rewired:
+                self._encodings.invalidate(link)
+                link.ToNodeID = new_to_id
+                # 링크 ID 규칙(L{from}{to})을 따르되 기존 ID와 충돌하면 원래 ID 유지
+                new_id = self._generate_link_id(link.FromNodeID, new_to_id)
+                if new_id not in existing_link_ids:
+                    existing_link_ids.discard(link.ID)
+                    existing_link_ids.add(new_id)
+                    link.ID = new_id
+                link.Length = self._calculate_link_length(link.FromNodeID, link.ToNodeID)
+            self._reindex()
+            self._touch()
+        
+        nodes_after = nodes_before - len(removed_nodes)
+        links_after = links_before - len(removed_links)
+        return {
+            "tolerance": tolerance,
+            "dry_run": dry_run,
+            "nodes_before": nodes_before,
+            "nodes_after": nodes_after,
+            "links_before": links_before,
+            "links_after": links_after,
+            "removed_node_ids": sorted(removed_nodes),
+            "reduction_ratio": round(len(removed_nodes) / nodes_before, 4) if nodes_before else 0.0
+        }
+    
+    def recalculate_all_lengths(self, progress: Optional[Callable] = None) -> dict:
+        """모든 링크 길이를 양 끝 노드 UTM 좌표로 다시 계산 (끝 노드가 없는 링크는 그대로)
+
+        새 길이를 모두 계산한 뒤 한 번에 적용하므로 계산 도중 progress가 예외를 내면 아무것도 바뀌지 않는다.
+        """
+        links = self.current_links
+        lengths = []
+        for i, link in enumerate(links):
+            if progress and i % 10000 == 0:
+                progress(0.9 * i / len(links), "Calculating", links_processed=i)
+            if link.FromNodeID in self._nodes_by_id and link.ToNodeID in self._nodes_by_id:
+                lengths.append(self._calculate_link_length(link.FromNodeID, link.ToNodeID))
+            else:
+                lengths.append(link.Length)
+        
+        changed = 0
+        max_difference = 0.0
+        for link, length in zip(links, lengths):
+            if link.Length != length:
+                max_difference = max(max_difference, abs(link.Length - length))
+                link.Length = length
+                self._encodings.invalidate(link)
+                changed += 1
+        if changed:
+            self._touch()
+        return {
+            "links": len(links),
+            "changed": changed,
+            "max_difference": round(max_difference, 5),
+            "graph_version": self.graph_version
+        }
+    
+    def import_trace(self, lines, min_distance: float = 1.0, heading_threshold: float = 10.0,
+                     chunk_size: int = 10000) -> dict:
+        """GPS 트레이스(CSV/NMEA)를 스트리밍으로 읽어 노드와 연속 링크 생성"""
+        today = datetime.now().strftime("%Y%m%d")
+        decimator = TraceDecimator(min_distance, heading_threshold)
+        
+        # 기존 N#### 규칙을 이어서 ID 할당
+        next_num = int(self._generate_node_id()[1:])
+        new_nodes: List[Node] = []
+        new_links: List[Link] = []
+        prev = None  # (node_id, easting, northing)
+        
+        def emit(records):
+            nonlocal next_num, prev
+            for lat, lon, alt, easting, northing in records:
+                node_id = f"N{next_num:04d}"
+                next_num += 1
+                new_nodes.append(Node(
+                    ID=node_id, Maker="GPS Trace Import", UpdateDate=today,
+                    Remark="GPS 트레이스에서 생성된 노드", HistType="01A", HistRemark="노드 신규 추가",
+                    GpsInfo=GpsInfo(Lat=lat, Long=lon, Alt=alt),
+                    UtmInfo=UtmInfo(Easting=easting, Northing=northing, Zone=decimator.zone_name)
+                ))
+                if prev is not None:
+                    dist_m = math.hypot(easting - prev[1], northing - prev[2])
+                    new_links.append(Link(
+                        ID=self._generate_link_id(prev[0], node_id),
+                        FromNodeID=prev[0], ToNodeID=node_id,
+                        Length=round(dist_m / 1000.0, 5),
+                        Maker="GPS Trace Import", UpdateDate=today,
+                        Remark="GPS 트레이스에서 생성된 링크", HistType="01A", HistRemark="링크 신규 추가"
+                    ))
+                prev = (node_id, easting, northing)
+        
+        for chunk in iter_chunks(iter_trace_points(lines), chunk_size):
+            emit(decimator.feed(chunk))
+        emit(decimator.finish())
+        
+        if new_nodes:
+            self.current_nodes.extend(new_nodes)
+            self.current_links.extend(new_links)
+            self._reindex()
+            self._touch()
+        
+        return {
+            "points_read": decimator.points_read,
+            "nodes_added": len(new_nodes),
+            "links_added": len(new_links),
+            "first_node_id": new_nodes[0].ID if new_nodes else None,
+            "last_node_id": new_nodes[-1].ID if new_nodes else None,
+            "zone": decimator.zone_name
+        }
     
     def _generate_node_id(self) -> str:
         """새 노드 ID 생성"""
@@ -221,11 +1396,17 @@ class PathService:
         
         return round(dist_m / 1000.0, 5)  # km 단위로 변환
     
-    def _recalculate_link_lengths(self, node_id: str):
-        """노드와 연결된 모든 링크의 길이 재계산"""
+    def _recalculate_link_lengths(self, node_id: str) -> List[Link]:
+        """노드와 연결된 모든 링크의 길이 재계산 후 해당 링크 목록 반환"""
+        changed = []
         for link in self.current_links:
             if link.FromNodeID == node_id or link.ToNodeID == node_id:
                 link.Length = self._calculate_link_length(link.FromNodeID, link.ToNodeID)
+                self._encodings.invalidate(link)
+                if self._links_by_id.get(link.ID) is link:
+                    self._index_link(link)
+                changed.append(link)
+        return changed
     
     def list_available_files(self) -> List[str]:
         """사용 가능한 JSON 파일 목록 반환"""
@@ -234,18 +1415,21 @@ class PathService:
         
         files = []
         for file in os.listdir(self.data_dir):
-            if file.endswith('.json'):
+            if file.endswith(SUPPORTED_EXTENSIONS):
                 files.append(file)
         
         return sorted(files)
     
-    def _merge_nodes_with_duplicates(self, new_nodes: List[Node]) -> tuple[List[Node], List[Node]]:
+    def _merge_nodes_with_duplicates(self, new_nodes: List[Node], base_nodes: List[Node],
+                                     progress: Optional[Callable] = None) -> tuple[List[Node], List[Node]]:
         """새로운 노드들을 기존 노드들과 병합하면서 중복 ID 처리"""
-        existing_node_ids = {node.ID for node in self.current_nodes}
+        existing_node_ids = {node.ID for node in base_nodes}
         duplicate_nodes = []
         unique_new_nodes = []
         
-        for new_node in new_nodes:
+        for i, new_node in enumerate(new_nodes):
+            if progress is not None and i % MERGE_PROGRESS_INTERVAL == 0:
+                progress(i / len(new_nodes), "Merging nodes", nodes_processed=i, duplicate_nodes=len(duplicate_nodes))
             if new_node.ID in existing_node_ids:
                 duplicate_nodes.append(new_node)
                 print(f"중복 노드 ID 발견, 무시됨: {new_node.ID}")
@@ -254,18 +1438,23 @@ class PathService:
                 existing_node_ids.add(new_node.ID)
         
         # 기존 노드들과 새로운 고유 노드들을 병합
-        merged_nodes = self.current_nodes + unique_new_nodes
+        merged_nodes = base_nodes + unique_new_nodes
+        if progress is not None:
+            progress(1.0, "Merging nodes", nodes_processed=len(new_nodes), duplicate_nodes=len(duplicate_nodes))
         
         return merged_nodes, duplicate_nodes
     
-    def _merge_links_with_duplicates(self, new_links: List[Link], all_nodes: List[Node]) -> tuple[List[Link], List[Link]]:
+    def _merge_links_with_duplicates(self, new_links: List[Link], all_nodes: List[Node], base_links: List[Link],
+                                     progress: Optional[Callable] = None) -> tuple[List[Link], List[Link]]:
         """새로운 링크들을 기존 링크들과 병합하면서 중복 ID 처리"""
-        existing_link_ids = {link.ID for link in self.current_links}
+        existing_link_ids = {link.ID for link in base_links}
         node_id_set = {node.ID for node in all_nodes}
         duplicate_links = []
         unique_new_links = []
         
-        for new_link in new_links:
+        for i, new_link in enumerate(new_links):
+            if progress is not None and i % MERGE_PROGRESS_INTERVAL == 0:
+                progress(i / len(new_links), "Merging links", links_processed=i, duplicate_links=len(duplicate_links))
             if new_link.ID in existing_link_ids:
                 duplicate_links.append(new_link)
                 print(f"중복 링크 ID 발견, 무시됨: {new_link.ID}")
@@ -279,7 +1468,9 @@ class PathService:
                     duplicate_links.append(new_link)  # 참조 에러도 중복으로 처리
         
         # 기존 링크들과 새로운 고유 링크들을 병합
-        merged_links = self.current_links + unique_new_links
+        merged_links = base_links + unique_new_links
+        if progress is not None:
+            progress(1.0, "Merging links", links_processed=len(new_links), duplicate_links=len(duplicate_links))
         
         return merged_links, duplicate_links
     
@@ -0,0 +1,89 @@
+import base64
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..models.path_models import GpsInfo, Link, Node, UtmInfo
+
+# 중첩 좌표 필드를 평탄화한 이름 (데스크톱 테이블 헤더와 동일)
+_NESTED_FIELDS = {
+    **{name: "GpsInfo" for name in GpsInfo.model_fields},
+    **{name: "UtmInfo" for name in UtmInfo.model_fields},
+}
+
+
+def _field_getter(model_class, name: str) -> Callable:
+    """필드 이름(ID, Lat, GpsInfo.Lat, GpsInfo 등)에 대한 값 추출 함수 반환"""
+    if "." in name:
+        parent, child = name.split(".", 1)
+        if parent not in ("GpsInfo", "UtmInfo") or parent not in model_class.model_fields:
+            raise ValueError(f"Unknown field: {name}")
+        sub_class = GpsInfo if parent == "GpsInfo" else UtmInfo
+        if child not in sub_class.model_fields:
+            raise ValueError(f"Unknown field: {name}")
+        return lambda record: getattr(getattr(record, parent), child)
+    
+    if name in model_class.model_fields:
+        if name in ("GpsInfo", "UtmInfo"):
+            return lambda record: getattr(record, name).model_dump()
+        return lambda record: getattr(record, name)
+    
+    if name in _NESTED_FIELDS and _NESTED_FIELDS[name] in model_class.model_fields:
+        parent = _NESTED_FIELDS[name]
+        return lambda record: getattr(getattr(record, parent), name)
+    
+    raise ValueError(f"Unknown field: {name}")
+
+
+def parse_fields(model_class, fields: Optional[str]) -> Optional[List[Tuple[str, Callable]]]:
+    """fields= 쿼리 문자열을 (출력 키, 값 추출 함수) 목록으로 변환"""
+    if not fields:
+        return None
+    projection = []
+    for name in (part.strip() for part in fields.split(",")):
+        if name:
+            # 평탄화된 출력 키 사용 (GpsInfo.Lat -> Lat)
+            key = name.split(".", 1)[1] if "." in name else name
+            projection.append((key, _field_getter(model_class, name)))
+    return projection or None
+
+
+def project(records: Sequence, projection: List[Tuple[str, Callable]]) -> List[Dict]:
+    """레코드 목록에서 선택한 필드만 추출"""
+    return [{key: getter(record) for key, getter in projection} for record in records]
+
+
+def encode_cursor(position: int, record_id: str) -> str:
+    """다음 페이지 시작 위치를 불투명 커서 문자열로 인코딩"""
+    raw = f"{position}:{record_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, str]:
+    """커서 문자열을 (위치, 마지막 레코드 ID)로 디코딩"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position, record_id = base64.urlsafe_b64decode(padded).decode("utf-8").split(":", 1)
+        return int(position), record_id
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def paginate(records: Sequence, cursor: Optional[str], limit: Optional[int],
+             positions: Dict[str, int]) -> Tuple[Sequence, Optional[str]]:
+    """커서 기반 페이지 분할
+
+    커서는 마지막으로 반환한 레코드 ID를 담고 있어 앞쪽 레코드가 삭제되어도 중복/누락 없이 이어지며,
+    해당 레코드가 삭제된 경우에만 저장된 위치로 대체한다.
+    """
+    start = 0
+    if cursor:
+        position, last_id = decode_cursor(cursor)
+        start = positions[last_id] + 1 if last_id in positions else position
+    
+    if limit is None:
+        page = records[start:]
+        return page, None
+    
+    page = records[start:start + limit]
+    end = start + len(page)
+    next_cursor = encode_cursor(end, page[-1].ID) if page and end < len(records) else None
+    return page, next_cursor
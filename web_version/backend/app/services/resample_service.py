@@ -0,0 +1,76 @@
+from typing import Iterator, Sequence
+
+import numpy as np
+
+from ..models.path_models import Node
+
+WAYPOINT_FIELDS = ("x", "y", "yaw", "s")
+
+
+def nodes_to_utm_array(nodes: Sequence[Node]) -> np.ndarray:
+    """노드 순서대로 UTM 좌표 (N, 2) 배열 생성"""
+    coords = np.empty((len(nodes), 2), dtype=np.float64)
+    for i, node in enumerate(nodes):
+        coords[i, 0] = node.UtmInfo.Easting
+        coords[i, 1] = node.UtmInfo.Northing
+    return coords
+
+
+def resample_polyline(points: np.ndarray, spacing: float) -> np.ndarray:
+    """폴리라인을 일정 간격 웨이포인트로 재샘플링
+
+    반환값은 (M, 4) 배열이며 열 순서는 x, y, yaw(라디안), 누적 거리 s(m) 이다.
+    마지막 원본 점은 간격과 관계없이 항상 포함된다.
+    """
+    if spacing <= 0:
+        raise ValueError("spacing must be positive")
+    
+    points = np.asarray(points, dtype=np.float64)
+    if len(points) == 0:
+        return np.empty((0, 4), dtype=np.float64)
+    
+    # 길이 0인 구간(중복 점) 제거
+    deltas = np.diff(points, axis=0)
+    seg_lengths = np.hypot(deltas[:, 0], deltas[:, 1])
+    keep = np.concatenate(([True], seg_lengths > 0))
+    points = points[keep]
+    if len(points) == 1:
+        return np.array([[points[0, 0], points[0, 1], 0.0, 0.0]])
+    
+    deltas = np.diff(points, axis=0)
+    seg_lengths = np.hypot(deltas[:, 0], deltas[:, 1])
+    seg_yaws = np.arctan2(deltas[:, 1], deltas[:, 0])
+    cum = np.concatenate(([0.0], np.cumsum(seg_lengths)))
+    total = cum[-1]
+    
+    s = np.arange(0.0, total, spacing)
+    if total - s[-1] > 1e-9:
+        s = np.append(s, total)
+    
+    # 각 샘플이 속한 구간 인덱스 (마지막 점은 마지막 구간에 포함)
+    seg = np.clip(np.searchsorted(cum, s, side="right") - 1, 0, len(seg_lengths) - 1)
+    t = (s - cum[seg]) / seg_lengths[seg]
+    
+    out = np.empty((len(s), 4), dtype=np.float64)
+    out[:, 0] = points[seg, 0] + t * deltas[seg, 0]
+    out[:, 1] = points[seg, 1] + t * deltas[seg, 1]
+    out[:, 2] = seg_yaws[seg]
+    out[:, 3] = s
+    return out
+
+
+def iter_waypoints_csv(waypoints: np.ndarray, chunk_rows: int = 50000) -> Iterator[bytes]:
+    """웨이포인트를 CSV 바이트 청크로 스트리밍"""
+    yield (",".join(WAYPOINT_FIELDS) + "\n").encode("ascii")
+    for start in range(0, len(waypoints), chunk_rows):
+        chunk = waypoints[start:start + chunk_rows]
+        # 청크 전체를 한 번의 문자열 포맷팅으로 처리 (행 단위 루프 회피)
+        row_format = "%.3f,%.3f,%.6f,%.3f\n" * len(chunk)
+        yield (row_format % tuple(chunk.ravel().tolist())).encode("ascii")
+
+
+def iter_waypoints_binary(waypoints: np.ndarray, chunk_rows: int = 65536) -> Iterator[bytes]:
+    """웨이포인트를 little-endian float64 (x, y, yaw, s) 레코드로 스트리밍"""
+    data = np.ascontiguousarray(waypoints, dtype="<f8")
+    for start in range(0, len(data), chunk_rows):
+        yield data[start:start + chunk_rows].tobytes()
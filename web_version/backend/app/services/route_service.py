@@ -0,0 +1,64 @@
+import heapq
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..models.path_models import Link
+
+# 인접 리스트: FromNodeID -> [(ToNodeID, LinkID, Length), ...]
+Adjacency = Dict[str, List[Tuple[str, str, float]]]
+
+
+def build_adjacency(links: Iterable[Link]) -> Adjacency:
+    """링크 목록으로 방향 그래프 인접 리스트 생성"""
+    adjacency: Adjacency = {}
+    for link in links:
+        adjacency.setdefault(link.FromNodeID, []).append((link.ToNodeID, link.ID, link.Length))
+    return adjacency
+
+
+def shortest_paths(adjacency: Adjacency, source: str,
+                   targets: Optional[Set[str]] = None) -> Dict[str, Tuple[float, Optional[str], Optional[str]]]:
+    """단일 출발지 Dijkstra 탐색
+
+    반환값은 노드 ID -> (누적 거리, 이전 노드 ID, 진입 링크 ID) 이며,
+    targets가 주어지면 모든 목적지가 확정되는 즉시 탐색을 종료한다.
+    """
+    best = {source: (0.0, None, None)}
+    settled: Set[str] = set()
+    remaining = set(targets) if targets else None
+    heap = [(0.0, source)]
+
+    while heap:
+        dist, node_id = heapq.heappop(heap)
+        if node_id in settled:
+            continue
+        settled.add(node_id)
+
+        if remaining is not None:
+            remaining.discard(node_id)
+            if not remaining:
+                break
+
+        for to_id, link_id, length in adjacency.get(node_id, ()):
+            new_dist = dist + length
+            if to_id not in best or new_dist < best[to_id][0]:
+                best[to_id] = (new_dist, node_id, link_id)
+                heapq.heappush(heap, (new_dist, to_id))
+
+    return {node_id: best[node_id] for node_id in settled}
+
+
+def reconstruct_path(tree: Dict[str, Tuple[float, Optional[str], Optional[str]]],
+                     target: str) -> Tuple[List[str], List[str]]:
+    """탐색 트리에서 목적지까지의 노드/링크 ID 순서 복원"""
+    node_ids: List[str] = []
+    link_ids: List[str] = []
+    current: Optional[str] = target
+    while current is not None:
+        node_ids.append(current)
+        _, prev_id, link_id = tree[current]
+        if link_id is not None:
+            link_ids.append(link_id)
+        current = prev_id
+    node_ids.reverse()
+    link_ids.reverse()
+    return node_ids, link_ids
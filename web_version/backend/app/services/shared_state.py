@@ -0,0 +1,231 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows 등 fcntl이 없는 환경에서는 공유 모드를 사용할 수 없음
+    fcntl = None
+
+# 저널 파일이 이보다 커지면 다음 쓰기에서 스냅샷으로 압축 (바이트)
+JOURNAL_COMPACT_BYTES = int(os.environ.get("PATH_SHARED_JOURNAL_MB", "4")) * 1024 * 1024
+
+
+def workspace_key(token: str) -> str:
+    """세션 토큰의 공유 디렉토리 이름 (토큰 해시)"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:32]
+
+
+def recent_workspace_keys(root: str) -> List[str]:
+    """공유 디렉토리의 워크스페이스 이름을 최근 변경 순으로 (해제되어 버전 0인 워크스페이스 제외)"""
+    keys = []
+    try:
+        entries = list(os.scandir(root))
+    except FileNotFoundError:
+        return []
+    for entry in entries:
+        version_path = os.path.join(entry.path, "version")
+        try:
+            with open(version_path, "r") as f:
+                version = int(f.read().split()[1])
+            modified = os.stat(version_path).st_mtime
+        except (OSError, ValueError, IndexError):
+            continue
+        if version > 0:
+            keys.append((modified, entry.name))
+    return [key for _, key in sorted(keys, reverse=True)]
+
+
+def sweep_workspaces(root: str, max_age: float, keep: Iterable[str] = ()) -> int:
+    """max_age초 동안 어느 파일도 바뀌지 않은 워크스페이스 디렉토리 삭제 (keep은 제외, 삭제한 수 반환)
+
+    사용 중인 워커는 주기적으로 touch()하므로 mtime이 오래된 디렉토리는 어느 워커도 메모리에 두고 있지 않다.
+    다른 프로세스가 잠금을 잡고 있으면 건너뛰며, 삭제와 동시에 열린 저장소는 acquire()에서 디렉토리를 다시 만든다.
+    """
+    keep = set(keep)
+    removed = 0
+    try:
+        entries = list(os.scandir(root))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        if entry.name in keep or not entry.is_dir():
+            continue
+        if not _idle_for(entry.path, max_age):
+            continue
+        try:
+            lock_file = open(os.path.join(entry.path, "lock"), "a+b")
+        except OSError:
+            continue
+        try:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                continue
+            # 잠금을 잡는 사이 다시 사용되었으면 유지
+            if _idle_for(entry.path, max_age):
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed += 1
+        finally:
+            lock_file.close()
+    return removed
+
+
+def _idle_for(directory: str, max_age: float) -> bool:
+    """디렉토리 안 모든 파일의 mtime이 max_age초보다 오래되었는지"""
+    newest = 0.0
+    try:
+        for entry in os.scandir(directory):
+            newest = max(newest, entry.stat().st_mtime)
+    except FileNotFoundError:
+        return False
+    return time.time() - newest > max_age
+
+
+class SharedWorkspaceStore:
+    """여러 워커/파드가 같은 디렉토리로 워크스페이스 상태를 공유하기 위한 파일 저장소
+
+    디렉토리 구성 (토큰 해시별):
+      lock          fcntl 잠금 파일 (쓰기는 배타 잠금, 따라잡기는 공유 잠금)
+      version       "<instance_id> <graph_version>" (다른 워커가 매 요청마다 확인하는 변경 알림)
+      snapshot.json 마지막 대량 변경(또는 저널 압축) 시점의 전체 상태
+      journal.jsonl 스냅샷 이후의 버전별 델타 (한 줄에 하나, 단일 작성자)
+      storage       쓰기 즉시 기록할 저장소 파일 경로 (없으면 빈 파일)
+    """
+
+    def __init__(self, root: str, token: Optional[str] = None, key: Optional[str] = None):
+        if fcntl is None:
+            raise RuntimeError("Shared workspace mode requires fcntl (POSIX)")
+        # 토큰 대신 디렉토리 이름(key)으로도 열 수 있음 (토큰을 모르는 시작 시 미리 로드)
+        self.key = key or workspace_key(token)
+        self.directory = os.path.join(root, self.key)
+        self._lock_path = os.path.join(self.directory, "lock")
+        self._open_lock()
+        self._version_path = os.path.join(self.directory, "version")
+        self._snapshot_path = os.path.join(self.directory, "snapshot.json")
+        self._journal_path = os.path.join(self.directory, "journal.jsonl")
+        self._storage_path = os.path.join(self.directory, "storage")
+
+    def _open_lock(self):
+        os.makedirs(self.directory, exist_ok=True)
+        # 파일 객체로 열어 두어 워크스페이스가 제거되면 함께 닫히도록 함
+        self._lock_file = open(self._lock_path, "a+b")
+
+    def acquire(self, exclusive: bool = True):
+        """프로세스 간 잠금 (쓰기는 배타, 따라잡기는 공유)"""
+        while True:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                if os.stat(self._lock_path).st_ino == os.fstat(self._lock_file.fileno()).st_ino:
+                    return
+            except FileNotFoundError:
+                pass
+            # 잠금을 기다리는 사이 sweep_workspaces가 디렉토리를 지웠으면 새 잠금 파일로 다시 시도
+            self._lock_file.close()
+            self._open_lock()
+
+    def touch(self):
+        """사용 중임을 표시 (sweep_workspaces가 지우지 않도록 잠금 파일 mtime 갱신)"""
+        try:
+            os.utime(self._lock_path)
+        except FileNotFoundError:
+            pass
+
+    def release(self):
+        fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def read_version(self) -> Tuple[Optional[str], int]:
+        """(instance_id, graph_version) 반환 (아직 상태가 없으면 (None, 0))"""
+        try:
+            with open(self._version_path, "r") as f:
+                instance_id, version = f.read().split()
+            return instance_id, int(version)
+        except (OSError, ValueError):
+            return None, 0
+
+    def write_version(self, instance_id: str, version: int):
+        self._replace(self._version_path, f"{instance_id} {version}".encode("utf-8"))
+
+    def append(self, version: int, delta: dict):
+        """저널에 델타 추가 (배타 잠금 하에서 호출)"""
+        line = json.dumps({"v": version, **delta}, ensure_ascii=False, separators=(",", ":"))
+        with open(self._journal_path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def journal_bytes(self) -> int:
+        try:
+            return os.stat(self._journal_path).st_size
+        except FileNotFoundError:
+            return 0
+
+    def write_snapshot(self, version: int, document: bytes):
+        """전체 상태를 스냅샷으로 쓰고 저널 비움 (배타 잠금 하에서 호출)"""
+        self._replace(self._snapshot_path, b'{"version":%d,"data":' % version + document + b"}")
+        with open(self._journal_path, "w"):
+            pass
+
+    def read_snapshot(self) -> Tuple[int, dict]:
+        """(version, {"Node": [...], "Link": [...]}) 반환 (스냅샷이 없으면 버전 0의 빈 상태)"""
+        try:
+            with open(self._snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return 0, {"Node": [], "Link": []}
+        return snapshot["version"], snapshot["data"]
+
+    def snapshot_version(self) -> int:
+        try:
+            with open(self._snapshot_path, "rb") as f:
+                head = f.read(64)
+            return int(head.split(b'"version":', 1)[1].split(b",", 1)[0])
+        except (OSError, IndexError, ValueError):
+            return 0
+
+    def entries_since(self, version: int, until: int) -> Optional[List[dict]]:
+        """version 초과 until 이하의 저널 델타 (스냅샷이 더 새로우면 None → 스냅샷부터 복원)
+
+        버전 파일을 쓰기 전에 중단된 쓰기의 델타는 until보다 크므로 무시되고,
+        같은 버전이 다시 기록되면 나중 항목을 사용한다.
+        """
+        if version < self.snapshot_version():
+            return None
+        entries: Dict[int, dict] = {}
+        try:
+            with open(self._journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        if version < entry["v"] <= until:
+                            entries[entry["v"]] = entry
+        except FileNotFoundError:
+            pass
+        return [entries[v] for v in sorted(entries)]
+
+    def read_storage(self) -> Optional[str]:
+        try:
+            with open(self._storage_path, "r", encoding="utf-8") as f:
+                return f.read() or None
+        except FileNotFoundError:
+            return None
+
+    def write_storage(self, path: Optional[str]):
+        self._replace(self._storage_path, (path or "").encode("utf-8"))
+
+    def reset(self, instance_id: str):
+        """빈 상태로 초기화하고 새 instance_id 기록 (배타 잠금 하에서 호출)"""
+        self.write_snapshot(0, b'{"Node":[],"Link":[]}')
+        self.write_storage(None)
+        self.write_version(instance_id, 0)
+
+    @staticmethod
+    def _replace(path: str, content: bytes):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def close(self):
+        self._lock_file.close()
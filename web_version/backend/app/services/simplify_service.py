@@ -0,0 +1,106 @@
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from ..models.path_models import Link, Node
+from .resample_service import nodes_to_utm_array
+
+
+def douglas_peucker_mask(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """반복형 Douglas–Peucker 단순화: 유지할 점의 불리언 마스크 반환
+
+    재귀 대신 명시적 스택을 사용하며, 구간마다 수직 거리는 NumPy로 한 번에 계산한다.
+    """
+    n = len(points)
+    keep = np.zeros(n, dtype=bool)
+    if n == 0:
+        return keep
+    keep[0] = keep[-1] = True
+    
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end <= start + 1:
+            continue
+        
+        seg = points[end] - points[start]
+        rel = points[start + 1:end] - points[start]
+        seg_len = np.hypot(seg[0], seg[1])
+        if seg_len == 0:
+            dists = np.hypot(rel[:, 0], rel[:, 1])
+        else:
+            dists = np.abs(seg[0] * rel[:, 1] - seg[1] * rel[:, 0]) / seg_len
+        
+        i = int(np.argmax(dists))
+        if dists[i] > tolerance:
+            split = start + 1 + i
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return keep
+
+
+def find_degree2_chains(nodes: List[Node], links: List[Link]) -> List[Tuple[List[str], List[Link]]]:
+    """진입/진출 링크가 각각 하나인 중간 노드로 이어진 체인 목록 반환
+
+    각 체인은 (노드 ID 순서, 링크 순서) 이며 양 끝 노드는 분기점 또는 끝점이다.
+    중간 노드로만 이루어진 순환은 기준점이 없으므로 제외한다.
+    """
+    node_ids = {node.ID for node in nodes}
+    out_links: Dict[str, List[Link]] = defaultdict(list)
+    in_links: Dict[str, List[Link]] = defaultdict(list)
+    for link in links:
+        if link.FromNodeID in node_ids and link.ToNodeID in node_ids:
+            out_links[link.FromNodeID].append(link)
+            in_links[link.ToNodeID].append(link)
+    
+    def is_interior(node_id: str) -> bool:
+        ins, outs = in_links.get(node_id, ()), out_links.get(node_id, ())
+        # 양방향 링크 쌍(A->B->A)은 체인으로 보지 않음
+        return len(ins) == 1 and len(outs) == 1 and ins[0].FromNodeID != outs[0].ToNodeID
+    
+    chains = []
+    for start_id in list(out_links.keys()):
+        if is_interior(start_id):
+            continue
+        for first_link in out_links[start_id]:
+            if not is_interior(first_link.ToNodeID):
+                continue
+            chain_nodes = [start_id]
+            chain_links = []
+            link = first_link
+            while True:
+                chain_links.append(link)
+                chain_nodes.append(link.ToNodeID)
+                if not is_interior(link.ToNodeID) or link.ToNodeID == start_id:
+                    break
+                link = out_links[link.ToNodeID][0]
+            chains.append((chain_nodes, chain_links))
+    return chains
+
+
+def simplify_chains(nodes: List[Node], links: List[Link], tolerance: float):
+    """degree-2 체인을 허용 오차(m) 내에서 단순화
+
+    (삭제할 노드 ID 집합, [(유지 구간 첫 링크, 새 ToNodeID), ...], 삭제할 링크 ID 집합)을 반환한다.
+    """
+    node_dict = {node.ID: node for node in nodes}
+    removed_nodes = set()
+    rewired: List[Tuple[Link, str]] = []
+    removed_links = set()
+    
+    for chain_nodes, chain_links in find_degree2_chains(nodes, links):
+        points = nodes_to_utm_array([node_dict[node_id] for node_id in chain_nodes])
+        keep = douglas_peucker_mask(points, tolerance)
+        if keep.all():
+            continue
+        
+        kept_indices = np.flatnonzero(keep)
+        for a, b in zip(kept_indices[:-1], kept_indices[1:]):
+            # 유지 구간의 첫 링크를 재사용하고 나머지 링크는 삭제
+            rewired.append((chain_links[a], chain_nodes[b]))
+            removed_links.update(link.ID for link in chain_links[a + 1:b])
+        removed_nodes.update(chain_nodes[i] for i in np.flatnonzero(~keep))
+    
+    return removed_nodes, rewired, removed_links
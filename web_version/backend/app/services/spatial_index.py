@@ -0,0 +1,134 @@
+import math
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+# (min_lon, min_lat, max_lon, max_lat)
+BBox = Tuple[float, float, float, float]
+
+
+def parse_bbox(value: str) -> BBox:
+    """'minLon,minLat,maxLon,maxLat' 문자열을 bbox 튜플로 변환"""
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(part) for part in value.split(","))
+    except ValueError:
+        raise ValueError("bbox must be minLon,minLat,maxLon,maxLat")
+    if min_lon > max_lon or min_lat > max_lat:
+        raise ValueError("bbox min must not exceed max")
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def bbox_intersects(a: BBox, b: BBox) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def segment_intersects_bbox(x1: float, y1: float, x2: float, y2: float, bbox: BBox) -> bool:
+    """선분과 bbox의 교차 여부 (Liang–Barsky 클리핑)"""
+    min_x, min_y, max_x, max_y = bbox
+    dx, dy = x2 - x1, y2 - y1
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x1 - min_x), (dx, max_x - x1), (-dy, y1 - min_y), (dy, max_y - y1)):
+        if p == 0:
+            if q < 0:
+                return False
+            continue
+        t = q / p
+        if p < 0:
+            if t > t1:
+                return False
+            t0 = max(t0, t)
+        else:
+            if t < t0:
+                return False
+            t1 = min(t1, t)
+    return True
+
+
+class GridIndex:
+    """균일 격자 기반 공간 인덱스 (키 -> bbox)
+
+    각 항목은 bbox가 걸친 모든 격자 칸에 등록되며, 지나치게 많은 칸에 걸치는 항목은
+    별도 집합에 두고 매 조회마다 직접 검사한다.
+    """
+
+    def __init__(self, cell_size: float = 0.001, max_cells_per_item: int = 1024):
+        self.cell_size = cell_size
+        self.max_cells_per_item = max_cells_per_item
+        self._cells: Dict[Tuple[int, int], Set[str]] = {}
+        self._items: Dict[str, BBox] = {}
+        self._oversized: Set[str] = set()
+
+    def _cell_range(self, bbox: BBox):
+        size = self.cell_size
+        return (math.floor(bbox[0] / size), math.floor(bbox[1] / size),
+                math.floor(bbox[2] / size), math.floor(bbox[3] / size))
+
+    def insert(self, key: str, bbox: BBox):
+        if key in self._items:
+            self.remove(key)
+        self._items[key] = bbox
+        cx0, cy0, cx1, cy1 = self._cell_range(bbox)
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > self.max_cells_per_item:
+            self._oversized.add(key)
+            return
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                self._cells.setdefault((cx, cy), set()).add(key)
+
+    def remove(self, key: str):
+        bbox = self._items.pop(key, None)
+        if bbox is None:
+            return
+        if key in self._oversized:
+            self._oversized.discard(key)
+            return
+        cx0, cy0, cx1, cy1 = self._cell_range(bbox)
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = self._cells.get((cx, cy))
+                if cell is not None:
+                    cell.discard(key)
+                    if not cell:
+                        del self._cells[(cx, cy)]
+
+    def query(self, bbox: BBox) -> Set[str]:
+        """bbox와 겹치는 항목 키 집합 반환
+
+        타일 생성처럼 잠금 없이 다른 스레드에서 조회하는 동안 이벤트 루프에서 항목이 추가/삭제될 수 있으므로,
+        칸 목록은 복사본(한 번의 C 수준 복사라 중간에 바뀌지 않음)을 훑고 그 사이 삭제된 항목은 건너뛴다.
+        """
+        cx0, cy0, cx1, cy1 = self._cell_range(bbox)
+        candidates: Set[str] = set()
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self._cells):
+            # 조회 범위가 등록된 칸 수보다 넓으면 칸 목록을 직접 훑음
+            for (cx, cy), keys in list(self._cells.items()):
+                if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    candidates.update(keys)
+        else:
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    keys = self._cells.get((cx, cy))
+                    if keys:
+                        candidates.update(keys)
+        candidates.update(set(self._oversized))
+        items = self._items
+        result = set()
+        for key in candidates:
+            item = items.get(key)
+            if item is not None and bbox_intersects(item, bbox):
+                result.add(key)
+        return result
+
+    def get(self, key: str) -> Optional[BBox]:
+        return self._items.get(key)
+
+    def clear(self):
+        self._cells.clear()
+        self._items.clear()
+        self._oversized.clear()
+
+    def rebuild(self, items: Iterable[Tuple[str, BBox]]):
+        self.clear()
+        for key, bbox in items:
+            self.insert(key, bbox)
+
+    def __len__(self) -> int:
+        return len(self._items)
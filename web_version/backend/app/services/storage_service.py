@@ -0,0 +1,387 @@
+import json
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from threading import Lock, get_ident
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..models.path_models import Node, Link
+from ..utils.json_stream import PathDocumentValidator
+from ..utils.serialization import RecordEncodingCache
+
+SQLITE_EXTENSIONS = (".sqlite", ".db")
+SUPPORTED_EXTENSIONS = (".json",) + SQLITE_EXTENSIONS
+# 진행률을 보고하며 읽을 때의 청크 크기 (바이트)
+READ_CHUNK_SIZE = 1024 * 1024
+
+# 레코드당 메모리 사용량 추정치 (pydantic 모델 + 문자열 필드, 바이트)
+NODE_MEMORY_ESTIMATE = 3000
+LINK_MEMORY_ESTIMATE = 3500
+
+
+def file_signature(path: str) -> Tuple:
+    """변경 감지용 (mtime, 크기) (SQLite는 WAL 파일까지 포함)"""
+    stat = os.stat(path)
+    signature = [stat.st_mtime_ns, stat.st_size]
+    if path.endswith(SQLITE_EXTENSIONS):
+        try:
+            wal = os.stat(path + "-wal")
+            signature += [wal.st_mtime_ns, wal.st_size]
+        except FileNotFoundError:
+            pass
+    return tuple(signature)
+
+
+class PathStorage(ABC):
+    """경로 데이터 저장소 인터페이스
+
+    read/write_all은 전체 읽기/쓰기이며, write_through가 True인 저장소는 apply_delta로
+    PathService의 변경 델타를 받아 바뀐 레코드만 기록한다.
+    """
+
+    write_through = False
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @abstractmethod
+    def read(self, progress: Optional[Callable] = None) -> Tuple[List[Node], List[Link]]:
+        """전체 노드/링크 읽기 (progress(진행률, 메시지, **세부 값)로 읽은 양 보고)"""
+
+    @abstractmethod
+    def write_all(self, nodes: List[Node], links: List[Link]):
+        """전체 노드/링크 쓰기"""
+
+    def apply_delta(self, delta: Optional[dict], service):
+        """변경 델타 기록 (delta가 None이면 reset → 전체 다시 쓰기)"""
+        if delta is None:
+            self.write_all(service.current_nodes, service.current_links)
+
+    def close(self):
+        pass
+
+
+class JsonFileStorage(PathStorage):
+    """기존 data/path JSON 파일 형식 ({"Node": [...], "Link": [...]})"""
+
+    def read(self, progress: Optional[Callable] = None) -> Tuple[List[Node], List[Link]]:
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"File not found: {os.path.basename(self.path)}")
+        if progress is not None:
+            return self._read_streaming(progress)
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        # 새로운 노드 및 링크 파싱
+        new_nodes = [Node(**node_data) for node_data in data.get("Node", [])]
+        new_links = [Link(**link_data) for link_data in data.get("Link", [])]
+        return new_nodes, new_links
+
+    def _read_streaming(self, progress: Callable) -> Tuple[List[Node], List[Link]]:
+        """청크 단위 증분 파싱으로 읽으면서 청크마다 읽은 바이트/레코드 수 보고"""
+        name = os.path.basename(self.path)
+        total = os.path.getsize(self.path)
+        validator = PathDocumentValidator(keep_records=True)
+        with open(self.path, 'rb') as f:
+            for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b""):
+                validator.feed(chunk)
+                progress(validator.size / total if total else 1.0, f"Parsing {name}",
+                         bytes_parsed=validator.size, total_bytes=total,
+                         nodes_parsed=validator.counts["Node"], links_parsed=validator.counts["Link"])
+        validator.finish()
+        return validator.records["Node"], validator.records["Link"]
+
+    def write_all(self, nodes: List[Node], links: List[Link]):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        # Pydantic 모델을 dict로 변환
+        data = {
+            "Node": [node.dict() for node in nodes],
+            "Link": [link.dict() for link in links]
+        }
+
+        # 임시 파일에 쓴 뒤 교체하여 저장 도중 읽는 쪽이 깨진 파일을 보지 않도록 함
+        # (다른 워크스페이스/워커가 같은 파일을 동시에 저장해도 임시 파일이 겹치지 않게 이름을 구분)
+        tmp_path = f"{self.path}.{os.getpid()}.{get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    node_type INTEGER,
+    lat REAL,
+    lon REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_nodes_id ON nodes(id);
+CREATE TABLE IF NOT EXISTS links (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    from_id TEXT NOT NULL,
+    to_id TEXT NOT NULL,
+    link_type INTEGER,
+    length REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_links_id ON links(id);
+CREATE INDEX IF NOT EXISTS idx_links_from ON links(from_id);
+CREATE INDEX IF NOT EXISTS idx_links_to ON links(to_id);
+-- 이전 버전이 만든 노드 좌표 R*Tree (공간 조회는 PathService의 GridIndex가 담당하므로 사용하지 않음)
+DROP TABLE IF EXISTS node_rtree;
+"""
+
+
+def _encode(record) -> str:
+    data = record if isinstance(record, dict) else record.dict()
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+class SQLiteStorage(PathStorage):
+    """SQLite 저장소 (WAL 모드, ID/FromNodeID/ToNodeID 인덱스)
+
+    행 순서(seq)가 목록 순서이며 중복 ID는 PathService와 같이 먼저 나온 행을 기준으로 갱신한다.
+    """
+
+    write_through = True
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def read(self, progress: Optional[Callable] = None) -> Tuple[List[Node], List[Link]]:
+        with self._lock:
+            node_rows = self._conn.execute("SELECT data FROM nodes ORDER BY seq").fetchall()
+            link_rows = self._conn.execute("SELECT data FROM links ORDER BY seq").fetchall()
+        nodes = [Node(**json.loads(row[0])) for row in node_rows]
+        links = [Link(**json.loads(row[0])) for row in link_rows]
+        if progress is not None:
+            size = os.path.getsize(self.path)
+            progress(1.0, f"Parsing {os.path.basename(self.path)}", bytes_parsed=size, total_bytes=size,
+                     nodes_parsed=len(nodes), links_parsed=len(links))
+        return nodes, links
+
+    def write_all(self, nodes: List[Node], links: List[Link]):
+        with self._lock, self._transaction():
+            self._conn.execute("DELETE FROM nodes")
+            self._conn.execute("DELETE FROM links")
+            for node in nodes:
+                self._insert_node(node)
+            self._conn.executemany(
+                "INSERT INTO links (id, from_id, to_id, link_type, length, data) VALUES (?, ?, ?, ?, ?, ?)",
+                ((link.ID, link.FromNodeID, link.ToNodeID, link.LinkType, link.Length, _encode(link))
+                 for link in links)
+            )
+
+    def apply_delta(self, delta: Optional[dict], service):
+        if delta is None:
+            self.write_all(service.current_nodes, service.current_links)
+            return
+        with self._lock, self._transaction():
+            self._apply(delta, service)
+
+    def _apply(self, delta: dict, service):
+        kind = delta["t"]
+        if kind == "batch":
+            for change in delta["changes"]:
+                self._apply(change, service)
+        elif kind == "node_moved":
+            node = service.get_node_by_id(delta["id"])
+            if node is not None:
+                self._update_node(node)
+            for link_id in delta["lengths"]:
+                link = service.get_link_by_id(link_id)
+                if link is not None:
+                    self._update_link(link)
+        elif kind == "node_added":
+            self._insert_node(delta["node"])
+        elif kind == "node_deleted":
+            self._conn.execute("DELETE FROM nodes WHERE id = ?", (delta["id"],))
+            self._conn.execute("DELETE FROM links WHERE from_id = ? OR to_id = ?", (delta["id"], delta["id"]))
+        elif kind == "link_added":
+            link = delta["link"]
+            self._conn.execute(
+                "INSERT INTO links (id, from_id, to_id, link_type, length, data) VALUES (?, ?, ?, ?, ?, ?)",
+                (link["ID"], link["FromNodeID"], link["ToNodeID"], link["LinkType"], link["Length"], _encode(link))
+            )
+        elif kind == "link_deleted":
+            self._conn.execute("DELETE FROM links WHERE id = ?", (delta["id"],))
+
+    def _insert_node(self, node):
+        data = node if isinstance(node, dict) else node.dict()
+        lat, lon = data["GpsInfo"]["Lat"], data["GpsInfo"]["Long"]
+        self._conn.execute(
+            "INSERT INTO nodes (id, node_type, lat, lon, data) VALUES (?, ?, ?, ?, ?)",
+            (data["ID"], data["NodeType"], lat, lon, _encode(data))
+        )
+
+    def _update_node(self, node: Node):
+        row = self._conn.execute("SELECT MIN(seq) FROM nodes WHERE id = ?", (node.ID,)).fetchone()
+        if row is None or row[0] is None:
+            return
+        lat, lon = node.GpsInfo.Lat, node.GpsInfo.Long
+        self._conn.execute("UPDATE nodes SET node_type = ?, lat = ?, lon = ?, data = ? WHERE seq = ?",
+                           (node.NodeType, lat, lon, _encode(node), row[0]))
+
+    def _update_link(self, link: Link):
+        self._conn.execute(
+            "UPDATE links SET length = ?, data = ? WHERE seq = (SELECT MIN(seq) FROM links WHERE id = ?)",
+            (link.Length, _encode(link), link.ID)
+        )
+
+    @contextmanager
+    def _transaction(self):
+        """BEGIN/COMMIT 블록 (예외 시 ROLLBACK)"""
+        self._conn.execute("BEGIN")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_storage(path: str) -> PathStorage:
+    """파일 확장자에 맞는 저장소 반환 (.json 또는 .sqlite/.db)"""
+    if path.endswith(SQLITE_EXTENSIONS):
+        return SQLiteStorage(path)
+    if path.endswith(".json"):
+        return JsonFileStorage(path)
+    raise ValueError(f"Unsupported file type: {os.path.basename(path)}")
+
+
+def convert(source_path: str, target_path: str) -> Tuple[int, int]:
+    """저장소 간 변환 (JSON ↔ SQLite), (노드 수, 링크 수) 반환"""
+    if source_path.endswith(SQLITE_EXTENSIONS) and not os.path.exists(source_path):
+        raise FileNotFoundError(f"File not found: {os.path.basename(source_path)}")
+    source = open_storage(source_path)
+    target = open_storage(target_path)
+    try:
+        nodes, links = source.read()
+        target.write_all(nodes, links)
+        return len(nodes), len(links)
+    finally:
+        source.close()
+        target.close()
+
+
+def _clone_node(node: Node) -> Node:
+    """검사 없이 노드 얕은 복사 (위치 변경은 GpsInfo/UtmInfo를 제자리에서 수정하므로 함께 복사)"""
+    return node.model_copy(update={"GpsInfo": node.GpsInfo.model_copy(), "UtmInfo": node.UtmInfo.model_copy()})
+
+
+class PreloadedFileCache:
+    """시작 시 미리 읽어 둔 경로 파일 (프로세스 공용)
+
+    검사/파싱된 레코드와 레코드별 JSON 인코딩을 보관하여, 이 파일을 로드하는 워크스페이스는 다시 파싱하거나
+    인코딩하지 않는다. 워크스페이스는 레코드를 제자리에서 수정하므로 꺼낼 때마다 복사본을 넘기며,
+    파일이 바뀌면 (mtime, 크기)로 감지하여 다시 읽는다. 미리 로드하도록 지정한 파일만 보관하고,
+    보관량 추정치가 max_bytes를 넘는 파일은 보관하지 않는다 (워커 프로세스마다 따로 보관됨).
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: Dict[str, dict] = {}
+        self._lock = Lock()
+
+    @classmethod
+    def from_env(cls) -> "PreloadedFileCache":
+        """환경 변수로 설정값을 지정하여 생성"""
+        return cls(max_bytes=int(os.environ.get("PATH_PRELOAD_MAX_MB", "64")) * 1024 * 1024)
+
+    def _load(self, path: str, progress: Optional[Callable] = None) -> dict:
+        signature = file_signature(path)
+        storage = open_storage(path)
+        try:
+            nodes, links = storage.read(progress)
+        finally:
+            storage.close()
+        node_bytes = [node.model_dump_json().encode("utf-8") for node in nodes]
+        link_bytes = [link.model_dump_json().encode("utf-8") for link in links]
+        return {
+            "signature": signature,
+            "nodes": nodes,
+            "links": links,
+            "node_bytes": node_bytes,
+            "link_bytes": link_bytes,
+            "bytes": (len(nodes) * NODE_MEMORY_ESTIMATE + len(links) * LINK_MEMORY_ESTIMATE
+                      + sum(map(len, node_bytes)) + sum(map(len, link_bytes)))
+        }
+
+    def _store(self, key: str, entry: dict) -> bool:
+        """보관 (다른 파일과 합친 추정치가 max_bytes를 넘으면 보관하지 않고 False)"""
+        with self._lock:
+            others = sum(other["bytes"] for path, other in self._entries.items() if path != key)
+            if others + entry["bytes"] > self.max_bytes:
+                self._entries.pop(key, None)
+                return False
+            self._entries[key] = entry
+            return True
+
+    def preload(self, path: str, progress: Optional[Callable] = None) -> dict:
+        """파일을 읽어 보관하고 (노드 수, 링크 수, 추정 메모리) 요약 반환 (보관 한도를 넘으면 MemoryError)"""
+        # 레코드 인코딩만으로도 파일 크기만큼 차지하므로 한도보다 큰 파일은 파싱하지 않음
+        size = os.path.getsize(path)
+        if size > self.max_bytes:
+            raise MemoryError(self._over_limit(path, size))
+        entry = self._load(path, progress)
+        if not self._store(os.path.abspath(path), entry):
+            raise MemoryError(self._over_limit(path, entry["bytes"]))
+        return {"nodes": len(entry["nodes"]), "links": len(entry["links"]), "estimated_memory": entry["bytes"]}
+
+    def _over_limit(self, path: str, size: int) -> str:
+        return (f"{os.path.basename(path)} needs ~{size / (1024 * 1024):.1f} MB, "
+                f"exceeding PATH_PRELOAD_MAX_MB ({self.max_bytes / (1024 * 1024):.0f} MB)")
+
+    def read(self, storage: PathStorage, progress: Optional[Callable] = None,
+             encodings: Optional[RecordEncodingCache] = None) -> Tuple[List[Node], List[Link]]:
+        """storage 파일 읽기 (미리 읽어 둔 파일이면 복사본을 넘기고 encodings에 인코딩을 채움)"""
+        key = os.path.abspath(storage.path)
+        entry = self._entries.get(key)
+        if entry is None:
+            return storage.read(progress)
+        if entry["signature"] != file_signature(storage.path):
+            entry = self._load(storage.path, progress)
+            if not self._store(key, entry):
+                # 바뀐 파일이 한도를 넘으면 보관하지 않고 방금 읽은 레코드를 그대로 사용
+                if encodings is not None:
+                    encodings.seed(zip(entry["nodes"], entry["node_bytes"]))
+                    encodings.seed(zip(entry["links"], entry["link_bytes"]))
+                return entry["nodes"], entry["links"]
+
+        nodes = [_clone_node(node) for node in entry["nodes"]]
+        links = [link.model_copy() for link in entry["links"]]
+        if encodings is not None:
+            encodings.seed(zip(nodes, entry["node_bytes"]))
+            encodings.seed(zip(links, entry["link_bytes"]))
+        if progress is not None:
+            size = entry["signature"][1]
+            progress(1.0, f"Parsing {os.path.basename(storage.path)} (preloaded)", bytes_parsed=size,
+                     total_bytes=size, nodes_parsed=len(nodes), links_parsed=len(links))
+        return nodes, links
+
+    def estimated_memory(self) -> int:
+        """보관 중인 파일의 메모리 추정치 (바이트)"""
+        with self._lock:
+            return sum(entry["bytes"] for entry in self._entries.values())
+
+    def paths(self) -> List[str]:
+        return list(self._entries)
+
+
+# 미리 로드한 파일 (PATH_PRELOAD_FILES, 시작 시 warmup_service가 채움)
+preloaded_files = PreloadedFileCache.from_env()
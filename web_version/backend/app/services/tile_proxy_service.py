@@ -0,0 +1,332 @@
+import asyncio
+import os
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, get_ident
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .path_service import DEFAULT_DATA_DIR
+from .spatial_index import BBox
+from .tile_service import tiles_covering, validate_tile
+from ..utils.executor import run_blocking
+
+# 기본 배경 지도 타일 주소 ({z}/{x}/{y}는 타일 좌표, {key}는 VWORLD_API_KEY)
+DEFAULT_PROVIDERS = {
+    "vworld": "https://api.vworld.kr/req/wmts/1.0.0/{key}/Base/{z}/{y}/{x}.png",
+    "osm": "https://tile.openstreetmap.org/{z}/{x}/{y}.png",
+}
+# 데스크톱 버전(MapCanvas)에서 사용하던 키
+DEFAULT_VWORLD_KEY = "3FE232D2-4F55-336B-9BC9-011DE07A0459"
+
+# 일괄 다운로드를 금지하는 타일 정책의 제공자 (미리 받기 불가)
+NO_PREFETCH_PROVIDERS = ("osm",)
+
+# 용량 초과 시 이 비율까지 오래된 타일 제거 (매번 조금씩 지우지 않도록 여유를 둠)
+EVICT_LOW_WATERMARK = 0.9
+# 다른 워커가 쓴 타일도 반영하도록 이 횟수만큼 쓸 때마다 디렉토리를 다시 확인
+RESCAN_WRITES = 1000
+# 원본에 없는 타일(404)을 다시 요청하지 않는 시간 (초)
+MISSING_TTL = 300.0
+MISSING_MAX = 10000
+
+TILE_SUFFIX = ".tile"
+
+
+class TileUpstreamError(Exception):
+    """원본 타일 서버 요청 실패 (연결 오류, 시간 초과, 이미지가 아닌 응답)"""
+
+
+def tile_media_type(content: bytes) -> str:
+    """타일 내용으로 이미지 형식 판별"""
+    if content.startswith(b"\x89PNG"):
+        return "image/png"
+    if content.startswith(b"\xff\xd8"):
+        return "image/jpeg"
+    if content[:4] == b"RIFF" and content[8:12] == b"WEBP":
+        return "image/webp"
+    return "application/octet-stream"
+
+
+class TileProxyCache:
+    """배경 지도 타일 프록시 캐시
+
+    원본 타일 서버(vworld 등)의 타일을 디스크에 저장하여 모든 클라이언트가 공유한다.
+      - 디렉토리: {cache_dir}/{provider}/{z}/{x}/{y}.tile (여러 워커/파드가 같은 디렉토리를 써도 됨)
+      - 용량(max_bytes)을 넘으면 마지막 사용 시각(atime, 적중 시 직접 갱신) 순으로 오래된 타일 제거
+      - 저장 후 ttl이 지난 타일은 다시 받으며, 원본 요청이 실패하면 이전 타일을 그대로 사용
+      - 같은 타일에 대한 동시 요청은 원본 요청 하나를 함께 기다림 (워커 프로세스 단위)
+    원본 요청은 파일 I/O 스레드 풀과 별도의 스레드 풀에서 수행한다.
+    """
+
+    def __init__(self, cache_dir: str, providers: Optional[Dict[str, str]] = None,
+                 max_bytes: int = 512 * 1024 * 1024, ttl: float = 30 * 86400.0, timeout: float = 10.0,
+                 fetch_workers: int = 8, prefetch_max: int = 5000, api_key: str = DEFAULT_VWORLD_KEY):
+        self.cache_dir = cache_dir
+        self.providers = dict(providers or DEFAULT_PROVIDERS)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.timeout = timeout
+        self.fetch_workers = fetch_workers
+        self.prefetch_max = prefetch_max
+        self.api_key = api_key
+        self.user_agent = "SCV-PathEditor tile proxy"
+        self._executor = ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix="tile-fetch")
+        self._inflight: Dict[Tuple, asyncio.Task] = {}
+        self._missing: Dict[Tuple, float] = {}
+        self._lock = Lock()
+        self._bytes: Optional[int] = None  # 마지막 확인 이후 추정 용량 (처음 쓸 때 확인)
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.upstream_errors = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "TileProxyCache":
+        """환경 변수로 설정값을 지정하여 생성
+
+        TILE_UPSTREAM_<PROVIDER>로 제공자별 원본 주소를 바꾸거나 새 제공자를 추가할 수 있다
+        (예: TILE_UPSTREAM_VWORLD=http://127.0.0.1:8001/{z}/{x}/{y}.png).
+        """
+        providers = dict(DEFAULT_PROVIDERS)
+        for name, value in os.environ.items():
+            if name.startswith("TILE_UPSTREAM_") and value:
+                providers[name[len("TILE_UPSTREAM_"):].lower()] = value
+        data_dir = os.environ.get("PATH_DATA_DIR") or DEFAULT_DATA_DIR
+        return cls(
+            cache_dir=os.environ.get("TILE_CACHE_DIR") or os.path.join(data_dir, ".tile_cache"),
+            providers=providers,
+            max_bytes=int(os.environ.get("TILE_CACHE_MB", "512")) * 1024 * 1024,
+            ttl=float(os.environ.get("TILE_CACHE_TTL_DAYS", "30")) * 86400.0,
+            timeout=float(os.environ.get("TILE_FETCH_TIMEOUT", "10")),
+            fetch_workers=int(os.environ.get("TILE_FETCH_WORKERS", "8")),
+            prefetch_max=int(os.environ.get("TILE_PREFETCH_MAX", "5000")),
+            api_key=os.environ.get("VWORLD_API_KEY") or DEFAULT_VWORLD_KEY
+        )
+
+    def _check(self, provider: str, z: int, x: int, y: int):
+        if provider not in self.providers:
+            raise ValueError(f"Unknown tile provider {provider} (available: {', '.join(sorted(self.providers))})")
+        validate_tile(z, x, y)
+
+    def tile_path(self, provider: str, z: int, x: int, y: int) -> str:
+        return os.path.join(self.cache_dir, provider, str(z), str(x), f"{y}{TILE_SUFFIX}")
+
+    async def get(self, provider: str, z: int, x: int, y: int) -> Tuple[bytes, str]:
+        """(타일 내용, 캐시 상태) 반환 (상태: hit, miss, stale)
+
+        원본에 없는 타일은 FileNotFoundError, 원본 요청 실패는 TileUpstreamError (이전 타일이 있으면 stale로 반환).
+        """
+        self._check(provider, z, x, y)
+        # 디스크 읽기는 원본 요청이 밀려 있어도 기다리지 않도록 파일 I/O 스레드 풀에서 수행
+        cached = await run_blocking(self._read, self.tile_path(provider, z, x, y))
+        if cached is not None and cached[1]:
+            self.hits += 1
+            return cached[0], "hit"
+
+        self.misses += 1
+        try:
+            return await self._fetch_shared(provider, z, x, y), "miss"
+        except TileUpstreamError:
+            if cached is None:
+                raise
+            return cached[0], "stale"
+
+    async def _fetch_shared(self, provider: str, z: int, x: int, y: int) -> bytes:
+        """같은 타일의 원본 요청은 하나만 수행하고 동시 요청은 그 결과를 함께 기다림"""
+        key = (provider, z, x, y)
+        expires = self._missing.get(key)
+        if expires is not None:
+            if expires > time.monotonic():
+                raise FileNotFoundError(f"Tile {provider}/{z}/{x}/{y} not found upstream")
+            del self._missing[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            loop = asyncio.get_running_loop()
+            task = loop.create_task(self._run_fetch(key))
+            self._inflight[key] = task
+            # 기다리던 요청이 모두 끊겨도 받은 타일은 저장되도록 요청과 별개의 태스크로 실행
+            task.add_done_callback(lambda done: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    async def _run_fetch(self, key: Tuple) -> bytes:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, self._fetch, *key)
+        except FileNotFoundError:
+            if len(self._missing) >= MISSING_MAX:
+                self._missing.clear()
+            self._missing[key] = time.monotonic() + MISSING_TTL
+            raise
+        except TileUpstreamError:
+            self.upstream_errors += 1
+            raise
+
+    def _read(self, path: str) -> Optional[Tuple[bytes, bool]]:
+        """(내용, ttl 이내 여부) 반환 (없으면 None), 마지막 사용 시각 갱신"""
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+                modified = os.fstat(f.fileno()).st_mtime
+            now = time.time()
+            # noatime 마운트에서도 LRU가 동작하도록 atime을 직접 갱신 (mtime은 저장 시각으로 유지)
+            os.utime(path, (now, modified))
+        except FileNotFoundError:
+            return None
+        return content, self.ttl <= 0 or now - modified < self.ttl
+
+    def _fetch(self, provider: str, z: int, x: int, y: int) -> bytes:
+        """원본 서버에서 타일을 받아 저장 (스레드 풀에서 실행)"""
+        url = self.providers[provider].format(z=z, x=x, y=y, key=self.api_key)
+        request = urllib.request.Request(url, headers={"User-Agent": self.user_agent})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                content_type = response.headers.get("Content-Type", "")
+                content = response.read()
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                raise FileNotFoundError(f"Tile {provider}/{z}/{x}/{y} not found upstream")
+            raise TileUpstreamError(f"Upstream {provider} returned HTTP {e.code}")
+        except (urllib.error.URLError, OSError) as e:
+            raise TileUpstreamError(f"Upstream {provider} request failed: {e}")
+        # 키 오류 등은 200과 함께 XML/HTML 본문으로 오므로 저장하지 않음
+        if not content or not content_type.startswith("image/"):
+            raise TileUpstreamError(f"Upstream {provider} returned non-image content ({content_type or 'empty'})")
+
+        path = self.tile_path(provider, z, x, y)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        self._account(len(content))
+        return content
+
+    def _account(self, size: int):
+        """저장한 용량을 더하고, 한도를 넘었거나 오래 확인하지 않았으면 디렉토리를 확인하여 제거"""
+        with self._lock:
+            self._writes += 1
+            if self._bytes is not None:
+                self._bytes += size
+            if self._bytes is None or self._bytes > self.max_bytes or self._writes >= RESCAN_WRITES:
+                self._evict()
+
+    def _evict(self):
+        """디렉토리 전체 용량을 다시 계산하고 한도를 넘으면 오래 사용되지 않은 타일부터 제거 (잠금 하에서 호출)"""
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(TILE_SUFFIX):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_atime, stat.st_size, path))
+                total += stat.st_size
+
+        if total > self.max_bytes:
+            target = self.max_bytes * EVICT_LOW_WATERMARK
+            entries.sort()
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                    self.evictions += 1
+                except FileNotFoundError:
+                    pass  # 다른 워커가 먼저 제거
+                total -= size
+        self._bytes = total
+        self._writes = 0
+
+    def prefetch_plan(self, provider: str, bbox: BBox, min_zoom: int, max_zoom: int) -> List[Tuple[int, int, int]]:
+        """bbox를 덮는 min_zoom~max_zoom 타일 목록 (prefetch_max를 넘으면 ValueError)"""
+        if provider in NO_PREFETCH_PROVIDERS:
+            raise ValueError(f"Tile provider {provider} does not allow bulk downloads")
+        self._check(provider, min_zoom, 0, 0)
+        self._check(provider, max_zoom, 0, 0)
+        if min_zoom > max_zoom:
+            raise ValueError("min_zoom must not be greater than max_zoom")
+        tiles = []
+        for z in range(min_zoom, max_zoom + 1):
+            for x, y in tiles_covering(bbox, z):
+                tiles.append((z, x, y))
+                if len(tiles) > self.prefetch_max:
+                    raise ValueError(
+                        f"Prefetch would request more than {self.prefetch_max} tiles; lower max_zoom or the bbox")
+        return tiles
+
+    def uncached(self, provider: str, tiles: List[Tuple[int, int, int]]) -> List[Tuple[int, int, int]]:
+        """디스크 캐시에 없거나 ttl이 지난 타일만 반환 (스레드 풀에서 실행, 사용 시각은 갱신하지 않음)"""
+        now = time.time()
+        missing = []
+        for z, x, y in tiles:
+            try:
+                modified = os.stat(self.tile_path(provider, z, x, y)).st_mtime
+            except FileNotFoundError:
+                missing.append((z, x, y))
+                continue
+            if self.ttl > 0 and now - modified >= self.ttl:
+                missing.append((z, x, y))
+        return missing
+
+    async def prefetch(self, provider: str, tiles: List[Tuple[int, int, int]],
+                       progress: Optional[Callable] = None) -> dict:
+        """타일을 미리 받아 캐시에 저장 (이미 있는 타일은 건너뜀, 원본 요청은 fetch_workers개씩 동시에)"""
+        counts = {"tiles": len(tiles), "cached": 0, "fetched": 0, "missing": 0, "failed": 0}
+        pending = iter(tiles)
+        done = 0
+
+        async def worker():
+            nonlocal done
+            for z, x, y in pending:
+                try:
+                    _, status = await self.get(provider, z, x, y)
+                    counts["cached" if status == "hit" else "fetched"] += 1
+                except FileNotFoundError:
+                    counts["missing"] += 1
+                except TileUpstreamError:
+                    counts["failed"] += 1
+                done += 1
+                if progress is not None:
+                    progress(done / len(tiles), f"Prefetching {provider} tiles", tiles_done=done, **counts)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(min(self.fetch_workers, len(tiles)))]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            # 취소(작업 취소 포함) 시 나머지 작업도 중단
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+        return counts
+
+    def stats(self) -> Tuple[int, int]:
+        return self.hits, self.misses
+
+    def info(self) -> dict:
+        return {
+            "providers": sorted(self.providers),
+            "cache_dir": self.cache_dir,
+            "max_bytes": self.max_bytes,
+            "estimated_bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "upstream_errors": self.upstream_errors,
+            "evictions": self.evictions,
+            "in_flight": len(self._inflight)
+        }
+
+    def close(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,118 @@
+import math
+from typing import Dict, Iterator, List, Tuple
+
+from .spatial_index import BBox
+
+# 타일 내부 정수 좌표 범위 (벡터 타일 관례와 동일하게 0..4096)
+TILE_EXTENT = 4096
+MAX_ZOOM = 24
+# 이 줌 이상에서는 노드/링크를 솎아내지 않고 모두 포함
+FULL_DETAIL_ZOOM = 18
+# 저배율 타일에서 정점을 병합하는 격자 해상도 (타일 한 변당 칸 수)
+DECIMATION_GRID = 256
+
+NODE_FIELDS = ("ID", "x", "y", "NodeType")
+LINK_FIELDS = ("ID", "x1", "y1", "x2", "y2", "LinkType")
+
+# Web Mercator에서 표현 가능한 위도 한계
+MAX_LATITUDE = 85.0511287798
+
+
+def validate_tile(z: int, x: int, y: int):
+    """타일 좌표 범위 검사 (잘못되면 ValueError)"""
+    if not 0 <= z <= MAX_ZOOM:
+        raise ValueError(f"Zoom must be between 0 and {MAX_ZOOM}")
+    n = 1 << z
+    if not (0 <= x < n and 0 <= y < n):
+        raise ValueError(f"Tile {z}/{x}/{y} is out of range")
+
+
+def lonlat_to_tile(lon: float, lat: float, z: int) -> Tuple[float, float]:
+    """경위도를 줌 z의 실수 타일 좌표로 변환 (slippy map 규칙)"""
+    lat = max(-MAX_LATITUDE, min(MAX_LATITUDE, lat))
+    n = 1 << z
+    tx = (lon + 180.0) / 360.0 * n
+    lat_rad = math.radians(lat)
+    ty = (1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n
+    return tx, ty
+
+
+def tile_bbox(z: int, x: int, y: int) -> BBox:
+    """타일의 경위도 bbox (minLon, minLat, maxLon, maxLat)"""
+    n = 1 << z
+
+    def lat_of(ty):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * ty / n))))
+
+    return x / n * 360.0 - 180.0, lat_of(y + 1), (x + 1) / n * 360.0 - 180.0, lat_of(y)
+
+
+def tile_range(bbox: BBox, z: int) -> Tuple[int, int, int, int]:
+    """bbox와 겹치는 줌 z의 타일 범위 (x0, y0, x1, y1, 양 끝 포함)"""
+    n = 1 << z
+    x0, y0 = lonlat_to_tile(bbox[0], bbox[3], z)
+    x1, y1 = lonlat_to_tile(bbox[2], bbox[1], z)
+    return max(0, int(x0)), max(0, int(y0)), min(n - 1, int(x1)), min(n - 1, int(y1))
+
+
+def tiles_covering(bbox: BBox, z: int) -> Iterator[Tuple[int, int]]:
+    """bbox와 겹치는 줌 z의 타일 (x, y) 목록"""
+    x0, y0, x1, y1 = tile_range(bbox, z)
+    for tx in range(x0, x1 + 1):
+        for ty in range(y0, y1 + 1):
+            yield tx, ty
+
+
+def build_tile(z: int, x: int, y: int, nodes, links, nodes_by_id: Dict) -> dict:
+    """타일 범위의 노드/링크를 타일 내부 정수 좌표 배열로 인코딩
+
+    FULL_DETAIL_ZOOM 미만에서는 DECIMATION_GRID 칸 단위로 정점을 스냅하여
+    같은 칸의 노드는 하나만 남기고, 한 칸으로 수렴하거나 겹치는 링크는 제거한다.
+    """
+    decimate = z < FULL_DETAIL_ZOOM
+    step = TILE_EXTENT // DECIMATION_GRID
+
+    def to_tile(gps):
+        tx, ty = lonlat_to_tile(gps.Long, gps.Lat, z)
+        px = int(round((tx - x) * TILE_EXTENT))
+        py = int(round((ty - y) * TILE_EXTENT))
+        if decimate:
+            px = px // step * step
+            py = py // step * step
+        return px, py
+
+    node_rows: List[list] = []
+    seen_cells = set()
+    for node in nodes:
+        px, py = to_tile(node.GpsInfo)
+        if decimate:
+            if (px, py) in seen_cells:
+                continue
+            seen_cells.add((px, py))
+        node_rows.append([node.ID, px, py, node.NodeType])
+
+    link_rows: List[list] = []
+    seen_segments = set()
+    for link in links:
+        # 타일 생성 도중 삭제된 노드의 링크는 건너뜀 (잠금 없이 생성하며, 이 경우 타일은 캐시되지 않음)
+        a, b = nodes_by_id.get(link.FromNodeID), nodes_by_id.get(link.ToNodeID)
+        if a is None or b is None:
+            continue
+        p1 = to_tile(a.GpsInfo)
+        p2 = to_tile(b.GpsInfo)
+        if decimate:
+            segment = (p1, p2) if p1 <= p2 else (p2, p1)
+            if p1 == p2 or segment in seen_segments:
+                continue
+            seen_segments.add(segment)
+        link_rows.append([link.ID, p1[0], p1[1], p2[0], p2[1], link.LinkType])
+
+    return {
+        "z": z, "x": x, "y": y,
+        "extent": TILE_EXTENT,
+        "decimated": decimate,
+        "node_fields": list(NODE_FIELDS),
+        "link_fields": list(LINK_FIELDS),
+        "nodes": node_rows,
+        "links": link_rows
+    }
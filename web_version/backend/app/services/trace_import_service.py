@@ -0,0 +1,149 @@
+import math
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import utm
+
+# (위도, 경도, 고도)
+TracePoint = Tuple[float, float, float]
+
+_LAT_COLUMNS = ("lat", "latitude")
+_LON_COLUMNS = ("lon", "long", "lng", "longitude")
+_ALT_COLUMNS = ("alt", "altitude", "height", "elevation")
+
+
+def _nmea_to_degrees(value: str, hemisphere: str) -> float:
+    """NMEA ddmm.mmmm 형식을 십진 도 단위로 변환"""
+    raw = float(value)
+    degrees = int(raw // 100)
+    result = degrees + (raw - degrees * 100) / 60.0
+    return -result if hemisphere in ("S", "W") else result
+
+
+def _parse_nmea(line: str) -> Optional[TracePoint]:
+    """GGA/RMC 문장에서 좌표 추출 (측위 실패 문장은 무시)"""
+    fields = line.split("*", 1)[0].split(",")
+    sentence = fields[0][3:]
+    try:
+        if sentence == "GGA" and len(fields) > 9 and fields[6] not in ("", "0"):
+            alt = float(fields[9]) if fields[9] else 0.0
+            return _nmea_to_degrees(fields[2], fields[3]), _nmea_to_degrees(fields[4], fields[5]), alt
+        if sentence == "RMC" and len(fields) > 6 and fields[2] == "A":
+            return _nmea_to_degrees(fields[3], fields[4]), _nmea_to_degrees(fields[5], fields[6]), 0.0
+    except ValueError:
+        return None
+    return None
+
+
+def iter_trace_points(lines: Iterable[str]) -> Iterator[TracePoint]:
+    """CSV(lat/lon[/alt] 헤더) 또는 NMEA 형식 GPS 트레이스를 한 줄씩 파싱"""
+    columns = None
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("$"):
+            point = _parse_nmea(line)
+            if point:
+                yield point
+            continue
+        
+        cells = [cell.strip() for cell in line.split(",")]
+        if columns is None:
+            header = [cell.lower() for cell in cells]
+            lat_col = next((header.index(c) for c in _LAT_COLUMNS if c in header), None)
+            lon_col = next((header.index(c) for c in _LON_COLUMNS if c in header), None)
+            alt_col = next((header.index(c) for c in _ALT_COLUMNS if c in header), None)
+            if lat_col is not None and lon_col is not None:
+                columns = (lat_col, lon_col, alt_col)
+                continue
+            # 헤더가 없으면 lat,lon[,alt] 순서로 간주
+            columns = (0, 1, 2 if len(cells) > 2 else None)
+        
+        lat_col, lon_col, alt_col = columns
+        try:
+            alt = float(cells[alt_col]) if alt_col is not None and cells[alt_col] else 0.0
+            yield float(cells[lat_col]), float(cells[lon_col]), alt
+        except (ValueError, IndexError):
+            continue
+
+
+def iter_chunks(points: Iterator[TracePoint], chunk_size: int) -> Iterator[np.ndarray]:
+    """포인트 스트림을 (N, 3) 배열 청크로 묶기"""
+    buffer: List[TracePoint] = []
+    for point in points:
+        buffer.append(point)
+        if len(buffer) >= chunk_size:
+            yield np.array(buffer, dtype=np.float64)
+            buffer = []
+    if buffer:
+        yield np.array(buffer, dtype=np.float64)
+
+
+class TraceDecimator:
+    """거리/방향 변화 임계값으로 트레이스 포인트를 노드 후보로 솎아내기
+
+    청크 단위로 UTM 변환을 일괄 수행하고, 마지막으로 채택한 점의 상태만 유지하므로
+    트레이스 길이와 관계없이 메모리 사용량이 일정하다.
+    """
+
+    def __init__(self, min_distance: float, heading_threshold_deg: float):
+        self.min_distance = min_distance
+        self.heading_threshold = math.radians(heading_threshold_deg)
+        self.zone: Optional[Tuple[int, str]] = None
+        self.last_kept = None   # (easting, northing)
+        self.last_heading: Optional[float] = None
+        self.pending = None     # 채택되지 않은 마지막 점 (트레이스 끝 처리용)
+        self.points_read = 0
+
+    def feed(self, chunk: np.ndarray) -> List[tuple]:
+        """청크를 처리하고 채택된 (lat, lon, alt, easting, northing) 목록 반환"""
+        self.points_read += len(chunk)
+        lats, lons = chunk[:, 0], chunk[:, 1]
+        if self.zone is None:
+            _, _, zone_number, zone_letter = utm.from_latlon(lats[0], lons[0])
+            self.zone = (zone_number, zone_letter)
+        eastings, northings, _, _ = utm.from_latlon(
+            lats, lons, force_zone_number=self.zone[0], force_zone_letter=self.zone[1]
+        )
+        
+        kept = []
+        for i in range(len(chunk)):
+            e, n = float(eastings[i]), float(northings[i])
+            record = (float(lats[i]), float(lons[i]), float(chunk[i, 2]), e, n)
+            if self.last_kept is None:
+                kept.append(record)
+                self.last_kept = (e, n)
+                self.pending = None
+                continue
+            
+            dx, dy = e - self.last_kept[0], n - self.last_kept[1]
+            dist = math.hypot(dx, dy)
+            if dist == 0:
+                continue
+            heading = math.atan2(dy, dx)
+            turned = False
+            if self.last_heading is not None:
+                diff = abs((heading - self.last_heading + math.pi) % (2 * math.pi) - math.pi)
+                # 방향 변화는 최소 간격의 일부 이상 이동했을 때만 판단 (GPS 잡음 방지)
+                turned = diff >= self.heading_threshold and dist >= self.min_distance * 0.25
+            
+            if dist >= self.min_distance or turned:
+                kept.append(record)
+                self.last_kept = (e, n)
+                self.last_heading = heading
+                self.pending = None
+            else:
+                self.pending = record
+        return kept
+
+    def finish(self) -> List[tuple]:
+        """트레이스 마지막 점이 채택되지 않았으면 추가"""
+        if self.pending is None:
+            return []
+        record, self.pending = self.pending, None
+        return [record]
+
+    @property
+    def zone_name(self) -> str:
+        return f"{self.zone[0]}{self.zone[1]}" if self.zone else ""
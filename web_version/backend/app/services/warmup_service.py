@@ -0,0 +1,98 @@
+import gc
+import os
+import time
+from typing import Dict, List, Optional
+
+from .catalog_service import FileCatalog
+from .path_service import PathService
+from .storage_service import preloaded_files
+from .workspace_service import WorkspaceManager
+from ..utils.executor import run_blocking
+from ..utils.http_cache import PrecompressedFileCache
+
+
+class WarmStart:
+    """시작 시 자주 쓰는 파일/워크스페이스를 미리 읽어 캐시를 채운 뒤 준비 완료(/ready)로 전환
+
+    순서:
+      1. 지정한 경로 파일 파싱/검사 및 레코드 인코딩 (이후 로드는 복사만 수행)
+      2. 다운로드용 파일 해시 ETag 계산
+      3. 파일 카탈로그(/files?detail=true) 갱신
+      4. 공유 모드에서 최근 변경된 워크스페이스 복원 (첫 요청 시 인계)
+
+    준비 상태는 워커 프로세스별이다. 한 단계가 실패해도 나머지는 계속하며 오류는 info()에 남긴다.
+    """
+
+    def __init__(self, workspace_manager: WorkspaceManager, file_catalog: FileCatalog,
+                 file_cache: PrecompressedFileCache, files: Optional[List[str]] = None, workspaces: int = 0):
+        self.workspace_manager = workspace_manager
+        self.file_catalog = file_catalog
+        self.file_cache = file_cache
+        self.files = files or []
+        self.workspaces = workspaces
+        self.ready = False
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.preloaded: Dict[str, dict] = {}
+        self.errors: Dict[str, str] = {}
+        self.workspaces_preloaded = 0
+
+    @classmethod
+    def from_env(cls, workspace_manager: WorkspaceManager, file_catalog: FileCatalog,
+                 file_cache: PrecompressedFileCache) -> "WarmStart":
+        """환경 변수로 설정값을 지정하여 생성
+
+        PATH_PRELOAD_FILES: 미리 로드할 파일 이름 (쉼표 구분, "*"이면 data 디렉토리의 모든 경로 파일)
+        PATH_PRELOAD_WORKSPACES: 공유 모드에서 미리 복원할 최근 워크스페이스 수
+        """
+        files = [name.strip() for name in os.environ.get("PATH_PRELOAD_FILES", "").split(",") if name.strip()]
+        return cls(workspace_manager, file_catalog, file_cache, files=files,
+                   workspaces=int(os.environ.get("PATH_PRELOAD_WORKSPACES", "0")))
+
+    def _file_names(self) -> List[str]:
+        if "*" in self.files:
+            return PathService(self.workspace_manager.data_dir).list_available_files()
+        return self.files
+
+    async def run(self):
+        """미리 로드 실행 (끝나면 오류 여부와 관계없이 준비 완료)"""
+        self.started_at = time.time()
+        try:
+            for name in self._file_names():
+                path = os.path.join(self.workspace_manager.data_dir, name)
+                try:
+                    self.preloaded[name] = await run_blocking(preloaded_files.preload, path)
+                    if name.endswith(".json"):
+                        await run_blocking(self.file_cache.etag, path)
+                except Exception as e:
+                    self.errors[name] = str(e)
+            if self.preloaded:
+                # 미리 읽은 레코드는 오래 유지되므로 전체 GC 대상에서 빼서, 로드 시 복사본을
+                # 만드는 동안 일어나는 GC가 보관 중인 레코드까지 매번 훑지 않도록 함 (GC 자체는 계속 동작)
+                gc.freeze()
+
+            try:
+                await run_blocking(self.file_catalog.refresh)
+            except Exception as e:
+                self.errors["catalog"] = str(e)
+
+            try:
+                self.workspaces_preloaded = await run_blocking(
+                    self.workspace_manager.preload_recent, self.workspaces)
+            except Exception as e:
+                self.errors["workspaces"] = str(e)
+        finally:
+            self.finished_at = time.time()
+            self.ready = True
+
+    def info(self) -> dict:
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = round((self.finished_at or time.time()) - self.started_at, 3)
+        return {
+            "ready": self.ready,
+            "elapsed_seconds": elapsed,
+            "files": self.preloaded,
+            "workspaces": self.workspaces_preloaded,
+            "errors": self.errors
+        }
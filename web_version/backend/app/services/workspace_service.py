@@ -0,0 +1,240 @@
+import asyncio
+import os
+import secrets
+import time
+from collections import OrderedDict
+from threading import RLock
+from typing import Dict, Optional
+
+from .path_service import PathService, DEFAULT_DATA_DIR
+from .shared_state import SharedWorkspaceStore, recent_workspace_keys, sweep_workspaces, workspace_key
+from .storage_service import preloaded_files
+from ..utils.executor import run_blocking
+
+# 공유 디렉토리 사용 표시/정리 주기 (초, PATH_SHARED_TTL_HOURS보다 충분히 짧아야 함)
+SHARED_SWEEP_INTERVAL = 3600.0
+
+
+class Workspace:
+    """세션 토큰별 편집 공간 (독립된 PathService 인스턴스)"""
+
+    def __init__(self, token: str, service: PathService):
+        self.token = token
+        self.service = service
+        self.created_at = time.time()
+        self.last_access = self.created_at
+        # 진행 중인 요청/백그라운드 작업 수 (WorkspaceManager.hold/unhold)
+        self.active = 0
+
+    @property
+    def in_use(self) -> bool:
+        """요청/작업이 진행 중이거나 쓰기 잠금이 잡혀 있으면 True (제거 대상에서 제외)"""
+        return self.active > 0 or self.service.write_lock.locked()
+
+    def info(self) -> dict:
+        return {
+            "token": self.token,
+            "nodes": len(self.service.current_nodes),
+            "links": len(self.service.current_links),
+            "graph_version": self.service.graph_version,
+            "estimated_memory": self.service.estimated_memory(),
+            "idle_seconds": round(time.time() - self.last_access, 1)
+        }
+
+
+class WorkspaceManager:
+    """세션 토큰별 워크스페이스 관리
+
+    최근 사용 순서(LRU)를 유지하며, 유휴 시간 초과/최대 개수 초과/메모리 예산 초과 시
+    가장 오래 사용되지 않은 워크스페이스부터 제거한다. 요청이나 백그라운드 작업이 진행 중이거나 쓰기 잠금이
+    잡혀 있는 워크스페이스는 제거하지 않는다 (hold/unhold로 사용 중 표시).
+
+    shared_dir이 있으면 공유 모드로 동작한다. 워크스페이스 상태는 그 디렉토리의 저널/스냅샷에 기록되고
+    각 워커의 PathService는 버전이 바뀌었을 때 따라잡는 캐시가 되므로, 여러 uvicorn 워커나 파드가
+    같은 디렉토리(공유 볼륨)를 쓰면 어느 워커로 요청이 가도 같은 상태를 본다.
+    """
+
+    def __init__(self, data_dir: Optional[str] = None, max_workspaces: int = 32,
+                 idle_timeout: float = 1800.0, memory_budget: int = 256 * 1024 * 1024,
+                 shared_dir: Optional[str] = None, sync_interval: float = 0.2, shared_ttl: float = 7 * 86400.0):
+        self.data_dir = data_dir or DEFAULT_DATA_DIR
+        self.shared_dir = shared_dir
+        self.sync_interval = sync_interval
+        self.shared_ttl = shared_ttl
+        self.shared_swept = 0
+        self._watcher: Optional[asyncio.Task] = None
+        self.max_workspaces = max_workspaces
+        self.idle_timeout = idle_timeout
+        self.memory_budget = memory_budget
+        self._workspaces: "OrderedDict[str, Workspace]" = OrderedDict()
+        # 시작 시 공유 디렉토리에서 미리 로드한 워크스페이스 (토큰 해시 -> PathService, 첫 요청 시 인계)
+        self._preloaded: Dict[str, PathService] = {}
+        self._lock = RLock()
+        self.evictions = 0
+        self._started = time.time()
+
+    @classmethod
+    def from_env(cls) -> "WorkspaceManager":
+        """환경 변수로 설정값을 지정하여 생성"""
+        return cls(
+            data_dir=os.environ.get("PATH_DATA_DIR"),
+            max_workspaces=int(os.environ.get("WORKSPACE_MAX", "32")),
+            idle_timeout=float(os.environ.get("WORKSPACE_IDLE_TIMEOUT", "1800")),
+            memory_budget=int(os.environ.get("WORKSPACE_MEMORY_BUDGET_MB", "256")) * 1024 * 1024,
+            shared_dir=os.environ.get("PATH_SHARED_DIR") or None,
+            sync_interval=float(os.environ.get("WORKSPACE_SYNC_INTERVAL_MS", "200")) / 1000.0,
+            shared_ttl=float(os.environ.get("PATH_SHARED_TTL_HOURS", "168")) * 3600.0
+        )
+
+    def get(self, token: str) -> PathService:
+        """토큰에 해당하는 워크스페이스의 PathService 반환 (없으면 생성)"""
+        with self._lock:
+            workspace = self._workspaces.get(token)
+            if workspace is None:
+                service = self._preloaded.pop(workspace_key(token), None) if self.shared_dir else None
+                if service is None:
+                    service = PathService(self.data_dir)
+                    if self.shared_dir:
+                        service.shared = SharedWorkspaceStore(self.shared_dir, token)
+                workspace = Workspace(token, service)
+                self._workspaces[token] = workspace
+            workspace.last_access = time.time()
+            self._workspaces.move_to_end(token)
+            self._evict(keep=token)
+            return workspace.service
+
+    def hold(self, token: str) -> Workspace:
+        """요청/작업이 끝날 때까지 제거되지 않도록 워크스페이스를 사용 중으로 표시 (없으면 생성, 끝나면 unhold)"""
+        with self._lock:
+            self.get(token)
+            workspace = self._workspaces[token]
+            workspace.active += 1
+            return workspace
+
+    def unhold(self, workspace: Workspace):
+        with self._lock:
+            workspace.active -= 1
+
+    def preload_recent(self, count: int) -> int:
+        """공유 디렉토리에서 최근 변경된 워크스페이스를 최대 count개 미리 로드 (공유 모드 전용, 블로킹)
+
+        토큰은 알 수 없으므로 토큰 해시(디렉토리 이름)로 열어 두었다가, 해당 토큰의 첫 요청이 오면
+        스냅샷 복원과 캐시 생성이 끝난 PathService를 그대로 넘겨준다. 메모리 예산을 넘기면 중단한다.
+        반환값은 미리 로드한 워크스페이스 수.
+        """
+        if not self.shared_dir or count <= 0:
+            return 0
+        loaded = 0
+        for key in recent_workspace_keys(self.shared_dir)[:count]:
+            with self._lock:
+                if key in self._preloaded or any(
+                        ws.service.shared.key == key for ws in self._workspaces.values()):
+                    continue
+            service = PathService(self.data_dir)
+            service.shared = SharedWorkspaceStore(self.shared_dir, key=key)
+            service.sync_shared(False)
+            service.warm_caches()
+            with self._lock:
+                if self.total_memory() + service.estimated_memory() > self.memory_budget:
+                    service.shared.close()
+                    break
+                self._preloaded[key] = service
+            loaded += 1
+        return loaded
+
+    def release(self, token: str) -> bool:
+        """워크스페이스 명시적 해제 (공유 모드에서는 다른 워커도 빈 상태로 따라잡도록 공유 상태 초기화)"""
+        with self._lock:
+            released = self._workspaces.pop(token, None) is not None
+            if self.shared_dir:
+                self._preloaded.pop(workspace_key(token), None)
+        if self.shared_dir:
+            store = SharedWorkspaceStore(self.shared_dir, token)
+            store.acquire()
+            try:
+                released = released or store.read_version()[0] is not None
+                store.reset(secrets.token_hex(4))
+            finally:
+                store.release()
+                store.close()
+        return released
+
+    def get_workspace(self, token: str) -> Optional[Workspace]:
+        return self._workspaces.get(token)
+
+    def list_workspaces(self) -> Dict[str, Workspace]:
+        with self._lock:
+            return dict(self._workspaces)
+
+    def total_memory(self) -> int:
+        """워크스페이스와 미리 로드한 워크스페이스/파일의 메모리 추정치 합 (memory_budget과 비교)"""
+        return (sum(ws.service.estimated_memory() for ws in self._workspaces.values())
+                + sum(service.estimated_memory() for service in self._preloaded.values())
+                + preloaded_files.estimated_memory())
+
+    def _evict(self, keep: str):
+        """유휴/개수/메모리 기준에 따라 오래된 워크스페이스 제거"""
+        now = time.time()
+        # 미리 로드한 워크스페이스는 시작 시각 기준으로 유휴 시간을 적용하고, 메모리 예산 초과 시 먼저 제거
+        if self._preloaded and (now - self._started > self.idle_timeout or self.total_memory() > self.memory_budget):
+            self.evictions += len(self._preloaded)
+            self._preloaded.clear()
+        for token, workspace in list(self._workspaces.items()):
+            if token != keep and not workspace.in_use and now - workspace.last_access > self.idle_timeout:
+                del self._workspaces[token]
+                self.evictions += 1
+        
+        # OrderedDict 앞쪽이 가장 오래 사용되지 않은 항목 (현재 요청/사용 중인 워크스페이스는 건너뜀)
+        for token, workspace in list(self._workspaces.items()):
+            if len(self._workspaces) <= 1 or (
+                len(self._workspaces) <= self.max_workspaces and self.total_memory() <= self.memory_budget
+            ):
+                break
+            if token == keep or workspace.in_use:
+                continue
+            del self._workspaces[token]
+            self.evictions += 1
+
+    def start_watcher(self):
+        """공유 모드에서 변경 감시 시작 (이벤트 루프 안에서 호출)"""
+        if self.shared_dir and self._watcher is None:
+            self._watcher = asyncio.get_running_loop().create_task(self._watch())
+
+    def stop_watcher(self):
+        if self._watcher is not None:
+            self._watcher.cancel()
+            self._watcher = None
+
+    def sweep_shared(self) -> int:
+        """메모리에 있는 워크스페이스의 공유 디렉토리를 사용 중으로 표시하고, shared_ttl 동안 어느 워커도
+        사용하지 않은 디렉토리 삭제 (공유 모드 전용, 블로킹, 삭제한 수 반환)"""
+        with self._lock:
+            stores = [ws.service.shared for ws in self._workspaces.values()]
+            stores += [service.shared for service in self._preloaded.values()]
+        for store in stores:
+            store.touch()
+        removed = sweep_workspaces(self.shared_dir, self.shared_ttl, keep=[store.key for store in stores])
+        self.shared_swept += removed
+        return removed
+
+    async def _watch(self):
+        """델타 스트림 구독자가 있는 워크스페이스의 공유 버전을 주기적으로 확인하여 다른 워커의 변경을 전달
+
+        SHARED_SWEEP_INTERVAL마다 오래 사용되지 않은 공유 디렉토리도 정리한다.
+        """
+        last_sweep = 0.0
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            if time.time() - last_sweep > SHARED_SWEEP_INTERVAL:
+                last_sweep = time.time()
+                try:
+                    await run_blocking(self.sweep_shared)
+                except Exception as e:
+                    print(f"공유 디렉토리 정리 오류: {e}")
+            for workspace in self.list_workspaces().values():
+                if workspace.service.deltas.subscriber_count:
+                    try:
+                        await workspace.service.refresh()
+                    except Exception as e:
+                        # 로그에는 세션 토큰 대신 토큰 해시(공유 디렉토리 이름)를 남김
+                        print(f"공유 상태 동기화 오류 ({workspace_key(workspace.token)}): {e}")
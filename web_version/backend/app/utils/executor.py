@@ -0,0 +1,21 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+# 디스크 I/O 및 JSON 파싱/직렬화 전용 스레드 풀 (이벤트 루프 블로킹 방지)
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("PATH_IO_WORKERS", "4")),
+    thread_name_prefix="path-io"
+)
+
+
+async def run_blocking(func, *args, **kwargs):
+    """블로킹 함수를 제한된 스레드 풀에서 실행하고 결과를 기다림"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(func, *args, **kwargs))
+
+
+def shutdown_executor():
+    """서버 종료 시 스레드 풀 정리"""
+    _executor.shutdown(wait=False)
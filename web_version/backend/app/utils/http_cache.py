@@ -0,0 +1,152 @@
+import gzip
+import hashlib
+import os
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+from .lru_cache import LRUCache
+
+try:
+    import brotli
+except ImportError:  # brotli가 없으면 gzip만 사용
+    brotli = None
+
+# 이보다 작은 응답은 압축하지 않음 (바이트)
+COMPRESS_MIN_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def content_etag(content: bytes) -> str:
+    """내용 해시 기반 ETag"""
+    return '"' + hashlib.blake2b(content, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 ETag와 일치하는지 확인 (약한 비교, '*' 지원)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Accept-Encoding에서 사용할 압축 방식 선택 (br 우선, 없으면 gzip)"""
+    if not accept_encoding:
+        return None
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        accepted.add(name.strip().lower())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(content: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    return gzip.compress(content, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def not_modified(etag: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept-Encoding", **(headers or {})})
+
+
+# 메모리 응답의 압축 결과 캐시 ((캐시 키, 압축 방식) -> 바이트)
+_compressed_bodies = LRUCache(max_size=256)
+
+
+def compression_cache_stats() -> Tuple[int, int]:
+    """응답 압축 결과 캐시의 (적중, 실패) 횟수"""
+    return _compressed_bodies.hits, _compressed_bodies.misses
+
+
+def conditional_response(request: Request, content: bytes, media_type: str, etag: Optional[str] = None,
+                         cache_key: Optional[str] = None, headers: Optional[Dict[str, str]] = None) -> Response:
+    """ETag/If-None-Match 처리와 압축을 적용한 응답
+
+    etag를 생략하면 내용 해시를 사용한다. cache_key가 있으면 같은 키/ETag의 압축 결과를 재사용한다.
+    """
+    etag = etag or content_etag(content)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag, headers)
+
+    response_headers = {"ETag": etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache", **(headers or {})}
+    encoding = choose_encoding(request.headers.get("accept-encoding")) if len(content) >= COMPRESS_MIN_SIZE else None
+    if encoding:
+        key = (cache_key, etag, encoding) if cache_key else None
+        body = _compressed_bodies.get(key) if key else None
+        if body is None:
+            body = compress(content, encoding)
+            if key:
+                _compressed_bodies.put(key, body)
+        content = body
+        response_headers["Content-Encoding"] = encoding
+    return Response(content=content, media_type=media_type, headers=response_headers)
+
+
+class PrecompressedFileCache:
+    """디스크 파일의 내용 해시 ETag와 압축본 캐시
+
+    (mtime, 크기)가 바뀌지 않는 한 해시/압축을 다시 계산하지 않는다.
+    """
+
+    def __init__(self, max_files: int = 64):
+        self._entries = LRUCache(max_size=max_files)
+        self._lock = Lock()
+
+    @staticmethod
+    def signature(path: str) -> Tuple[int, int]:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _entry(self, path: str) -> dict:
+        signature = self.signature(path)
+        entry = self._entries.get(path)
+        if entry is None or entry["signature"] != signature:
+            with open(path, "rb") as f:
+                content = f.read()
+            entry = {"signature": signature, "etag": content_etag(content), "bodies": {}}
+            self._entries.put(path, entry)
+        return entry
+
+    def etag(self, path: str) -> str:
+        """파일 내용 해시 ETag (파일이 없으면 FileNotFoundError)"""
+        return self._entry(path)["etag"]
+
+    def lookup(self, path: str, encoding: Optional[str]) -> Tuple[str, Optional[bytes]]:
+        """(ETag, 압축본) 반환 (encoding이 없으면 압축본은 None)"""
+        entry = self._entry(path)
+        if not encoding:
+            return entry["etag"], None
+        with self._lock:
+            body = entry["bodies"].get(encoding)
+        if body is None:
+            with open(path, "rb") as f:
+                body = compress(f.read(), encoding)
+            # 압축 도중 파일이 바뀌었으면 캐시하지 않음
+            if self.signature(path) == entry["signature"]:
+                with self._lock:
+                    entry["bodies"][encoding] = body
+        return entry["etag"], body
+
+    def stats(self) -> Tuple[int, int]:
+        """파일 해시/압축본 캐시의 (적중, 실패) 횟수"""
+        return self._entries.hits, self._entries.misses
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,187 @@
+import codecs
+import hashlib
+import json
+from typing import Callable, Dict, Optional
+
+from pydantic import ValidationError
+
+from ..models.path_models import Node, Link
+
+# 레코드 하나(배열 요소)가 이보다 크면 잘못된 파일로 간주 (문자 수)
+MAX_RECORD_CHARS = 16 * 1024 * 1024
+# 디코딩 오류 위치가 버퍼 끝에서 이 안쪽이면 청크 경계에서 잘린 것일 수 있으므로 다음 청크를 기다림
+_TAIL_SLACK = 32
+_WHITESPACE = " \t\n\r"
+_RECORD_KEYS = ("Node", "Link")
+
+
+class PathDocumentValidator:
+    """{"Node": [...], "Link": [...]} 문서를 청크 단위로 받아 한 번만 파싱하며 검사하는 증분 검사기
+
+    최상위 키와 배열 요소(레코드) 하나씩만 메모리에 올리고, 레코드별 모델 검사, 레코드 수, 내용 해시
+    (http_cache.content_etag와 같은 값), 노드 GPS bbox를 함께 계산한다. 구조나 레코드가 잘못되면
+    해당 청크를 받는 즉시 ValueError를 낸다. keep_records이면 검사한 모델을 records에 모아 파일 로드에 사용한다.
+    """
+
+    def __init__(self, keep_records: bool = False):
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._hash = hashlib.blake2b(digest_size=16)
+        self._buffer = ""
+        self._offset = 0  # 버퍼 앞에서 버린 문자 수 (오류 위치 보고용)
+        self._state = "start"
+        self._key: Optional[str] = None
+        self._seen = set()
+        self.size = 0
+        self.counts: Dict[str, int] = {key: 0 for key in _RECORD_KEYS}
+        self.bbox: Optional[list] = None
+        self.records: Optional[Dict[str, list]] = {key: [] for key in _RECORD_KEYS} if keep_records else None
+
+    def feed(self, chunk: bytes):
+        """청크 추가 (완성된 토큰/레코드까지만 파싱하고 나머지는 다음 청크와 이어 붙임)"""
+        self.size += len(chunk)
+        self._hash.update(chunk)
+        try:
+            text = self._decoder.decode(chunk)
+        except UnicodeDecodeError as e:
+            raise ValueError(f"Invalid UTF-8 at byte {self.size - len(chunk) + e.start}")
+        self._buffer += text
+        self._parse(final=False)
+
+    def finish(self) -> dict:
+        """입력 종료 후 남은 내용을 검사하고 요약 반환"""
+        try:
+            self._buffer += self._decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            raise ValueError("Invalid UTF-8 at end of file")
+        self._parse(final=True)
+        if self._state != "done":
+            raise ValueError("Invalid JSON format: unexpected end of file")
+        missing = [key for key in _RECORD_KEYS if key not in self._seen]
+        if missing:
+            raise ValueError("Invalid JSON structure. Must contain 'Node' and 'Link' arrays")
+        return {
+            "nodes": self.counts["Node"],
+            "links": self.counts["Link"],
+            "size": self.size,
+            "etag": '"' + self._hash.hexdigest() + '"',
+            "bbox": self.bbox
+        }
+
+    def _parse(self, final: bool):
+        pos = 0
+        buffer = self._buffer
+        try:
+            while True:
+                while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                    pos += 1
+                if pos == len(buffer):
+                    break
+                char = buffer[pos]
+                state = self._state
+
+                if state == "start":
+                    self._expect(char, "{", pos)
+                    self._state = "first_key"
+                    pos += 1
+                elif state in ("first_key", "key"):
+                    if char == "}" and state == "first_key":
+                        self._state = "done"
+                        pos += 1
+                        continue
+                    self._expect(char, '"', pos)
+                    value, end = self._decode(buffer, pos, final)
+                    if end is None:
+                        break
+                    self._key, pos = value, end
+                    self._state = "colon"
+                elif state == "colon":
+                    self._expect(char, ":", pos)
+                    self._state = "value"
+                    pos += 1
+                elif state == "value":
+                    if self._key in _RECORD_KEYS:
+                        if char != "[":
+                            raise ValueError(f"'{self._key}' must be an array")
+                        self._seen.add(self._key)
+                        self._state = "first_item"
+                        pos += 1
+                        continue
+                    # 그 밖의 최상위 값은 통째로 건너뜀 (숫자는 다음 문자가 와야 끝났다고 판단)
+                    value, end = self._decode(buffer, pos, final)
+                    if end is None or (end == len(buffer) and not final):
+                        break
+                    pos = end
+                    self._state = "after_value"
+                elif state in ("first_item", "item"):
+                    if char == "]" and state == "first_item":
+                        self._state = "after_value"
+                        pos += 1
+                        continue
+                    self._expect(char, "{", pos, f"'{self._key}' items must be objects")
+                    record, end = self._decode(buffer, pos, final)
+                    if end is None:
+                        if len(buffer) - pos > MAX_RECORD_CHARS:
+                            raise ValueError(f"{self._key}[{self.counts[self._key]}] is too large")
+                        break
+                    self._check_record(record)
+                    pos = end
+                    self._state = "after_item"
+                elif state == "after_item":
+                    if char == ",":
+                        self._state = "item"
+                    elif char == "]":
+                        self._state = "after_value"
+                    else:
+                        self._expect(char, ",", pos)
+                    pos += 1
+                elif state == "after_value":
+                    if char == ",":
+                        self._state = "key"
+                    elif char == "}":
+                        self._state = "done"
+                    else:
+                        self._expect(char, ",", pos)
+                    pos += 1
+                else:
+                    raise ValueError(f"Invalid JSON format: extra data at character {self._offset + pos}")
+        finally:
+            self._offset += pos
+            self._buffer = buffer[pos:]
+
+    def _decode(self, buffer: str, pos: int, final: bool):
+        """pos에서 JSON 값 하나 디코딩 → (값, 끝 위치), 버퍼 끝에서 잘린 것이면 (None, None)"""
+        try:
+            return self._json.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            truncated = e.msg.startswith("Unterminated string") or e.pos >= len(buffer) - _TAIL_SLACK
+            if final or not truncated:
+                raise ValueError(f"Invalid JSON format: {e.msg} at character {self._offset + e.pos}")
+            return None, None
+
+    def _expect(self, char: str, expected: str, pos: int, message: Optional[str] = None):
+        if char != expected:
+            raise ValueError(message or f"Invalid JSON format: expected '{expected}' at character {self._offset + pos}")
+
+    def _check_record(self, record: dict):
+        """레코드를 모델로 검사하고 개수/bbox 갱신"""
+        key = self._key
+        index = self.counts[key]
+        model: Callable = Node if key == "Node" else Link
+        try:
+            item = model(**record)
+        except ValidationError as e:
+            error = e.errors()[0]
+            location = ".".join(str(part) for part in error["loc"])
+            raise ValueError(f"{key}[{index}].{location}: {error['msg']}")
+        self.counts[key] = index + 1
+        if self.records is not None:
+            self.records[key].append(item)
+        if key == "Node":
+            lon, lat = item.GpsInfo.Long, item.GpsInfo.Lat
+            if self.bbox is None:
+                self.bbox = [lon, lat, lon, lat]
+            else:
+                bbox = self.bbox
+                bbox[0], bbox[1] = min(bbox[0], lon), min(bbox[1], lat)
+                bbox[2], bbox[3] = max(bbox[2], lon), max(bbox[3], lat)
@@ -0,0 +1,58 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable, List, Optional
+
+
+class LRUCache:
+    """최대 개수 기반 LRU 캐시 (적중률 통계 포함)"""
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """키에 해당하는 값 반환 (최근 사용으로 갱신)"""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any):
+        """값 저장 후 최대 개수를 넘으면 가장 오래된 항목 제거"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """항목 제거"""
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        """모든 항목 제거"""
+        with self._lock:
+            self._data.clear()
+
+    def keys(self) -> List[Hashable]:
+        """현재 키 목록 복사본 (오래된 순)"""
+        with self._lock:
+            return list(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
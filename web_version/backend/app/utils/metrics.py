@@ -0,0 +1,306 @@
+import asyncio
+import bisect
+import os
+import time
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+# 요청/작업 시간 히스토그램 기본 구간 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Prometheus 텍스트 형식 (0.0.4)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 수집 함수가 반환하는 값: (이름, 설명, [(레이블, 값), ...]) 또는 종류를 붙인 (이름, 설명, [...], "counter")
+# 종류를 생략하면 게이지이며, 카운터 이름은 Prometheus 규칙대로 _total로 끝나야 한다
+Samples = List[Tuple[Dict[str, str], float]]
+CollectorSamples = Union[Tuple[str, str, Samples], Tuple[str, str, Samples, str]]
+COLLECTOR_KINDS = ("gauge", "counter")
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """증가만 하는 누적 값"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, key)} {_number(value)}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """현재 값 (증감 가능)"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[tuple, float] = {}
+
+    def set(self, value: float, *labels):
+        with self._lock:
+            self._values[labels] = value
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, key)} {_number(value)}" for key, value in items]
+
+
+class Histogram(_Metric):
+    """구간별 누적 개수/합계/개수 (레이블 조합마다 따로 집계)"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[tuple, list] = {}  # 레이블 -> [구간별 개수..., +Inf 개수, 합계]
+
+    def observe(self, value: float, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            entry[index] += 1
+            entry[-1] += value
+
+    def time(self, *labels) -> "_Timer":
+        """with 블록의 실행 시간을 기록"""
+        return _Timer(self, labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(entry)) for key, entry in self._values.items())
+        lines = self.header()
+        for key, entry in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), entry[:-1]):
+                cumulative += count
+                le = 'le="%s"' % _number(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(entry[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: tuple):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+
+
+class MetricsRegistry:
+    """프로세스 내 메트릭 모음
+
+    요청 시간처럼 그때그때 기록하는 메트릭과, 워크스페이스 크기처럼 /metrics 조회 시점에 계산하는
+    수집 함수(게이지/카운터 값 반환)를 함께 보관한다. 값은 워커 프로세스별로 따로 집계된다.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[CollectorSamples]]] = []
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            # 모듈이 다시 로드된 경우 기존 메트릭 재사용
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], Iterable[CollectorSamples]]):
+        """조회 시점에 게이지/카운터 값을 계산하는 함수 등록"""
+        self._collectors.append(collector)
+
+    def render(self) -> bytes:
+        """Prometheus 텍스트 형식으로 출력"""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines += metric.render()
+        for collector in self._collectors:
+            for name, documentation, samples, *kind in collector():
+                kind = kind[0] if kind else "gauge"
+                if kind not in COLLECTOR_KINDS:
+                    raise ValueError(f"Unsupported collector metric kind {kind} for {name}")
+                if kind == "counter" and not name.endswith("_total"):
+                    raise ValueError(f"Counter {name} must end with _total")
+                lines += [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+                for labels, value in samples:
+                    lines.append(f"{name}{_labels(labels.keys(), labels.values())} {_number(value)}")
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+# 기본 레지스트리 (서비스 모듈은 여기에 메트릭을 등록)
+registry = MetricsRegistry()
+
+REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route"))
+REQUESTS = registry.counter("http_requests_total", "HTTP requests by route template and status",
+                            ("method", "route", "status"))
+REQUESTS_IN_FLIGHT = registry.gauge("http_requests_in_flight", "HTTP requests currently being served")
+EVENT_LOOP_LAG = registry.histogram(
+    "event_loop_lag_seconds", "Delay of a periodic event loop wakeup beyond its schedule",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5))
+EVENT_LOOP_LAG_LAST = registry.gauge("event_loop_lag_last_seconds", "Most recent event loop lag sample")
+
+
+def _process_metrics() -> Iterable[CollectorSamples]:
+    """프로세스 CPU 시간/상주 메모리 (k8s requests/limits 산정용)"""
+    yield ("process_cpu_seconds_total", "Total user and system CPU time of this worker",
+           [({}, time.process_time())], "counter")
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        yield ("process_resident_memory_bytes", "Resident memory of this worker",
+               [({}, resident_pages * os.sysconf("SC_PAGE_SIZE"))])
+    except (OSError, ValueError, IndexError):
+        pass
+
+
+registry.add_collector(_process_metrics)
+
+
+class MetricsMiddleware:
+    """요청별 처리 시간과 동시 처리 중인 요청 수를 기록하는 ASGI 미들웨어
+
+    경로 레이블은 실제 URL이 아니라 라우트 템플릿(/api/path/nodes/{node_id})을 사용하여 값 종류가
+    라우트 수로 제한되도록 하며, 어떤 라우트에도 맞지 않은 요청은 "unmatched"로 묶는다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._routes: Dict[object, str] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+        REQUESTS_IN_FLIGHT.inc()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            # 라우터가 같은 scope에 매칭된 endpoint를 기록해 둠
+            route = self._route(scope)
+            REQUEST_DURATION.observe(time.perf_counter() - start, scope["method"], route)
+            REQUESTS.inc(scope["method"], route, status)
+
+    def _route(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        route = self._routes.get(endpoint)
+        if route is None:
+            route = "unmatched"
+            for candidate in scope["app"].routes:
+                if getattr(candidate, "endpoint", None) is endpoint:
+                    route = candidate.path
+                    break
+                if getattr(candidate, "app", None) is endpoint:
+                    # 정적 파일 마운트는 파일 경로와 관계없이 하나로 묶음
+                    route = f"mount:{candidate.name}"
+                    break
+            self._routes[endpoint] = route
+        return route
+
+
+class EventLoopMonitor:
+    """주기적으로 잠들었다 깨어나는 태스크로 이벤트 루프 지연(블로킹 작업 여부)을 측정"""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """이벤트 루프 안에서 호출"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - start - self.interval)
+            EVENT_LOOP_LAG.observe(lag)
+            EVENT_LOOP_LAG_LAST.set(lag)
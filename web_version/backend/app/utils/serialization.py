@@ -0,0 +1,80 @@
+import json
+from threading import Lock
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json 사용
+    orjson = None
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def dumps(data: Any) -> bytes:
+    """dict/list를 JSON 바이트로 직렬화 (orjson 우선)"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class RecordEncodingCache:
+    """레코드(pydantic 모델)별 JSON 인코딩 캐시
+
+    레코드 객체의 id를 키로 사용하며, 객체가 재사용된 id와 섞이지 않도록 원본 객체도 함께 보관한다.
+    레코드를 제자리에서 수정한 경우 반드시 invalidate를 호출해야 한다.
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, Tuple[BaseModel, bytes]] = {}
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def encode(self, record: BaseModel) -> bytes:
+        entry = self._entries.get(id(record))
+        if entry is not None and entry[0] is record:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        # pydantic 내장 직렬화기는 검증 없이 바로 JSON 바이트를 생성
+        encoded = record.model_dump_json().encode("utf-8")
+        with self._lock:
+            self._entries[id(record)] = (record, encoded)
+        return encoded
+
+    def encode_list(self, records: Iterable[BaseModel]) -> bytes:
+        """레코드 목록을 JSON 배열 바이트로 직렬화"""
+        return b"[" + b",".join(self.encode(record) for record in records) + b"]"
+
+    def seed(self, entries: Iterable[Tuple[BaseModel, bytes]]):
+        """이미 알고 있는 (레코드, 인코딩) 등록 (미리 로드한 파일의 복사본 등)"""
+        with self._lock:
+            for record, encoded in entries:
+                self._entries[id(record)] = (record, encoded)
+
+    def invalidate(self, record: BaseModel):
+        with self._lock:
+            self._entries.pop(id(record), None)
+
+    def prune(self, live_records: Iterable[BaseModel]):
+        """현재 목록에 없는 레코드의 인코딩 제거"""
+        live_ids = {id(record) for record in live_records}
+        with self._lock:
+            self._entries = {key: entry for key, entry in self._entries.items() if key in live_ids}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def encode_document(parts: Dict[str, bytes], extra: Optional[Dict[str, Any]] = None) -> bytes:
+    """미리 인코딩된 값(키 -> JSON 바이트)과 추가 필드로 JSON 객체 바이트 구성"""
+    items = [dumps(key) + b":" + value for key, value in parts.items()]
+    if extra:
+        items.extend(dumps(key) + b":" + dumps(value) for key, value in extra.items())
+    return b"{" + b",".join(items) + b"}"
@@ -1,9 +1,17 @@
+import asyncio
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 import os
 
-from app.api.path_api import router as path_router
+from app.api.path_api import router as path_router, workspace_manager, job_manager, warm_start
+from app.api.job_api import router as job_router
+from app.api.tile_api import router as tile_router, tile_proxy
+from app.api.metrics_api import router as metrics_router
+from app.utils.executor import shutdown_executor
+from app.utils.metrics import MetricsMiddleware, EventLoopMonitor
 
 # FastAPI 앱 생성
 app = FastAPI(
@@ -21,19 +29,51 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 라우트별 요청 시간/동시 요청 수 기록 (/metrics)
+app.add_middleware(MetricsMiddleware)
+
+# 이벤트 루프 지연 측정
+loop_monitor = EventLoopMonitor()
+
+@app.on_event("startup")
+async def on_startup():
+    """공유 모드에서 다른 워커의 변경 감시와 이벤트 루프 지연 측정, 미리 로드 시작"""
+    workspace_manager.start_watcher()
+    loop_monitor.start()
+    # 요청은 바로 받되 미리 로드가 끝날 때까지 /ready는 503
+    app.state.warm_start_task = asyncio.get_running_loop().create_task(warm_start.run())
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    """변경 감시/백그라운드 작업 중지 및 I/O·타일 요청 스레드 풀 정리"""
+    workspace_manager.stop_watcher()
+    loop_monitor.stop()
+    job_manager.shutdown()
+    tile_proxy.close()
+    shutdown_executor()
+
 # API 라우터 등록
 app.include_router(path_router)
+app.include_router(job_router)
+app.include_router(tile_router)
+app.include_router(metrics_router)
+
+# 프론트엔드 마운트("/")보다 먼저 등록해야 가려지지 않음
+@app.get("/health")
+async def health_check():
+    """헬스 체크 엔드포인트 (프로세스 생존 여부, liveness)"""
+    return {"status": "healthy", "message": "SCV Path Editor Web API is running"}
+
+@app.get("/ready")
+async def readiness_check():
+    """준비 상태 엔드포인트 (미리 로드가 끝나기 전에는 503, readiness)"""
+    return JSONResponse(warm_start.info(), status_code=200 if warm_start.ready else 503)
 
 # 정적 파일 서빙 (프론트엔드)
 frontend_dir = os.path.join(os.path.dirname(__file__), "..", "frontend")
 if os.path.exists(frontend_dir):
     app.mount("/", StaticFiles(directory=frontend_dir, html=True), name="frontend")
 
-@app.get("/health")
-async def health_check():
-    """헬스 체크 엔드포인트"""
-    return {"status": "healthy", "message": "SCV Path Editor Web API is running"}
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -0,0 +1,410 @@
+"""로컬 부하 테스트
+
+합성 대용량 경로 지도(격자 형태의 노드/링크)를 임시 data 디렉토리에 만들고 uvicorn으로 백엔드를 띄운 뒤,
+여러 가상 사용자가 노드 목록/현재 데이터 조회, 노드 위치 변경, 링크 생성, 무결성 검사, 저장/로드를
+가중치에 따라 섞어 요청한다. 끝나면 엔드포인트별 처리량과 p50/p95/p99 지연 시간을 출력한다.
+
+사용 예 (backend 디렉토리에서):
+    python scripts/load_test.py --nodes 20000 --users 16 --duration 60
+    python scripts/load_test.py --report before.json
+    python scripts/load_test.py --baseline before.json --tolerance 0.2   # p95/처리량이 20% 넘게 나빠지면 종료 코드 1
+    python scripts/load_test.py --url http://127.0.0.1:8000 --file big.json   # 이미 실행 중인 서버 대상
+
+표준 라이브러리(+ 백엔드 의존성인 utm)만 사용한다.
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import secrets
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, urlencode, urlsplit
+
+import utm
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 합성 지도 기준점 (대구가톨릭대 부근)과 노드 간격 (m)
+BASE_LAT, BASE_LON = 35.9128, 128.8075
+METERS_PER_DEG_LAT = 111320.0
+
+MAP_FILENAME = "loadtest_map.json"
+DEFAULT_MIX = "nodes=8,current=8,node=20,move=35,link=10,validate=6,save=5,load=3"
+PERCENTILES = (50, 95, 99)
+
+
+def generate_map(path: str, node_count: int, spacing: float) -> List[Tuple[str, float, float]]:
+    """격자 노드(오른쪽/아래 이웃과 링크로 연결)로 된 경로 파일 생성 후 (ID, lat, lon) 목록 반환"""
+    side = max(2, math.ceil(math.sqrt(node_count)))
+    meters_per_deg_lon = METERS_PER_DEG_LAT * math.cos(math.radians(BASE_LAT))
+    positions, nodes, links = [], [], []
+    for i in range(node_count):
+        row, col = divmod(i, side)
+        lat = BASE_LAT + row * spacing / METERS_PER_DEG_LAT
+        lon = BASE_LON + col * spacing / meters_per_deg_lon
+        easting, northing, zone_number, zone_letter = utm.from_latlon(lat, lon)
+        node_id = f"LT{i:07d}"
+        positions.append((node_id, lat, lon))
+        nodes.append({
+            "ID": node_id, "NodeType": 1, "Maker": "load_test",
+            "GpsInfo": {"Lat": lat, "Long": lon, "Alt": 0.0},
+            "UtmInfo": {"Easting": easting, "Northing": northing, "Zone": f"{zone_number}{zone_letter}"}
+        })
+    for i in range(node_count):
+        row, col = divmod(i, side)
+        for neighbor in ((i + 1) if col + 1 < side else None, i + side):
+            if neighbor is not None and neighbor < node_count:
+                links.append({
+                    "ID": f"LTL{len(links):07d}", "FromNodeID": f"LT{i:07d}", "ToNodeID": f"LT{neighbor:07d}",
+                    "Length": spacing, "Maker": "load_test"
+                })
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"Node": nodes, "Link": links}, f, ensure_ascii=False)
+    return positions
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(data_dir: str, port: int, workers: int, log_path: str) -> subprocess.Popen:
+    """임시 data 디렉토리로 uvicorn 실행 (워커가 여럿이면 공유 상태 디렉토리도 지정)"""
+    env = dict(os.environ, PATH_DATA_DIR=data_dir, WORKSPACE_MEMORY_BUDGET_MB="4096", PYTHONUNBUFFERED="1")
+    if workers > 1:
+        env["PATH_SHARED_DIR"] = os.path.join(data_dir, ".workspaces")
+    command = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+               "--workers", str(workers), "--log-level", "warning"]
+    log = open(log_path, "wb")
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+def wait_ready(host: str, port: int, timeout: float = 60.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=2)
+            conn.request("GET", "/api/path/files")
+            if conn.getresponse().status == 200:
+                conn.close()
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server on {host}:{port} did not become ready within {timeout:.0f}s")
+
+
+class Client:
+    """세션 토큰을 붙여 keep-alive 연결로 요청하는 HTTP 클라이언트 (가상 사용자당 하나)"""
+
+    def __init__(self, host: str, port: int, token: str, timeout: float):
+        self.host = host
+        self.port = port
+        self.token = token
+        self.timeout = timeout
+        self.conn: Optional[http.client.HTTPConnection] = None
+        self.etag: Optional[str] = None
+
+    def request(self, method: str, path: str, body: Optional[dict] = None,
+                headers: Optional[Dict[str, str]] = None) -> Tuple[int, float, Optional[http.client.HTTPResponse], bytes]:
+        """(상태 코드, 응답 본문까지 받은 시간(초), 응답, 본문) 반환 (연결 오류는 상태 코드 0)"""
+        request_headers = {"X-Session-Token": self.token, "Accept-Encoding": "gzip", **(headers or {})}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode("utf-8")
+            request_headers["Content-Type"] = "application/json"
+        start = time.perf_counter()
+        try:
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self.conn.request(method, path, body=payload, headers=request_headers)
+            response = self.conn.getresponse()
+            content = response.read()
+            return response.status, time.perf_counter() - start, response, content
+        except (OSError, http.client.HTTPException):
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+            return 0, time.perf_counter() - start, None, b""
+
+
+class Stats:
+    """엔드포인트별 지연 시간/상태 코드 집계 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, endpoint: str, status: int, elapsed: float):
+        with self._lock:
+            self.latencies[endpoint].append(elapsed)
+            self.statuses[endpoint][status] += 1
+
+    def summary(self, duration: float) -> dict:
+        endpoints = {}
+        for endpoint in sorted(self.latencies):
+            values = sorted(self.latencies[endpoint])
+            errors = sum(count for status, count in self.statuses[endpoint].items() if status == 0 or status >= 500)
+            endpoints[endpoint] = {
+                "requests": len(values),
+                "throughput": len(values) / duration,
+                "errors": errors,
+                "statuses": {str(status): count for status, count in sorted(self.statuses[endpoint].items())},
+                "mean_ms": sum(values) / len(values) * 1000,
+                "max_ms": values[-1] * 1000,
+                **{f"p{q}_ms": percentile(values, q) * 1000 for q in PERCENTILES}
+            }
+        total = sum(item["requests"] for item in endpoints.values())
+        return {"duration": duration, "requests": total, "throughput": total / duration, "endpoints": endpoints}
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """최근접 순위 백분위수"""
+    index = max(0, math.ceil(q / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+class Workload:
+    """가상 사용자가 가중치에 따라 고르는 요청 종류 (반환값은 (상태 코드, 지연 시간))"""
+
+    def __init__(self, positions: List[Tuple[str, float, float]], filename: str, rng: random.Random):
+        self.positions = positions
+        self.filename = filename
+        self.rng = rng
+
+    def nodes(self, client: Client):
+        status, elapsed, _, _ = client.request("GET", "/api/path/nodes")
+        return status, elapsed
+
+    def current(self, client: Client):
+        # 브라우저처럼 마지막 ETag로 조건부 요청 (그래프가 그대로면 304)
+        headers = {"If-None-Match": client.etag} if client.etag else None
+        status, elapsed, response, _ = client.request("GET", "/api/path/current", headers=headers)
+        if response is not None and response.getheader("ETag"):
+            client.etag = response.getheader("ETag")
+        return status, elapsed
+
+    def node(self, client: Client):
+        node_id = self.rng.choice(self.positions)[0]
+        status, elapsed, _, _ = client.request("GET", f"/api/path/nodes/{node_id}")
+        return status, elapsed
+
+    def move(self, client: Client):
+        node_id, lat, lon = self.rng.choice(self.positions)
+        query = urlencode({"lat": lat + self.rng.uniform(-2e-6, 2e-6), "lon": lon + self.rng.uniform(-2e-6, 2e-6)})
+        status, elapsed, _, _ = client.request("PUT", f"/api/path/nodes/{node_id}/position?{query}")
+        return status, elapsed
+
+    def link(self, client: Client):
+        (from_id, _, _), (to_id, _, _) = self.rng.sample(self.positions, 2)
+        body = {"FromNodeID": from_id, "ToNodeID": to_id, "Length": 0, "Maker": "load_test"}
+        status, elapsed, _, _ = client.request("POST", "/api/path/links", body=body)
+        return status, elapsed
+
+    def validate(self, client: Client):
+        status, elapsed, _, _ = client.request("GET", "/api/path/validate")
+        return status, elapsed
+
+    def save(self, client: Client):
+        status, elapsed, _, _ = client.request("POST", f"/api/path/save/loadtest_{client.token[-12:]}.json")
+        return status, elapsed
+
+    def load(self, client: Client):
+        # 파일을 다시 여는 경우 (현재 데이터 교체)
+        status, elapsed, _, _ = client.request("POST", f"/api/path/load/{quote(self.filename)}?merge_duplicates=false")
+        return status, elapsed
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if not hasattr(Workload, name) or name.startswith("_"):
+            raise ValueError(f"Unknown operation in mix: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def run_user(workload: Workload, client: Client, mix: Dict[str, float], stats: Stats,
+             measure_from: float, deadline: float):
+    names, weights = list(mix), list(mix.values())
+    while True:
+        now = time.perf_counter()
+        if now >= deadline:
+            break
+        name = workload.rng.choices(names, weights)[0]
+        status, elapsed = getattr(workload, name)(client)
+        # 워밍업 구간의 요청은 집계하지 않음
+        if now >= measure_from:
+            stats.record(name, status, elapsed)
+
+
+def scrape_process_metrics(host: str, port: int) -> Dict[str, float]:
+    """서버 /metrics의 프로세스 CPU 시간/상주 메모리 (없으면 빈 dict)"""
+    values = {}
+    try:
+        conn = http.client.HTTPConnection(host, port, timeout=5)
+        conn.request("GET", "/metrics")
+        response = conn.getresponse()
+        if response.status == 200:
+            for line in response.read().decode("utf-8").splitlines():
+                name, _, value = line.partition(" ")
+                if name in ("process_cpu_seconds_total", "process_resident_memory_bytes"):
+                    values[name] = float(value)
+        conn.close()
+    except (OSError, http.client.HTTPException, ValueError):
+        pass
+    return values
+
+
+def print_report(summary: dict, users: int):
+    print(f"\n{summary['requests']} requests in {summary['duration']:.1f}s with {users} users "
+          f"-> {summary['throughput']:.1f} req/s")
+    header = f"{'endpoint':<10} {'count':>7} {'req/s':>8} {'errors':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, item in summary["endpoints"].items():
+        print(f"{name:<10} {item['requests']:>7} {item['throughput']:>8.1f} {item['errors']:>6} "
+              f"{item['p50_ms']:>8.1f} {item['p95_ms']:>8.1f} {item['p99_ms']:>8.1f} {item['max_ms']:>8.1f}")
+    server = summary.get("server")
+    if server:
+        print(f"\nserver: {server['cpu_cores']:.2f} CPU cores busy on average, "
+              f"{server['resident_memory_mb']:.0f} MiB resident at end")
+
+
+def compare(summary: dict, baseline: dict, tolerance: float) -> List[str]:
+    """기준 결과 대비 엔드포인트별 p95와 전체 처리량이 tolerance 비율을 넘게 나빠진 항목"""
+    regressions = []
+    for name, item in summary["endpoints"].items():
+        base = baseline["endpoints"].get(name)
+        if base and item["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base['p95_ms']:.1f} -> {item['p95_ms']:.1f} ms")
+    if summary["throughput"] < baseline["throughput"] * (1 - tolerance):
+        regressions.append(f"throughput {baseline['throughput']:.1f} -> {summary['throughput']:.1f} req/s")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="SCV Path Editor 웹 API 로컬 부하 테스트")
+    parser.add_argument("--nodes", type=int, default=20000, help="합성 지도 노드 수 (기본 20000)")
+    parser.add_argument("--spacing", type=float, default=5.0, help="격자 노드 간격 m (기본 5)")
+    parser.add_argument("--users", type=int, default=8, help="동시 가상 사용자 수 (기본 8)")
+    parser.add_argument("--sessions", type=int, default=2, help="사용자가 나눠 쓰는 워크스페이스 수 (기본 2)")
+    parser.add_argument("--duration", type=float, default=30.0, help="측정 시간 초 (기본 30)")
+    parser.add_argument("--warmup", type=float, default=3.0, help="집계하지 않는 워밍업 시간 초 (기본 3)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"요청 종류별 가중치 (기본 {DEFAULT_MIX})")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn 워커 수 (2 이상이면 공유 상태 모드)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="요청 타임아웃 초")
+    parser.add_argument("--seed", type=int, default=1, help="요청 순서 난수 시드")
+    parser.add_argument("--url", help="이미 실행 중인 서버 주소 (지정하면 서버를 띄우지 않음)")
+    parser.add_argument("--file", help="--url 사용 시 서버 data 디렉토리에 있는 경로 파일 이름")
+    parser.add_argument("--report", help="결과를 JSON으로 저장할 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON (회귀 시 종료 코드 1)")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="회귀로 판단하는 악화 비율 (기본 0.2)")
+    parser.add_argument("--keep", action="store_true", help="임시 디렉토리(합성 지도, 서버 로그) 남기기")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    server = None
+    workdir = tempfile.mkdtemp(prefix="scv_loadtest_")
+    try:
+        if args.url:
+            if not args.file:
+                parser.error("--url requires --file")
+            target = urlsplit(args.url)
+            host, port = target.hostname, target.port or 80
+            filename = args.file
+            positions = []
+        else:
+            filename = MAP_FILENAME
+            print(f"Generating {args.nodes} node map in {workdir} ...")
+            positions = generate_map(os.path.join(workdir, filename), args.nodes, args.spacing)
+            host, port = "127.0.0.1", free_port()
+            log_path = os.path.join(workdir, "server.log")
+            server = start_server(workdir, port, args.workers, log_path)
+            print(f"Starting server on port {port} (log: {log_path}) ...")
+        wait_ready(host, port)
+
+        # 세션별로 지도를 한 번 로드 (집계 제외), --url이면 로드 결과에서 노드 목록을 얻음
+        tokens = [f"loadtest-{secrets.token_hex(6)}" for _ in range(max(1, args.sessions))]
+        for token in tokens:
+            client = Client(host, port, token, args.timeout)
+            status, elapsed, _, _ = client.request("POST", f"/api/path/load/{quote(filename)}?merge_duplicates=false")
+            if status != 200:
+                raise RuntimeError(f"Initial load of {filename} failed with HTTP {status}")
+            print(f"Loaded {filename} into session {token} in {elapsed:.2f}s")
+            if not positions:
+                _, _, _, content = client.request("GET", "/api/path/nodes", headers={"Accept-Encoding": "identity"})
+                positions = [(node["ID"], node["GpsInfo"]["Lat"], node["GpsInfo"]["Long"])
+                             for node in json.loads(content)]
+
+        stats = Stats()
+        before = scrape_process_metrics(host, port)
+        start = time.perf_counter()
+        measure_from = start + args.warmup
+        deadline = measure_from + args.duration
+        threads = []
+        for i in range(args.users):
+            workload = Workload(positions, filename, random.Random(args.seed * 1000 + i))
+            client = Client(host, port, tokens[i % len(tokens)], args.timeout)
+            thread = threading.Thread(target=run_user, args=(workload, client, mix, stats, measure_from, deadline),
+                                      daemon=True)
+            thread.start()
+            threads.append(thread)
+        print(f"Running {args.users} users for {args.warmup:.0f}s warmup + {args.duration:.0f}s ...")
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - measure_from
+        after = scrape_process_metrics(host, port)
+
+        summary = stats.summary(elapsed)
+        summary["config"] = {key: value for key, value in vars(args).items() if key not in ("report", "baseline")}
+        if "process_cpu_seconds_total" in before and "process_cpu_seconds_total" in after:
+            summary["server"] = {
+                "cpu_cores": (after["process_cpu_seconds_total"] - before["process_cpu_seconds_total"]) / (time.perf_counter() - start),
+                "resident_memory_mb": after.get("process_resident_memory_bytes", 0) / (1024 * 1024)
+            }
+        print_report(summary, args.users)
+
+        if args.report:
+            with open(args.report, "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=2)
+            print(f"\nReport written to {args.report}")
+        if args.baseline:
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                regressions = compare(summary, json.load(f), args.tolerance)
+            if regressions:
+                print("\nRegressions against baseline:")
+                for line in regressions:
+                    print(f"  {line}")
+                return 1
+            print("\nNo regressions against baseline")
+        return 0
+    finally:
+        if server is not None:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+        if args.keep:
+            print(f"Kept {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""로컬 타일 서버 대역 (타일 프록시 캐시 확인용)
+
+vworld 등 원본 타일 서버 대신 /{z}/{x}/{y}.png 요청에 타일 좌표별 단색 PNG를 응답한다.
+응답 지연(--delay)과 오류 비율(--error-rate), 없는 타일(--max-zoom 초과는 404)을 흉내 낼 수 있으며,
+GET /stats로 받은 요청 수(타일별 중복 요청 포함)를 확인하여 캐시 적중/요청 합치기가 동작하는지 볼 수 있다.
+
+사용 예 (backend 디렉토리에서):
+    python scripts/tile_stub_server.py --port 8001 --delay 0.2
+    TILE_UPSTREAM_VWORLD="http://127.0.0.1:8001/{z}/{x}/{y}.png" python main.py
+
+표준 라이브러리만 사용한다.
+"""
+import argparse
+import json
+import random
+import struct
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TILE_SIZE = 256
+
+
+def solid_png(rgb: bytes, size: int = TILE_SIZE) -> bytes:
+    """단색 RGB PNG 생성"""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0)
+    rows = (b"\x00" + rgb * size) * size
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b"")
+
+
+class TileStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, delay: float, error_rate: float, max_zoom: int):
+        super().__init__(address, TileStubHandler)
+        self.delay = delay
+        self.error_rate = error_rate
+        self.max_zoom = max_zoom
+        self.requests = Counter()
+        self.lock = threading.Lock()
+
+
+class TileStubHandler(BaseHTTPRequestHandler):
+    server: TileStubServer
+
+    def do_GET(self):
+        if self.path == "/stats":
+            with self.server.lock:
+                body = json.dumps({
+                    "requests": sum(self.server.requests.values()),
+                    "tiles": len(self.server.requests),
+                    "duplicates": sum(count - 1 for count in self.server.requests.values())
+                }).encode("utf-8")
+            self._send(200, "application/json", body)
+            return
+
+        try:
+            z, x, y = (int(part) for part in self.path.strip("/").rsplit(".", 1)[0].split("/")[-3:])
+        except ValueError:
+            self._send(400, "text/plain", b"expected /{z}/{x}/{y}.png")
+            return
+        with self.server.lock:
+            self.server.requests[(z, x, y)] += 1
+
+        time.sleep(self.server.delay)
+        if z > self.server.max_zoom:
+            self._send(404, "text/plain", b"tile not found")
+        elif random.random() < self.server.error_rate:
+            self._send(503, "text/plain", b"upstream unavailable")
+        else:
+            color = bytes(((x * 37) % 256, (y * 59) % 256, (z * 17) % 256))
+            self._send(200, "image/png", solid_png(color))
+
+    def _send(self, status: int, content_type: str, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for an upstream basemap tile server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--delay", type=float, default=0.1, help="seconds to wait before each response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--max-zoom", type=int, default=19, help="tiles above this zoom return 404")
+    args = parser.parse_args()
+
+    server = TileStubServer((args.host, args.port), args.delay, args.error_rate, args.max_zoom)
+    print(f"Tile stub server on http://{args.host}:{args.port}/{{z}}/{{x}}/{{y}}.png (stats: /stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import pytest
+
+from app.utils.metrics import MetricsRegistry
+
+
+def _render(collector) -> list:
+    registry = MetricsRegistry()
+    registry.add_collector(collector)
+    return registry.render().decode("utf-8").splitlines()
+
+
+def test_collector_declares_counter_kind():
+    def collector():
+        yield "jobs_done_total", "Finished jobs", [({}, 3)], "counter"
+        yield "jobs_running", "Running jobs", [({}, 1)]
+
+    lines = _render(collector)
+    assert "# TYPE jobs_done_total counter" in lines
+    assert "# TYPE jobs_running gauge" in lines
+    assert "jobs_done_total 3" in lines
+
+
+def test_collector_counter_requires_total_suffix():
+    def collector():
+        yield "jobs_done", "Finished jobs", [({}, 3)], "counter"
+
+    with pytest.raises(ValueError):
+        _render(collector)
+
+
+def test_builtin_counters_are_exposed_as_counters():
+    from main import app  # noqa: F401  (API 모듈의 수집 함수 등록)
+    from app.utils.metrics import registry
+
+    text = registry.render().decode("utf-8")
+    for name in ("process_cpu_seconds_total", "path_workspace_evictions_total", "path_cache_hits_total",
+                 "path_tile_proxy_upstream_errors_total"):
+        assert f"# TYPE {name} counter" in text
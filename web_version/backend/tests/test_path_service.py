@@ -0,0 +1,29 @@
+import os
+import shutil
+
+from app.services.path_service import PathService, FILE_OPERATION_SECONDS
+
+SAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "path")
+
+
+def _merge_observations():
+    """(합계, 개수) of path_file_operation_seconds{operation="merge",format="json"}"""
+    entry = FILE_OPERATION_SECONDS._values.get(("merge", "json"))
+    if entry is None:
+        return 0.0, 0
+    return entry[-1], sum(entry[:-1])
+
+
+def test_merge_files_observes_elapsed_time(tmp_path):
+    for name in ("20250807.json", "test.json"):
+        shutil.copy(os.path.join(SAMPLE_DIR, name), tmp_path / name)
+    service = PathService(str(tmp_path))
+
+    total_before, count_before = _merge_observations()
+    result = service.merge_files(["20250807.json", "test.json"])
+    total_after, count_after = _merge_observations()
+
+    assert result["total_nodes"] > 0
+    assert count_after == count_before + 1
+    # 병합 시간 (perf_counter 값 자체가 아닌 경과 시간)
+    assert 0 < total_after - total_before < 60
@@ -1,20 +1,42 @@
 // API client for SCV Path Editor Web
+
+// 배경 지도 타일 제공자 (서버 타일 프록시 /api/tiles/{provider}/{z}/{x}/{y})
+const BASEMAP_PROVIDER = 'vworld';
+
 class PathAPI {
-    constructor(baseUrl = '/api/path') {
+    constructor(baseUrl = '/api/path', jobsUrl = '/api/jobs') {
         this.baseUrl = baseUrl;
+        this.jobsUrl = jobsUrl;
+        this.sessionToken = this.getSessionToken();
     }
 
-    async request(url, options = {}) {
+    // 탭별 워크스페이스 토큰 (sessionStorage는 탭마다 분리됨)
+    getSessionToken() {
+        let token = sessionStorage.getItem('scvSessionToken');
+        if (!token) {
+            token = window.crypto && crypto.randomUUID
+                ? crypto.randomUUID()
+                : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+            sessionStorage.setItem('scvSessionToken', token);
+        }
+        return token;
+    }
+
+    async request(url, options = {}, baseUrl = this.baseUrl) {
+        // 호출한 쪽의 헤더(If-Match 등)는 기본 헤더에 덧붙이고, 세션 토큰은 항상 포함
+        // FormData 업로드는 브라우저가 boundary가 포함된 Content-Type을 설정하도록 JSON Content-Type을 넣지 않음
+        const defaultHeaders = options.body instanceof FormData ? {} : { 'Content-Type': 'application/json' };
         const config = {
+            ...options,
             headers: {
-                'Content-Type': 'application/json',
-                ...options.headers
-            },
-            ...options
+                ...defaultHeaders,
+                ...options.headers,
+                'X-Session-Token': this.sessionToken
+            }
         };
 
         try {
-            const response = await fetch(`${this.baseUrl}${url}`, config);
+            const response = await fetch(`${baseUrl}${url}`, config);
             
             if (!response.ok) {
                 const errorText = await response.text();
@@ -34,19 +56,48 @@ class PathAPI {
         }
     }
 
+    // 페이지 조회: { items, nextCursor, total } 반환
+    async requestPage(url, params = {}) {
+        const query = new URLSearchParams(
+            Object.entries(params).filter(([, value]) => value !== undefined && value !== null)
+        ).toString();
+        const response = await fetch(`${this.baseUrl}${url}${query ? `?${query}` : ''}`, {
+            headers: { 'X-Session-Token': this.sessionToken }
+        });
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}: ${await response.text()}`);
+        }
+        return {
+            items: await response.json(),
+            nextCursor: response.headers.get('X-Next-Cursor'),
+            total: parseInt(response.headers.get('X-Total-Count') || '0', 10)
+        };
+    }
+
     // 파일 관련 API
     async listFiles() {
         return await this.request('/files');
     }
 
+    // 파일 카탈로그 (노드/링크 수, bbox, 해시, 크기, 수정 시각): params = { sort, order, q, type, bbox }
+    async listFileDetails(params = {}) {
+        const query = new URLSearchParams({ detail: 'true' });
+        Object.entries(params).forEach(([key, value]) => {
+            if (value !== undefined && value !== null) query.set(key, value);
+        });
+        return await this.request(`/files?${query}`);
+    }
+
     async loadPathData(filename) {
         return await this.request(`/load/${filename}`, { method: 'POST' });
     }
 
-    async savePathData(filename, pathData) {
+    // etag를 지정하면 그 이후 서버 데이터가 바뀐 경우 412로 거부됨
+    async savePathData(filename, pathData, etag = null) {
         return await this.request(`/save/${filename}`, {
             method: 'POST',
-            body: JSON.stringify(pathData)
+            body: JSON.stringify(pathData),
+            headers: etag ? { 'If-Match': etag } : {}
         });
     }
 
@@ -60,7 +111,6 @@ class PathAPI {
         
         return await this.request('/upload', {
             method: 'POST',
-            headers: {}, // Content-Type을 자동으로 설정하도록 비움
             body: formData
         });
     }
@@ -75,6 +125,11 @@ class PathAPI {
         return await this.request('/nodes');
     }
 
+    // 필터/페이지/필드 선택 조회 (다음 커서는 X-Next-Cursor 헤더로 전달됨)
+    async queryNodes(params = {}) {
+        return await this.requestPage('/nodes', params);
+    }
+
     async getNode(nodeId) {
         return await this.request(`/nodes/${nodeId}`);
     }
@@ -86,15 +141,17 @@ class PathAPI {
         });
     }
 
-    async updateNodePosition(nodeId, lat, lon) {
+    async updateNodePosition(nodeId, lat, lon, etag = null) {
         return await this.request(`/nodes/${nodeId}/position?lat=${lat}&lon=${lon}`, {
-            method: 'PUT'
+            method: 'PUT',
+            headers: etag ? { 'If-Match': etag } : {}
         });
     }
 
-    async deleteNode(nodeId) {
+    async deleteNode(nodeId, etag = null) {
         return await this.request(`/nodes/${nodeId}`, {
-            method: 'DELETE'
+            method: 'DELETE',
+            headers: etag ? { 'If-Match': etag } : {}
         });
     }
 
@@ -103,6 +160,10 @@ class PathAPI {
         return await this.request('/links');
     }
 
+    async queryLinks(params = {}) {
+        return await this.requestPage('/links', params);
+    }
+
     async getLink(linkId) {
         return await this.request(`/links/${linkId}`);
     }
@@ -120,6 +181,124 @@ class PathAPI {
         });
     }
 
+    // 일괄 변경 API (작업 목록을 원자적으로 적용)
+    async applyBatch(operations) {
+        return await this.request('/batch', {
+            method: 'POST',
+            body: JSON.stringify({ Operations: operations })
+        });
+    }
+
+    // 변경 델타 스트림 (WebSocket): onSnapshot(data, version), onDeltas(changes, version)
+    openDeltaStream({ onSnapshot, onDeltas, since = null } = {}) {
+        const protocol = location.protocol === 'https:' ? 'wss:' : 'ws:';
+        const params = new URLSearchParams({ token: this.sessionToken });
+        if (since !== null) {
+            params.set('since', since);
+        }
+        const socket = new WebSocket(`${protocol}//${location.host}${this.baseUrl}/ws?${params}`);
+        let version = since;
+
+        socket.onmessage = (event) => {
+            const message = JSON.parse(event.data);
+            if (message.t === 'snapshot') {
+                version = message.v;
+                if (onSnapshot) onSnapshot(message.data, version);
+            } else if (message.t === 'deltas') {
+                if (version !== null && message.from !== version + 1) {
+                    // 버전이 이어지지 않으면 서버에 재동기화 요청
+                    socket.send(JSON.stringify({ t: 'resync', since: version }));
+                    return;
+                }
+                version = message.v;
+                if (onDeltas) onDeltas(message.changes, version);
+            } else if (message.t === 'sync') {
+                version = message.v;
+            }
+        };
+        return socket;
+    }
+
+    // 백그라운드 작업 API: kind = load/{filename} | validate | merge | export/{filename} | simplify | recompute-lengths
+    async submitJob(kind, body = null, params = {}) {
+        const query = new URLSearchParams(params).toString();
+        return await this.request(`/jobs/${kind}${query ? `?${query}` : ''}`, {
+            method: 'POST',
+            body: body ? JSON.stringify(body) : undefined
+        });
+    }
+
+    // 작업 상태 조회/취소는 /api/jobs 아래에 있음
+    async getJob(jobId) {
+        return await this.request(`/${jobId}`, {}, this.jobsUrl);
+    }
+
+    async cancelJob(jobId) {
+        return await this.request(`/${jobId}`, { method: 'DELETE' }, this.jobsUrl);
+    }
+
+    // 작업이 끝날 때까지 주기적으로 조회 (onProgress(job)로 진행률 전달)
+    async waitForJob(jobId, onProgress = null, interval = 500) {
+        while (true) {
+            const job = await this.getJob(jobId);
+            if (onProgress) onProgress(job);
+            if (['succeeded', 'failed', 'cancelled'].includes(job.status)) {
+                return job;
+            }
+            await new Promise(resolve => setTimeout(resolve, interval));
+        }
+    }
+
+    // 작업 진행 상황을 SSE로 받음 (끝나면 결과가 포함된 작업 정보로 resolve, EventSource 미지원 시 폴링)
+    watchJob(jobId, onProgress = null) {
+        if (!window.EventSource) {
+            return this.waitForJob(jobId, onProgress);
+        }
+        return new Promise((resolve, reject) => {
+            // EventSource는 헤더를 보낼 수 없으므로 세션 토큰을 쿼리로 전달
+            const params = new URLSearchParams({ token: this.sessionToken });
+            const source = new EventSource(`${this.jobsUrl}/${jobId}/events?${params}`);
+            const finish = (event) => {
+                source.close();
+                resolve(JSON.parse(event.data));
+            };
+            source.addEventListener('progress', (event) => {
+                if (onProgress) onProgress(JSON.parse(event.data));
+            });
+            ['complete', 'failed', 'cancelled'].forEach(name => source.addEventListener(name, finish));
+            source.onerror = () => {
+                // 연결이 끊기면 EventSource가 다시 연결하며, 작업이 사라진 경우(404)에만 종료
+                if (source.readyState === EventSource.CLOSED) {
+                    reject(new Error(`Job ${jobId} event stream closed`));
+                }
+            };
+        });
+    }
+
+    // 진행 상황을 보고하며 파일 로드 후 최종 결과(/load와 같은 형식)를 버전으로 조회
+    async loadPathDataWithProgress(filename, mergeDuplicates = true, onProgress = null) {
+        const job = await this.submitJob(`load/${encodeURIComponent(filename)}`, null, {
+            merge_duplicates: mergeDuplicates
+        });
+        const finished = await this.watchJob(job.id, onProgress);
+        if (finished.status !== 'succeeded') {
+            throw new Error(finished.error || `Load ${finished.status}`);
+        }
+        return await this.request(`/load/result/${finished.result.graph_version}`);
+    }
+
+    // 벡터 타일 API
+    async getTile(z, x, y) {
+        return await this.request(`/tiles/${z}/${x}/${y}`);
+    }
+
+    // 배경 지도 타일 미리 받기 (현재 지도 범위, 백그라운드 작업 정보 반환)
+    async prefetchBasemapTiles(minZoom = 14, maxZoom = 18, provider = BASEMAP_PROVIDER) {
+        return await this.request(`/${provider}/prefetch?min_zoom=${minZoom}&max_zoom=${maxZoom}`, {
+            method: 'POST'
+        }, '/api/tiles');
+    }
+
     // 데이터 무결성 검사 API
     async validateDataIntegrity() {
         return await this.request('/validate');
@@ -64,8 +64,8 @@ class FileExplorer {
         try {
             this.showLoading();
             
-            // API를 통해 파일 목록 가져오기
-            const files = await pathAPI.listFiles();
+            // API를 통해 파일 목록과 메타데이터(카탈로그) 가져오기
+            const files = await pathAPI.listFileDetails();
             
             // 파일들을 폴더별로 분류
             this.fileTree = this.buildFileTree(files);
@@ -87,7 +87,8 @@ class FileExplorer {
             expanded: true
         };
 
-        files.forEach(filename => {
+        files.forEach(entry => {
+            const filename = entry.name;
             const parts = filename.split('/');
             let current = tree;
 
@@ -98,8 +99,9 @@ class FileExplorer {
                         name: part,
                         fullPath: filename,
                         type: this.getFileType(part),
-                        size: this.getFileSize(filename),
-                        modified: this.getFileDate(filename)
+                        size: this.getFileSize(entry),
+                        modified: this.getFileDate(entry),
+                        info: entry
                     });
                 } else {
                     // 폴더
@@ -183,7 +185,14 @@ class FileExplorer {
         html += `<span class="file-icon"></span>`;
 
         // 파일명
-        html += `<span class="file-name" title="${node.fullPath || node.name}">${node.name}</span>`;
+        let title = node.fullPath || node.name;
+        if (node.info) {
+            // 카탈로그 정보: 로드하지 않고도 레코드 수와 오류 여부 표시
+            title += node.info.error
+                ? `\n오류: ${node.info.error}`
+                : `\n노드 ${node.info.nodes}개, 링크 ${node.info.links}개`;
+        }
+        html += `<span class="file-name"></span>`;
 
         // 파일 크기 및 수정일 (파일인 경우)
         if (node.type !== 'folder') {
@@ -197,6 +206,11 @@ class FileExplorer {
 
         item.innerHTML = html;
 
+        // 파일명과 카탈로그 오류 메시지는 HTML로 해석되지 않도록 DOM으로 설정
+        const nameEl = item.querySelector('.file-name');
+        nameEl.textContent = node.name;
+        nameEl.title = title;
+
         // 이벤트 리스너
         this.setupFileItemEvents(item, node);
 
@@ -393,14 +407,13 @@ class FileExplorer {
         }
     }
 
-    getFileSize(filename) {
-        // TODO: 실제 파일 크기 정보 API에서 가져오기
-        return Math.floor(Math.random() * 100) + 1 + 'KB';
+    getFileSize(entry) {
+        const kb = entry.size / 1024;
+        return kb >= 1024 ? `${(kb / 1024).toFixed(1)}MB` : `${Math.max(1, Math.round(kb))}KB`;
     }
 
-    getFileDate(filename) {
-        // TODO: 실제 파일 수정 날짜 API에서 가져오기
-        return new Date().toLocaleDateString('ko-KR');
+    getFileDate(entry) {
+        return new Date(entry.modified * 1000).toLocaleDateString('ko-KR');
     }
 
     // 외부에서 파일 선택 콜백 설정
@@ -37,9 +37,9 @@ class PathMap {
             attributionControl: true
         });
 
-        // 타일 레이어 추가 (OpenStreetMap)
-        L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
-            attribution: '© OpenStreetMap contributors',
+        // 타일 레이어 추가 (vworld 배경 지도, 서버의 타일 프록시 캐시를 거쳐 받음)
+        L.tileLayer(`/api/tiles/${BASEMAP_PROVIDER}/{z}/{x}/{y}`, {
+            attribution: '© VWorld',
             maxZoom: 19
         }).addTo(this.map);
 
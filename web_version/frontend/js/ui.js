@@ -50,6 +50,10 @@ class UIManager {
             this.downloadFile();
         });
 
+        document.getElementById('prefetchTilesBtn').addEventListener('click', () => {
+            this.prefetchTiles();
+        });
+
         document.getElementById('fileInput').addEventListener('change', (e) => {
             this.uploadFile(e.target.files[0]);
         });
@@ -282,6 +286,34 @@ class UIManager {
         }
     }
 
+    // 현재 지도 범위의 배경 타일을 서버 캐시에 미리 받음 (현장 등 네트워크가 느린 곳에서 쓰기 전에 수행)
+    async prefetchTiles() {
+        const button = document.getElementById('prefetchTilesBtn');
+        button.disabled = true;
+        try {
+            const job = await pathAPI.prefetchBasemapTiles();
+            if (!job.id) {
+                // 이미 모두 캐시에 있으면 작업 없이 요약만 옴
+                showNotification(`배경 타일 ${job.tiles}개가 이미 캐시에 있습니다`, 'info');
+                return;
+            }
+            showNotification('배경 타일을 미리 받는 중입니다', 'info');
+            const finished = await pathAPI.watchJob(job.id);
+            if (finished.status !== 'succeeded') {
+                throw new Error(finished.error || `Prefetch ${finished.status}`);
+            }
+            const result = finished.result;
+            showNotification(
+                `배경 타일 ${result.tiles}개 중 ${result.fetched}개를 받았습니다 (캐시 ${result.cached}, 실패 ${result.failed})`,
+                result.failed > 0 ? 'warning' : 'success'
+            );
+        } catch (error) {
+            handleAPIError(error, '배경 타일 미리 받기 중 오류가 발생했습니다');
+        } finally {
+            button.disabled = false;
+        }
+    }
+
     updateTables() {
         this.updateNodeTable();
         this.updateLinkTable();